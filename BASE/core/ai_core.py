@@ -3,7 +3,7 @@
 AI Core - Main Orchestration
 FIXED: Single Config and Logger instances throughout system
 """
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 from pathlib import Path
 import asyncio
 import time
@@ -252,6 +252,13 @@ class AICore:
             except Exception as e:
                 self.logger.warning(f"Error stopping Discord: {e}")
         
+        # Stop background memory work (pending embeddings resume next start)
+        if self.memory_manager:
+            try:
+                self.memory_manager.shutdown()
+            except Exception as e:
+                self.logger.warning(f"Error stopping memory manager: {e}")
+        
         # Stop TTS
         if self.tts_tool:
             try:
@@ -271,9 +278,15 @@ class AICore:
     async def process_user_message(
         self, message: str, source: str = "GUI", user_id: str = "local_user",
         is_image_message: bool = False, image_path: Optional[Path] = None,
-        timestamp: Optional[float] = None, username_override: Optional[str] = None
+        timestamp: Optional[float] = None, username_override: Optional[str] = None,
+        on_sentence: Optional[Callable[[str], None]] = None
     ) -> Optional[str]:
-        """Main entry point with centralized filtering"""
+        """
+        Main entry point with centralized filtering
+        
+        on_sentence streams the reply: each sentence is output-filtered and
+        passed on while the rest is still being generated (e.g. to TTS).
+        """
         # Kill command check (highest priority)
         if message and isinstance(message, str):
             if self._check_kill_command(message):
@@ -323,13 +336,17 @@ class AICore:
         if not message and self._should_check_chat_engagement():
             self.logger.system("[Chat Engagement] Autonomous engagement check")
         
+        # Streamed sentences get the same output filter as the full reply
+        if on_sentence and getattr(self.controls, 'ENABLE_CONTENT_FILTER', True):
+            on_sentence = self._filtered_sentence_sink(on_sentence)
+        
         # Process via delegator
         try:
             reply = await self.processing_delegator.process_user_input(
                 user_input=message, source=source, user_id=user_id,
                 is_image_message=is_image_message, image_path=image_path,
                 timestamp=timestamp, username_override=username_override,
-                context_parts=context_parts
+                context_parts=context_parts, on_sentence=on_sentence
             )
             
             # CENTRALIZED OUTPUT FILTERING
@@ -359,6 +376,19 @@ class AICore:
             traceback.print_exc()
             return None
     
+    def _filtered_sentence_sink(self, sink: Callable[[str], None]) -> Callable[[str], None]:
+        """Wrap a sentence sink with the outgoing content filter"""
+        def filtered(sentence: str):
+            cleaned, was_filtered, reason = self.content_filter.filter_outgoing(
+                sentence,
+                log_callback=self.logger.system
+            )
+            if was_filtered:
+                self.logger.system(f"[Filter Output] {reason} (streamed sentence)")
+            if cleaned and cleaned.strip():
+                sink(cleaned)
+        return filtered
+    
     def _check_kill_command(self, text: str) -> bool:
         """Check if text contains kill command"""
         if not text or not isinstance(text, str):
@@ -84,6 +84,15 @@ class Config:
         self.ollama_context_length: int = int(os.getenv("OLLAMA_CONTEXT_LENGTH", str(ollama_config.get("num_ctx", "8192"))))
         self.ollama_concurrent_requests: int = int(os.getenv("OLLAMA_CONCURRENT_REQUESTS", "1"))
         self.ollama_num_ctx: int = int(os.getenv("OLLAMA_NUM_CTX", str(ollama_config.get("num_ctx", "3000"))))
+        self.ollama_pool_size: int = int(os.getenv("OLLAMA_POOL_SIZE", str(ollama_config.get("pool_size", 8))))
+        
+        # LLM scheduler (priority classes, per-model concurrency, preemption)
+        scheduler_config = ollama_config.get("scheduler", {})
+        self.llm_model_concurrency: int = int(os.getenv(
+            "OLLAMA_MODEL_CONCURRENCY", str(scheduler_config.get("model_concurrency", self.ollama_num_parallel))
+        ))
+        self.llm_model_limits: Dict[str, int] = scheduler_config.get("model_limits", {})
+        self.llm_preemption: bool = scheduler_config.get("preempt_proactive", True)
         
         # Override seed with environment variable if provided
         if os.getenv("OLLAMA_SEED"):
@@ -96,6 +105,37 @@ class Config:
         self.base_memory_search_results: int = memory_config["base_memory_search_results"]
         self.auto_summarize_threshold: int = memory_config["auto_summarize_threshold"]
         self.include_base_memory: bool = memory_config["include_base_memory"]
+        self.memory_journal_compact_threshold: int = memory_config.get("journal_compact_threshold", 200)
+        self.memory_vector_dtype: str = memory_config.get("vector_dtype", "float32")
+        self.memory_ann_nprobe: int = memory_config.get("ann_nprobe", 8)
+        self.memory_ann_min_chunks: int = memory_config.get("ann_min_chunks", 20000)
+        self.embed_batch_size: int = memory_config.get("embed_batch_size", 64)
+        self.embed_batch_max_bytes: int = memory_config.get("embed_batch_max_bytes", 262144)
+        self.embedding_cache_enabled: bool = memory_config.get("embedding_cache_enabled", True)
+        self.embedding_cache_max_mb: int = memory_config.get("embedding_cache_max_mb", 256)
+        self.embed_retry_max_seconds: float = memory_config.get("embed_retry_max_seconds", 60)
+        self.embed_max_attempts: int = memory_config.get("embed_max_attempts", 8)
+        self.memory_backend: str = memory_config.get("backend", "json")
+        self.memory_search_mode: str = memory_config.get("search_mode", "vector")
+        self.hybrid_rrf_k: int = memory_config.get("hybrid_rrf_k", 60)
+        self.hybrid_lexical_skip_score: float = memory_config.get("hybrid_lexical_skip_score", 0.8)
+        self.memory_dedup_threshold: Optional[float] = memory_config.get("dedup_threshold", 0.95)
+        self.memory_mmr_enabled: bool = memory_config.get("mmr_enabled", False)
+        self.memory_mmr_lambda: float = memory_config.get("mmr_lambda", 0.7)
+        self.query_cache_max_entries: int = memory_config.get("query_cache_max_entries", 1000)
+        self.query_cache_max_mb: float = memory_config.get("query_cache_max_mb", 16)
+        self.query_cache_failure_ttl: float = memory_config.get("query_cache_failure_ttl", 10)
+        self.summary_max_concurrency: int = memory_config.get("summary_concurrency", 2)
+        self.summary_model: Optional[str] = memory_config.get("summary_model") or None
+        self.summary_window_tokens: int = memory_config.get("summary_window_tokens", 2000)
+        self.summary_map_concurrency: int = memory_config.get("summary_map_concurrency", 2)
+        self.rollups_enabled: bool = memory_config.get("rollups_enabled", True)
+        self.rollup_search_min_days: int = memory_config.get("rollup_search_min_days", 120)
+        self.rollup_top_months: int = memory_config.get("rollup_top_months", 2)
+        self.rollup_top_weeks: int = memory_config.get("rollup_top_weeks", 4)
+        
+        # Prompt token budgets per prompt type (see BASE/core/context_packer.py)
+        self.prompt_token_budgets: Dict[str, int] = json_config.get("prompt_budgets", {})
     
         # ====================================================================
         # LOGGING CONTROL VARIABLES - CENTRALIZED
@@ -0,0 +1,320 @@
+# Filename: BASE/core/context_packer.py
+"""
+Token-Budgeted Context Packer
+=============================
+Prompt constructors used to concatenate every section they were given, so
+prompt length (and time-to-first-token on local models) swung with however
+much memory, chat and session-file text happened to be around.
+
+Constructors now describe their prompt as ContextSections and let the
+packer fit them into a per-prompt-type token budget:
+
+- required sections (personality, instructions, output format, the user
+  message) are always kept and paid for first
+- optional sections are admitted by priority, then relevance; one that
+  does not fit is truncated at a line boundary if enough room is left,
+  otherwise dropped
+- the kept sections are emitted in their original order, so prompt layout
+  does not change
+- sections marked `stable` (personality, mode instructions, tool list) are
+  placed first by the constructors; the leading run of them is reported as
+  the prompt's StablePrefix, the part Ollama can serve from its KV cache
+  when it is byte-identical to the previous call's (see prompt_cache.py)
+
+Token counts come from a fast local estimate (no tokenizer round trip).
+"""
+
+import re
+import hashlib
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Tuple
+
+# Budgets are for the whole prompt, fixed sections included
+DEFAULT_TOKEN_BUDGETS = {
+    'spoken': 1500,
+    'responsive': 2500,
+    'reflective': 2500,
+    'planning': 2000,
+    'memory': 1500,
+}
+
+# Below this much room, truncating a section is not worth it
+MIN_TRUNCATED_TOKENS = 40
+
+_WORD = re.compile(r"\w+|[^\w\s]")
+_RELEVANCE = re.compile(r"\(relevance: ([0-9.]+)\)")
+
+# Heading prefix -> (kind, priority); higher priority is packed first
+_CONTEXT_KINDS: List[Tuple[str, str, int]] = [
+    ("## CHAT TO ADDRESS", "chat", 8),
+    ("## USER NOTE", "chat", 8),
+    ("## AUTONOMOUS ENGAGEMENT", "chat", 8),
+    ("## LIVE CHAT", "chat", 6),
+    ("## PENDING", "tool", 6),
+    ("## TOOL", "tool", 6),
+    ("## ACTIVE", "tool", 6),
+    ("## YESTERDAY", "memory", 5),
+    ("## MEMORY", "memory", 5),
+    ("## EARLIER TODAY", "memory", 5),
+    ("## PAST", "memory", 5),
+    ("## RECENT CONVERSATION", "memory", 5),
+    ("## KNOWLEDGE BASE", "memory", 4),
+    ("## REFERENCE GUIDES", "memory", 4),
+    ("## PERSONALITY KNOWLEDGE", "memory", 4),
+    ("## SESSION FILES", "session_files", 4),
+]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast token estimate for Llama/Qwen-style BPE vocabularies
+
+    Takes the larger of ~4 characters per token and one token per
+    word/punctuation run; the second wins on punctuation-dense text
+    (code, logs, emoji-heavy chat) where the character rule undercounts.
+    """
+    if not text:
+        return 0
+    by_chars = (len(text) + 3) // 4
+    by_words = len(_WORD.findall(text))
+    return max(by_chars, by_words)
+
+
+def classify_context(text: str) -> Tuple[str, int]:
+    """(kind, priority) for a context part, from its heading"""
+    head = text.lstrip()
+    for prefix, kind, priority in _CONTEXT_KINDS:
+        if head.startswith(prefix):
+            return kind, priority
+    return "other", 3
+
+
+def relevance_of(text: str) -> float:
+    """Best '(relevance: x)' score inside a memory section, else 0"""
+    scores = [float(s) for s in _RELEVANCE.findall(text)]
+    return max(scores) if scores else 0.0
+
+
+@dataclass
+class ContextSection:
+    """One block of prompt text and how much it matters"""
+    name: str
+    text: str
+    priority: int = 3
+    required: bool = False
+    relevance: float = 0.0
+    truncatable: bool = True
+    group: Optional[str] = None   # Sections sharing a heading
+    is_header: bool = False       # Kept only if a section of its group is
+    stable: bool = False          # Same text every call until personality/tools change
+    tokens: int = field(default=-1, repr=False)
+
+    def __post_init__(self):
+        if self.tokens < 0:
+            self.tokens = estimate_tokens(self.text)
+
+
+@dataclass
+class StablePrefix:
+    """Leading stable sections of a packed prompt"""
+    session: str                  # Prompt type the prefix belongs to
+    text: str
+    tokens: int
+    parts: Dict[str, str] = field(default_factory=dict)  # section name -> fingerprint
+    ends: List[int] = field(default_factory=list)        # prefix tokens through each part
+
+
+@dataclass
+class PackResult:
+    """Packed prompt text plus an account of what was cut"""
+    text: str
+    budget: int
+    used_tokens: int
+    kept: List[str] = field(default_factory=list)
+    truncated: List[Tuple[str, int, int]] = field(default_factory=list)  # (name, before, after)
+    dropped: List[Tuple[str, int]] = field(default_factory=list)         # (name, tokens)
+    prefix: Optional[StablePrefix] = None
+
+    def summary(self) -> str:
+        parts = [f"{self.used_tokens}/{self.budget} tokens"]
+        if self.truncated:
+            parts.append("truncated " + ", ".join(f"{n} {a}->{b}" for n, a, b in self.truncated))
+        if self.dropped:
+            parts.append("dropped " + ", ".join(f"{n} ({t})" for n, t in self.dropped))
+        return "; ".join(parts)
+
+
+class ContextPacker:
+    """Fits a prompt's sections into a token budget"""
+
+    def __init__(self, prompt_type: str, budget: Optional[int] = None, logger=None):
+        """
+        Args:
+            prompt_type: Key into DEFAULT_TOKEN_BUDGETS (spoken, responsive, ...)
+            budget: Override the default budget for this prompt type
+            logger: Optional logger; drops and truncations are reported on it
+        """
+        self.prompt_type = prompt_type
+        self.budget = budget or DEFAULT_TOKEN_BUDGETS.get(prompt_type, 2000)
+        self.logger = logger
+        self.last_result: Optional[PackResult] = None
+
+    @property
+    def last_prefix(self) -> Optional[StablePrefix]:
+        """Stable prefix of the last packed prompt (None before the first)"""
+        return self.last_result.prefix if self.last_result else None
+
+    def context_sections(
+        self,
+        context_parts: List[str],
+        name_prefix: str = "context",
+        header: Optional[str] = None
+    ) -> List[ContextSection]:
+        """
+        Wrap free-form context parts, earlier parts ranking higher on ties
+
+        Args:
+            context_parts: Context strings (classified by their heading)
+            name_prefix: Section name prefix, and group name
+            header: Optional heading emitted only if some part is kept
+        """
+        sections = []
+        if header:
+            sections.append(ContextSection(
+                f"{name_prefix}:header", header, group=name_prefix, is_header=True
+            ))
+
+        count = len(context_parts)
+        for i, part in enumerate(context_parts):
+            if not part or not part.strip():
+                continue
+            kind, priority = classify_context(part)
+            relevance = relevance_of(part) or (count - i) / (count + 1)
+            sections.append(ContextSection(
+                f"{name_prefix}:{kind}", part, priority, relevance=relevance, group=name_prefix
+            ))
+        return sections
+
+    def pack(self, sections: List[ContextSection], separator: str = "\n") -> PackResult:
+        """
+        Select and trim sections to fit the budget
+
+        Returns:
+            PackResult; its text joins the kept sections in their original order
+        """
+        separator_tokens = estimate_tokens(separator)
+        # Headers are paid for up front and refunded if their group is empty
+        fixed = [i for i, s in enumerate(sections) if s.required or s.is_header]
+        remaining = self.budget - sum(sections[i].tokens + separator_tokens for i in fixed)
+
+        chosen: Dict[int, str] = {i: sections[i].text for i in fixed}
+        result = PackResult(text="", budget=self.budget, used_tokens=0)
+
+        optional = sorted(
+            (i for i, s in enumerate(sections) if not (s.required or s.is_header)),
+            key=lambda i: (-sections[i].priority, -sections[i].relevance, i)
+        )
+
+        for i in optional:
+            section = sections[i]
+            cost = section.tokens + separator_tokens
+            if cost <= remaining:
+                chosen[i] = section.text
+                remaining -= cost
+                continue
+
+            room = remaining - separator_tokens
+            if section.truncatable and room >= MIN_TRUNCATED_TOKENS:
+                text = truncate_to_tokens(section.text, room)
+                tokens = estimate_tokens(text)
+                chosen[i] = text
+                remaining -= tokens + separator_tokens
+                result.truncated.append((section.name, section.tokens, tokens))
+                continue
+
+            result.dropped.append((section.name, section.tokens))
+
+        kept_groups = {
+            sections[i].group for i in chosen
+            if sections[i].group and not sections[i].is_header
+        }
+        for i, section in enumerate(sections):
+            if section.is_header and section.group not in kept_groups:
+                del chosen[i]
+                remaining += section.tokens + separator_tokens
+
+        ordered = [chosen[i] for i in sorted(chosen)]
+        result.text = separator.join(ordered)
+        result.used_tokens = self.budget - remaining
+        result.kept = [sections[i].name for i in sorted(chosen)]
+        result.prefix = self._stable_prefix(sections, chosen, separator)
+        self.last_result = result
+
+        if self.logger and (result.dropped or result.truncated):
+            self.logger.system(f"[Context Packer] {self.prompt_type}: {result.summary()}")
+
+        return result
+
+    def _stable_prefix(
+        self,
+        sections: List[ContextSection],
+        chosen: Dict[int, str],
+        separator: str
+    ) -> Optional[StablePrefix]:
+        """Leading run of kept, untrimmed stable sections (None if there is none)"""
+        texts: List[str] = []
+        parts: Dict[str, str] = {}
+        ends: List[int] = []
+        for i in sorted(chosen):
+            section = sections[i]
+            if not section.stable or chosen[i] != section.text:
+                break
+            texts.append(section.text)
+            parts[section.name] = hashlib.sha1(section.text.encode('utf-8')).hexdigest()[:12]
+            ends.append(estimate_tokens(separator.join(texts)))
+        if not texts:
+            return None
+        text = separator.join(texts)
+        return StablePrefix(self.prompt_type, text, ends[-1], parts, ends)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Keep the head of text within max_tokens: whole lines first, then the
+    overflowing line cut at a word boundary, marked with [...]
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    marker = " [...]"
+    budget = max_tokens - estimate_tokens(marker)
+    kept: List[str] = []
+    used = 0
+    for line in text.split("\n"):
+        cost = estimate_tokens(line) + 1
+        if used + cost <= budget:
+            kept.append(line)
+            used += cost
+            continue
+
+        room = budget - used - 1
+        if room > 0:
+            partial = _cut_to_tokens(line, room)
+            if partial:
+                kept.append(partial)
+        break
+
+    return "\n".join(kept).rstrip() + marker
+
+
+def _cut_to_tokens(line: str, max_tokens: int) -> str:
+    """Longest word-boundary prefix of line within max_tokens (binary search)"""
+    words = line.split(" ")
+    low, high = 0, len(words)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(" ".join(words[:mid])) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return " ".join(words[:low])
@@ -6,7 +6,9 @@ REFACTORED: Uses tool_manager instead of deprecated tool_execution_manager
 from typing import Optional
 from pathlib import Path
 import asyncio
-import requests
+
+from BASE.core.llm_client import get_ollama_client
+from BASE.core.llm_scheduler import LLMPriority
 
 
 class CoreInitializer:
@@ -18,7 +20,7 @@ class CoreInitializer:
         'ai_core', 'config', 'controls', 'project_root', 'logger', 'main_loop',
         'memory_manager', 'memory_search', 'session_file_manager',
         'processing_delegator', 'control_manager', 'tool_manager',  # RENAMED
-        'action_state_manager', 'instruction_persistence_manager'
+        'action_state_manager', 'instruction_persistence_manager', 'llm_client'
     )
     
     def __init__(self, ai_core, config, controls, project_root, logger, main_loop):
@@ -29,6 +31,12 @@ class CoreInitializer:
         self.project_root = project_root
         self.logger = logger
         self.main_loop = main_loop
+        self.llm_client = get_ollama_client(config.ollama_endpoint, config.ollama_pool_size)
+        self.llm_client.scheduler.configure(
+            default_limit=config.llm_model_concurrency,
+            model_limits=config.llm_model_limits,
+            preemption=config.llm_preemption
+        )
         
         # Initialized components
         self.memory_manager = None
@@ -404,20 +412,11 @@ class CoreInitializer:
             for model in models_to_preload:
                 self.logger.system(f"Preloading model: {model}")
                 
-                payload = {
-                    "model": model,
-                    "prompt": "initialize",
-                    "stream": False,
-                    "keep_alive": "24h"
-                }
-                
                 try:
-                    response = requests.post(
-                        f"{self.config.ollama_endpoint}/api/generate",
-                        json=payload,
-                        timeout=60
+                    self.llm_client.sync.generate(
+                        model, "initialize", timeout=60, keep_alive="24h",
+                        priority=LLMPriority.MAINTENANCE
                     )
-                    response.raise_for_status()
                     self.logger.system(f"Model loaded: {model}")
                 except Exception as e:
                     self.logger.warning(f"Could not preload {model}: {e}")
@@ -450,41 +449,22 @@ class CoreInitializer:
     # ========================================================================
     
     def _create_ollama_caller(self):
-        """Create Ollama API caller function"""
+        """Create blocking Ollama API caller function (shared client's sync facade)"""
         def call_ollama(prompt: str, model: str, system_prompt: Optional[str] = None,
                        image_data: str = "") -> str:
             """Internal Ollama API caller"""
             try:
-                if image_data:
-                    url = f"{self.config.ollama_endpoint}/api/chat"
-                    messages = []
-                    if system_prompt:
-                        messages.append({"role": "system", "content": system_prompt})
-                    messages.append({
-                        "role": "user", "content": prompt, "images": [image_data]
-                    })
-                    payload = {
-                        "model": model, "messages": messages, "stream": False,
-                        "keep_alive": self.config.ollama_keep_alive
-                    }
-                else:
-                    url = f"{self.config.ollama_endpoint}/api/generate"
-                    full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-                    payload = {
-                        "model": model, "prompt": full_prompt, "stream": False,
+                options = None
+                if not image_data:
+                    options = {
                         "temperature": 0.7, "top_p": 0.9, "top_k": 40,
                         "repeat_penalty": 1.1,
-                        "keep_alive": self.config.ollama_keep_alive,
-                        "options": {"num_ctx": self.config.ollama_num_ctx}
+                        "num_ctx": self.config.ollama_num_ctx
                     }
-                
-                response = requests.post(url, json=payload, timeout=30)
-                response.raise_for_status()
-                result = response.json()
-                
-                content = (result.get("response", "") or 
-                          result.get("message", {}).get("content", ""))
-                return content.strip()
+                return self.llm_client.sync.complete(
+                    prompt, model, system_prompt, image_data,
+                    options=options, keep_alive=self.config.ollama_keep_alive, timeout=30
+                )
             except Exception as e:
                 self.logger.error(f"Ollama API error: {e}")
                 return ""
@@ -0,0 +1,468 @@
+# Filename: BASE/core/llm_client.py
+"""
+Shared Ollama Client
+====================
+One pooled HTTP client per Ollama endpoint, replacing the per-module
+`requests.post` callers that opened a fresh connection for every call and,
+when called from `async def` code, blocked the whole AICore event loop.
+
+- OllamaClient exposes awaitable generate / chat / embed / complete; the
+  HTTP round trip runs on a small worker pool, so the cognitive loop, tool
+  context loops and response generation can wait on the model concurrently
+- OllamaClient.sync is a thread-safe blocking facade with the same methods,
+  for callers that are not coroutines (content filter, summarizer, preload)
+- both share one keep-alive connection pool (requests.Session)
+- stream_complete yields the reply chunk by chunk as Ollama produces it,
+  for callers that act before generation finishes (streamed speech)
+- complete / stream_complete take the prompt's StablePrefix and record it
+  in the client's PromptPrefixCache (see prompt_cache.py), so unchanged
+  prefixes stay in Ollama's KV cache and changes are detected
+- every generate / chat / complete / stream goes through the client's
+  LLMScheduler (see llm_scheduler.py): callers pass a `priority` class,
+  requests queue per model, and proactive work is preempted by user-facing
+  work
+
+get_ollama_client(endpoint) returns the process-wide instance.
+"""
+
+import json
+import time
+import asyncio
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Any, Optional, Tuple, Iterator, AsyncIterator, Callable
+
+from BASE.core.llm_scheduler import LLMScheduler, LLMPriority, LLMPreempted, LLMTicket
+from BASE.core.prompt_cache import PromptPrefixCache
+from BASE.core.context_packer import StablePrefix
+
+DEFAULT_POOL_SIZE = 8
+DEFAULT_TIMEOUT = 120
+
+
+class OllamaClient:
+    """Pooled Ollama client with async methods and a sync facade"""
+
+    def __init__(self, endpoint: str, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT):
+        """
+        Args:
+            endpoint: Ollama base URL
+            pool_size: Kept-alive connections, and concurrent async requests
+            timeout: Default per-request timeout in seconds
+        """
+        self.endpoint = endpoint.rstrip('/')
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.pool_size, thread_name_prefix="OllamaClient"
+        )
+
+        self.scheduler = LLMScheduler()
+        self.prefix_cache = PromptPrefixCache()
+        self.sync = SyncOllamaClient(self)
+
+        # Request accounting
+        self._stats_lock = threading.Lock()
+        self.requests_made = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.total_seconds = 0.0
+
+    # ========================================================================
+    # REQUEST BUILDING
+    # ========================================================================
+
+    @staticmethod
+    def build_request(
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str] = None,
+        image_data: str = "",
+        options: Optional[Dict[str, Any]] = None,
+        keep_alive: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        (path, payload) for a one-shot completion: /api/chat when an image
+        is attached, otherwise /api/generate with the system prompt prefixed
+        """
+        if image_data:
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt, "images": [image_data]})
+            payload = {"model": model, "messages": messages, "stream": False}
+            path = "/api/chat"
+        else:
+            full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+            payload = {"model": model, "prompt": full_prompt, "stream": False}
+            path = "/api/generate"
+
+        if options:
+            payload["options"] = options
+        if keep_alive:
+            payload["keep_alive"] = keep_alive
+        return path, payload
+
+    @staticmethod
+    def response_text(result: Dict[str, Any]) -> str:
+        """Text of a /api/generate or /api/chat response"""
+        return result.get("response", "") or result.get("message", {}).get("content", "")
+
+    # ========================================================================
+    # TRANSPORT
+    # ========================================================================
+
+    def _post(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+        ticket: Optional[LLMTicket] = None
+    ) -> Dict[str, Any]:
+        """
+        Blocking POST over the shared pool (raises on HTTP errors)
+
+        A preemptible generation is read as a stream so that cancelling its
+        ticket drops the connection, which stops Ollama generating it.
+        """
+        if ticket is not None and ticket.preemptible and path in ("/api/generate", "/api/chat"):
+            text = "".join(self._stream(path, payload, timeout, ticket.cancelled.is_set))
+            if ticket.cancelled.is_set():
+                raise LLMPreempted(f"proactive request on {ticket.model} preempted in flight")
+            return {"message": {"content": text}} if path == "/api/chat" else {"response": text}
+
+        with self._stats_lock:
+            self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            response = self._session.post(
+                f"{self.endpoint}{path}", json=payload, timeout=timeout or self.timeout
+            )
+            response.raise_for_status()
+            return response.json()
+        except Exception:
+            with self._stats_lock:
+                self.failures += 1
+            raise
+        finally:
+            with self._stats_lock:
+                self.in_flight -= 1
+                self.requests_made += 1
+                self.total_seconds += time.perf_counter() - start
+
+    def _scheduled_post(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        timeout: Optional[float],
+        priority: LLMPriority
+    ) -> Dict[str, Any]:
+        """_post once the scheduler admits it (blocking callers)"""
+        ticket = self.scheduler.enqueue(payload.get("model", ""), priority)
+        try:
+            self.scheduler.wait(ticket)
+            return self._post(path, payload, timeout, ticket)
+        finally:
+            self.scheduler.release(ticket)
+
+    async def _post_async(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        timeout: Optional[float],
+        priority: LLMPriority
+    ) -> Dict[str, Any]:
+        """
+        Awaitable scheduled POST; the calling event loop stays free meanwhile
+
+        The slot is released when the HTTP request finishes on its worker,
+        not when the caller stops awaiting, so a cancelled caller cannot
+        push a model past its concurrency limit.
+        """
+        ticket = self.scheduler.enqueue(payload.get("model", ""), priority)
+        try:
+            await self.scheduler.wait_async(ticket)
+            future = self._executor.submit(self._post, path, payload, timeout, ticket)
+        except BaseException:
+            self.scheduler.release(ticket)
+            raise
+        future.add_done_callback(lambda _: self.scheduler.release(ticket))
+        return await asyncio.wrap_future(future)
+
+    def _stream(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = None,
+        should_stop: Optional[Callable[[], bool]] = None
+    ) -> Iterator[str]:
+        """Blocking streamed POST, yielding text chunks until done or stopped"""
+        with self._stats_lock:
+            self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            with self._session.post(
+                f"{self.endpoint}{path}", json=dict(payload, stream=True),
+                timeout=timeout or self.timeout, stream=True
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if should_stop is not None and should_stop():
+                        break
+                    if not line:
+                        continue
+                    result = json.loads(line)
+                    if result.get("error"):
+                        raise RuntimeError(result["error"])
+                    text = self.response_text(result)
+                    if text:
+                        yield text
+                    if result.get("done"):
+                        break
+        except Exception:
+            with self._stats_lock:
+                self.failures += 1
+            raise
+        finally:
+            with self._stats_lock:
+                self.in_flight -= 1
+                self.requests_made += 1
+                self.total_seconds += time.perf_counter() - start
+
+    # ========================================================================
+    # ASYNC API
+    # ========================================================================
+
+    async def generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        priority: LLMPriority = LLMPriority.REACTIVE,
+        **fields
+    ) -> str:
+        """/api/generate; extra fields (keep_alive, context, ...) are sent as-is"""
+        payload = {"model": model, "prompt": prompt, "stream": False, **fields}
+        if options:
+            payload["options"] = options
+        return self.response_text(await self._post_async("/api/generate", payload, timeout, priority))
+
+    async def chat(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        options: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        priority: LLMPriority = LLMPriority.REACTIVE,
+        **fields
+    ) -> str:
+        """/api/chat; returns the assistant message content"""
+        payload = {"model": model, "messages": messages, "stream": False, **fields}
+        if options:
+            payload["options"] = options
+        return self.response_text(await self._post_async("/api/chat", payload, timeout, priority))
+
+    async def embed(
+        self,
+        model: str,
+        texts: List[str],
+        timeout: Optional[float] = None,
+        priority: LLMPriority = LLMPriority.REACTIVE
+    ) -> List[List[float]]:
+        """/api/embed batch embedding"""
+        result = await self._post_async("/api/embed", {"model": model, "input": texts}, timeout, priority)
+        return result.get("embeddings") or []
+
+    async def complete(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str] = None,
+        image_data: str = "",
+        options: Optional[Dict[str, Any]] = None,
+        keep_alive: Optional[str] = None,
+        timeout: Optional[float] = None,
+        priority: LLMPriority = LLMPriority.REACTIVE,
+        prefix: Optional[StablePrefix] = None
+    ) -> str:
+        """One-shot completion (see build_request), stripped text"""
+        path, payload = self.build_request(prompt, model, system_prompt, image_data, options, keep_alive)
+        self.prefix_cache.apply(model, payload, prefix)
+        return self.response_text(await self._post_async(path, payload, timeout, priority)).strip()
+
+    async def stream_complete(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str] = None,
+        image_data: str = "",
+        options: Optional[Dict[str, Any]] = None,
+        keep_alive: Optional[str] = None,
+        timeout: Optional[float] = None,
+        priority: LLMPriority = LLMPriority.SPOKEN,
+        prefix: Optional[StablePrefix] = None
+    ) -> AsyncIterator[str]:
+        """
+        One-shot completion streamed as raw text chunks; the HTTP read runs
+        on the worker pool and stops early if the consumer stops iterating
+        """
+        path, payload = self.build_request(prompt, model, system_prompt, image_data, options, keep_alive)
+        self.prefix_cache.apply(model, payload, prefix)
+        ticket = self.scheduler.enqueue(model, priority)
+        try:
+            await self.scheduler.wait_async(ticket)
+        except BaseException:
+            self.scheduler.release(ticket)
+            raise
+
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        cancel = threading.Event()
+        finished = object()
+
+        def put(item):
+            try:
+                loop.call_soon_threadsafe(chunks.put_nowait, item)
+            except RuntimeError:
+                cancel.set()   # Consumer's loop already closed
+
+        def pump():
+            try:
+                stop = lambda: cancel.is_set() or ticket.cancelled.is_set()
+                for chunk in self._stream(path, payload, timeout, stop):
+                    put(chunk)
+                if ticket.cancelled.is_set():
+                    put(LLMPreempted(f"{priority.name.lower()} stream on {model} preempted"))
+            except Exception as e:
+                put(e)
+            finally:
+                self.scheduler.release(ticket)
+                put(finished)
+
+        loop.run_in_executor(self._executor, pump)
+        try:
+            while True:
+                item = await chunks.get()
+                if item is finished:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            cancel.set()
+
+    # ========================================================================
+    # MAINTENANCE / STATS
+    # ========================================================================
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self._session.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                'requests': self.requests_made,
+                'failures': self.failures,
+                'in_flight': self.in_flight,
+                'avg_seconds': (self.total_seconds / self.requests_made) if self.requests_made else 0.0,
+                'pool_size': self.pool_size,
+                'scheduler': self.scheduler.get_stats(),
+                'prompt_cache': self.prefix_cache.get_stats()
+            }
+
+
+class SyncOllamaClient:
+    """Blocking facade over an OllamaClient (safe to call from any thread)"""
+
+    def __init__(self, client: OllamaClient):
+        self._client = client
+
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        priority: LLMPriority = LLMPriority.REACTIVE,
+        **fields
+    ) -> str:
+        payload = {"model": model, "prompt": prompt, "stream": False, **fields}
+        if options:
+            payload["options"] = options
+        return self._client.response_text(
+            self._client._scheduled_post("/api/generate", payload, timeout, priority)
+        )
+
+    def chat(
+        self,
+        model: str,
+        messages: List[Dict[str, Any]],
+        options: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        priority: LLMPriority = LLMPriority.REACTIVE,
+        **fields
+    ) -> str:
+        payload = {"model": model, "messages": messages, "stream": False, **fields}
+        if options:
+            payload["options"] = options
+        return self._client.response_text(
+            self._client._scheduled_post("/api/chat", payload, timeout, priority)
+        )
+
+    def embed(
+        self,
+        model: str,
+        texts: List[str],
+        timeout: Optional[float] = None,
+        priority: LLMPriority = LLMPriority.REACTIVE
+    ) -> List[List[float]]:
+        result = self._client._scheduled_post("/api/embed", {"model": model, "input": texts}, timeout, priority)
+        return result.get("embeddings") or []
+
+    def complete(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str] = None,
+        image_data: str = "",
+        options: Optional[Dict[str, Any]] = None,
+        keep_alive: Optional[str] = None,
+        timeout: Optional[float] = None,
+        priority: LLMPriority = LLMPriority.REACTIVE,
+        prefix: Optional[StablePrefix] = None
+    ) -> str:
+        path, payload = self._client.build_request(prompt, model, system_prompt, image_data, options, keep_alive)
+        self._client.prefix_cache.apply(model, payload, prefix)
+        return self._client.response_text(
+            self._client._scheduled_post(path, payload, timeout, priority)
+        ).strip()
+
+
+# ============================================================================
+# SHARED INSTANCES
+# ============================================================================
+
+_clients: Dict[str, OllamaClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_ollama_client(endpoint: str, pool_size: int = DEFAULT_POOL_SIZE) -> OllamaClient:
+    """
+    Process-wide client for an endpoint (pool_size applies on first use)
+    """
+    key = endpoint.rstrip('/')
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = OllamaClient(key, pool_size=pool_size)
+            _clients[key] = client
+        return client
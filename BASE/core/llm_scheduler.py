@@ -0,0 +1,323 @@
+# Filename: BASE/core/llm_scheduler.py
+"""
+LLM Request Scheduler
+=====================
+Every caller of the local Ollama (spoken replies, reactive and proactive
+thoughts, tool follow-ups, day summaries) used to fire its request straight
+at the server, so a user message could sit behind a slow proactive thought.
+LLMScheduler sits inside the shared OllamaClient and decides who runs next:
+
+- priority classes: spoken > reactive > tool follow-up > proactive > maintenance
+- a concurrency limit per model; beyond it requests wait, highest priority
+  first, FIFO within a class
+- preemption: when spoken or reactive work arrives, queued and in-flight
+  proactive requests are cancelled (the caller gets LLMPreempted; the
+  cognitive loop simply thinks again later)
+- queue depth and wait-time metrics per class
+
+Coroutines wait on a future, so only admitted requests ever take a worker
+thread. A blocking wait on a thread that runs an event loop could deadlock
+the loop, so such calls are admitted immediately (and still counted).
+"""
+
+import time
+import heapq
+import asyncio
+import itertools
+import threading
+from enum import IntEnum
+from collections import deque
+from typing import Dict, List, Optional, Any
+
+
+class LLMPriority(IntEnum):
+    """Request classes, most urgent first"""
+    SPOKEN = 0
+    REACTIVE = 1
+    TOOL_FOLLOWUP = 2
+    PROACTIVE = 3
+    MAINTENANCE = 4
+
+
+# Arrival of these classes cancels preemptible work
+PREEMPTING = (LLMPriority.SPOKEN, LLMPriority.REACTIVE)
+PREEMPTIBLE = (LLMPriority.PROACTIVE,)
+
+
+class LLMPreempted(Exception):
+    """The request was cancelled to make room for higher-priority work"""
+
+
+class LLMTicket:
+    """One request's place in the scheduler"""
+
+    __slots__ = (
+        'model', 'priority', 'seq', 'enqueued_at', 'started_at',
+        'cancelled', 'granted', '_waker'
+    )
+
+    def __init__(self, model: str, priority: LLMPriority, seq: int):
+        self.model = model
+        self.priority = priority
+        self.seq = seq
+        self.enqueued_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.cancelled = threading.Event()
+        self.granted = False
+        self._waker = None   # Wakes the waiting caller (thread or coroutine)
+
+    @property
+    def preemptible(self) -> bool:
+        return self.priority in PREEMPTIBLE
+
+    def __lt__(self, other: 'LLMTicket') -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class LLMScheduler:
+    """Per-model admission control with priority classes and preemption"""
+
+    def __init__(
+        self,
+        default_limit: int = 1,
+        model_limits: Optional[Dict[str, int]] = None,
+        preemption: bool = True
+    ):
+        """
+        Args:
+            default_limit: Concurrent requests per model
+            model_limits: Per-model overrides of default_limit
+            preemption: Cancel proactive work when spoken/reactive work arrives
+        """
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._waiting: Dict[str, List[LLMTicket]] = {}
+        self._running: Dict[str, set] = {}
+        self.default_limit = max(1, int(default_limit))
+        self.model_limits = {m: max(1, int(n)) for m, n in (model_limits or {}).items()}
+        self.preemption = preemption
+
+        # Metrics per class
+        self._waits: Dict[LLMPriority, deque] = {p: deque(maxlen=200) for p in LLMPriority}
+        self._completed = {p: 0 for p in LLMPriority}
+        self._preempted = {p: 0 for p in LLMPriority}
+
+    def configure(
+        self,
+        default_limit: Optional[int] = None,
+        model_limits: Optional[Dict[str, int]] = None,
+        preemption: Optional[bool] = None
+    ):
+        """Change limits or preemption (takes effect for waiting requests too)"""
+        with self._lock:
+            if default_limit is not None:
+                self.default_limit = max(1, int(default_limit))
+            if model_limits is not None:
+                self.model_limits = {m: max(1, int(n)) for m, n in model_limits.items()}
+            if preemption is not None:
+                self.preemption = preemption
+            for model in list(self._waiting):
+                self._dispatch(model)
+
+    def limit_for(self, model: str) -> int:
+        return self.model_limits.get(model, self.default_limit)
+
+    # ========================================================================
+    # ADMISSION
+    # ========================================================================
+
+    def enqueue(self, model: str, priority: LLMPriority) -> LLMTicket:
+        """
+        Register a request; it is admitted at once if its model has room
+
+        Spoken/reactive arrivals cancel proactive requests first.
+        """
+        ticket = LLMTicket(model, LLMPriority(priority), next(self._seq))
+        with self._lock:
+            if self.preemption and ticket.priority in PREEMPTING:
+                self._preempt_locked()
+            heapq.heappush(self._waiting.setdefault(model, []), ticket)
+            self._dispatch(model)
+        return ticket
+
+    def wait(self, ticket: LLMTicket, timeout: Optional[float] = None):
+        """
+        Block until admitted (raises LLMPreempted / TimeoutError)
+
+        On a thread running an event loop the ticket is admitted at once.
+        """
+        if not self._granted_or_cancelled(ticket):
+            try:
+                asyncio.get_running_loop()
+                on_loop_thread = True
+            except RuntimeError:
+                on_loop_thread = False
+
+            if on_loop_thread:
+                self._admit_now(ticket)
+            else:
+                woken = threading.Event()
+                with self._lock:
+                    if not (ticket.granted or ticket.cancelled.is_set()):
+                        ticket._waker = woken.set
+                    else:
+                        woken.set()
+                if not woken.wait(timeout):
+                    self._abandon(ticket)
+                    raise TimeoutError(f"Waited {timeout}s for an LLM slot on {ticket.model}")
+        self._raise_if_cancelled(ticket)
+
+    async def wait_async(self, ticket: LLMTicket):
+        """Await admission without holding a thread (raises LLMPreempted)"""
+        if not self._granted_or_cancelled(ticket):
+            loop = asyncio.get_running_loop()
+            admitted = loop.create_future()
+
+            def wake():
+                try:
+                    loop.call_soon_threadsafe(lambda: admitted.done() or admitted.set_result(None))
+                except RuntimeError:
+                    pass   # Waiter's loop already closed
+
+            with self._lock:
+                if not (ticket.granted or ticket.cancelled.is_set()):
+                    ticket._waker = wake
+                else:
+                    admitted.set_result(None)
+            try:
+                await admitted
+            except asyncio.CancelledError:
+                self._abandon(ticket)
+                raise
+        self._raise_if_cancelled(ticket)
+
+    def release(self, ticket: LLMTicket):
+        """Free the ticket's slot (call once the request is over, however it ended)"""
+        with self._lock:
+            running = self._running.get(ticket.model)
+            if running is not None and ticket in running:
+                running.discard(ticket)
+                if ticket.cancelled.is_set():
+                    self._preempted[ticket.priority] += 1
+                else:
+                    self._completed[ticket.priority] += 1
+            self._dispatch(ticket.model)
+
+    def preempt(self) -> int:
+        """Cancel all queued and in-flight preemptible requests now"""
+        with self._lock:
+            return self._preempt_locked()
+
+    # ========================================================================
+    # INTERNALS (caller holds the lock unless noted)
+    # ========================================================================
+
+    def _dispatch(self, model: str):
+        """Admit waiting tickets while the model has free slots"""
+        waiting = self._waiting.get(model)
+        running = self._running.setdefault(model, set())
+        while waiting and len(running) < self.limit_for(model):
+            ticket = heapq.heappop(waiting)
+            self._grant(ticket, running)
+
+    def _grant(self, ticket: LLMTicket, running: set):
+        ticket.granted = True
+        ticket.started_at = time.perf_counter()
+        self._waits[ticket.priority].append(ticket.started_at - ticket.enqueued_at)
+        running.add(ticket)
+        if ticket._waker:
+            ticket._waker()
+
+    def _preempt_locked(self) -> int:
+        cancelled = 0
+        for model, waiting in self._waiting.items():
+            keep = []
+            for ticket in waiting:
+                if ticket.preemptible:
+                    ticket.cancelled.set()
+                    self._preempted[ticket.priority] += 1
+                    if ticket._waker:
+                        ticket._waker()
+                    cancelled += 1
+                else:
+                    keep.append(ticket)
+            if len(keep) != len(waiting):
+                heapq.heapify(keep)
+                self._waiting[model] = keep
+
+        # In-flight ones stop reading their response (see OllamaClient) and
+        # release their slot, which admits the next waiter
+        for running in self._running.values():
+            for ticket in running:
+                if ticket.preemptible and not ticket.cancelled.is_set():
+                    ticket.cancelled.set()
+                    cancelled += 1
+        return cancelled
+
+    def _granted_or_cancelled(self, ticket: LLMTicket) -> bool:
+        with self._lock:
+            return ticket.granted or ticket.cancelled.is_set()
+
+    def _admit_now(self, ticket: LLMTicket):
+        """Admit past the limit (blocking callers on an event loop thread)"""
+        with self._lock:
+            if ticket.granted or ticket.cancelled.is_set():
+                return
+            waiting = self._waiting.get(ticket.model, [])
+            if ticket in waiting:
+                waiting.remove(ticket)
+                heapq.heapify(waiting)
+            self._grant(ticket, self._running.setdefault(ticket.model, set()))
+
+    def _abandon(self, ticket: LLMTicket):
+        """Withdraw a ticket whose caller gave up (takes the lock)"""
+        with self._lock:
+            waiting = self._waiting.get(ticket.model, [])
+            if ticket in waiting:
+                waiting.remove(ticket)
+                heapq.heapify(waiting)
+                return
+        if ticket.granted:
+            self.release(ticket)
+
+    @staticmethod
+    def _raise_if_cancelled(ticket: LLMTicket):
+        if ticket.cancelled.is_set():
+            raise LLMPreempted(f"{ticket.priority.name.lower()} request on {ticket.model} preempted")
+
+    # ========================================================================
+    # STATS
+    # ========================================================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, in-flight count and wait times per class"""
+        with self._lock:
+            queued = {p: 0 for p in LLMPriority}
+            running = {p: 0 for p in LLMPriority}
+            for waiting in self._waiting.values():
+                for ticket in waiting:
+                    queued[ticket.priority] += 1
+            for tickets in self._running.values():
+                for ticket in tickets:
+                    running[ticket.priority] += 1
+
+            classes = {}
+            for p in LLMPriority:
+                waits = list(self._waits[p])
+                classes[p.name.lower()] = {
+                    'queued': queued[p],
+                    'running': running[p],
+                    'completed': self._completed[p],
+                    'preempted': self._preempted[p],
+                    'avg_wait': sum(waits) / len(waits) if waits else 0.0,
+                    'max_wait': max(waits) if waits else 0.0
+                }
+
+            return {
+                'queue_depth': sum(queued.values()),
+                'in_flight': sum(running.values()),
+                'default_limit': self.default_limit,
+                'model_limits': dict(self.model_limits),
+                'preemption': self.preemption,
+                'classes': classes
+            }
@@ -0,0 +1,137 @@
+# Filename: BASE/core/pipeline_benchmark.py
+"""
+Pipeline Mode Benchmark
+=======================
+Runs the same user messages through ProcessingDelegator once per
+THOUGHT_PIPELINE mode (sequential / gated / combined) against the configured
+Ollama server and reports turn latency and LLM calls per turn.
+
+Each mode gets a fresh delegator (empty thought buffer, no memory, no
+tools), and one untimed warm-up turn so model loading is not
+charged to whichever mode runs first.
+
+Usage:
+    python -m BASE.core.pipeline_benchmark
+    python -m BASE.core.pipeline_benchmark --modes gated combined --turns 10
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from pathlib import Path
+from typing import List, Dict, Optional
+
+import personality.controls as controls
+from BASE.core.config import Config
+from BASE.core.processing_delegator import ProcessingDelegator, PIPELINE_MODES
+
+DEFAULT_MESSAGES = [
+    "Hey, how's it going?",
+    "What do you think about rainy days?",
+    "Can you remind me what we were just talking about?",
+    "Tell me something you find interesting.",
+    "Thanks, that's all for now."
+]
+
+
+def _llm_calls(delegator: ProcessingDelegator) -> int:
+    """Finished (completed or preempted) LLM requests so far"""
+    classes = delegator.llm_client.scheduler.get_stats()['classes']
+    return sum(c['completed'] + c['preempted'] for c in classes.values())
+
+
+async def run_mode(
+    mode: str,
+    messages: List[str],
+    project_root: Path
+) -> Dict:
+    """Time every message through one pipeline mode"""
+    controls.THOUGHT_PIPELINE = mode
+    config = Config()
+    delegator = ProcessingDelegator(
+        config=config,
+        controls_module=controls,
+        project_root=project_root
+    )
+
+    # Warm-up (loads the models; not timed)
+    await delegator.process_user_input(messages[0])
+    delegator.pipeline_skipped = dict.fromkeys(delegator.pipeline_skipped, 0)
+
+    latencies, calls, spoken = [], [], 0
+    for message in messages:
+        before = _llm_calls(delegator)
+        start = time.perf_counter()
+        response = await delegator.process_user_input(message)
+        latencies.append(time.perf_counter() - start)
+        calls.append(_llm_calls(delegator) - before)
+        spoken += bool(response)
+
+    return {
+        'mode': mode,
+        'turns': len(messages),
+        'mean': statistics.mean(latencies),
+        'median': statistics.median(latencies),
+        'max': max(latencies),
+        'calls_per_turn': statistics.mean(calls),
+        'replies': spoken,
+        'skipped': delegator.get_pipeline_stats()['skipped']
+    }
+
+
+def print_report(results: List[Dict]):
+    baseline = next((r for r in results if r['mode'] == 'sequential'), None)
+
+    print("\n=== Pipeline Benchmark ===\n")
+    print(f"{'mode':<12}{'turns':>6}{'mean s':>9}{'median s':>10}{'max s':>8}{'calls/turn':>12}{'replies':>9}")
+    for r in results:
+        print(
+            f"{r['mode']:<12}{r['turns']:>6}{r['mean']:>9.2f}{r['median']:>10.2f}"
+            f"{r['max']:>8.2f}{r['calls_per_turn']:>12.1f}{r['replies']:>9}"
+        )
+
+    if baseline:
+        print()
+        for r in results:
+            if r is not baseline and r['mean'] > 0:
+                print(f"{r['mode']}: {baseline['mean'] / r['mean']:.2f}x vs sequential "
+                      f"(skipped {r['skipped']})")
+    print()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare THOUGHT_PIPELINE modes on the configured Ollama server")
+    parser.add_argument("--modes", nargs="+", choices=PIPELINE_MODES, default=list(PIPELINE_MODES),
+                        help="Modes to run (default: all)")
+    parser.add_argument("--turns", type=int, default=len(DEFAULT_MESSAGES),
+                        help="Messages per mode (cycles the built-in set)")
+    parser.add_argument("--messages", type=Path, default=None,
+                        help="Text file with one user message per line")
+
+    args = parser.parse_args(argv)
+
+    pool = DEFAULT_MESSAGES
+    if args.messages:
+        pool = [line.strip() for line in args.messages.read_text(encoding='utf-8').splitlines() if line.strip()]
+        if not pool:
+            print(f"No messages in {args.messages}")
+            return
+    messages = [pool[i % len(pool)] for i in range(max(1, args.turns))]
+
+    project_root = Path(__file__).resolve().parents[2]
+    original_mode = getattr(controls, 'THOUGHT_PIPELINE', 'gated')
+    results = []
+    try:
+        for mode in args.modes:
+            print(f"Running {mode} ({len(messages)} turns)...")
+            results.append(asyncio.run(run_mode(mode, messages, project_root)))
+    finally:
+        controls.THOUGHT_PIPELINE = original_mode
+
+    print_report(results)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
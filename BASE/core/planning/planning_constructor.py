@@ -8,16 +8,21 @@ FIX: Now properly retrieves and includes tool instructions from persistence mana
 
 Prompt Components:
 1. Personality (core identity + proactive style)
-2. Thought chain (recent thoughts for continuity)
-3. Tool list OR retrieved tool instructions (based on persistence)
+2. Tool list OR retrieved tool instructions (based on persistence)
+3. Thought chain (recent thoughts for continuity)
 4. Current situation (what's happening now)
 5. Response guidance (how to plan ahead)
 
+Identity, mode text and tools lead the prompt: they only change with the
+personality or the tool set, so Ollama's prompt cache stays warm between
+planning cycles.
+
 Focus: Looking forward, anticipating needs, setting goals
 """
 
 from typing import List, Optional
 from BASE.core.planning.planning_parts import PlanningPromptParts
+from BASE.core.context_packer import ContextPacker, ContextSection
 from personality.prompts.personality_prompt_parts import PersonalityPromptParts
 from personality.bot_info import username
 
@@ -25,16 +30,18 @@ from personality.bot_info import username
 class PlanningConstructor:
     """Constructs prompts for planning thinking"""
     
-    def __init__(self, tool_manager=None, logger=None):
+    def __init__(self, tool_manager=None, logger=None, token_budget: Optional[int] = None):
         """
         Initialize planning constructor
         
         Args:
             tool_manager: ToolManager instance for tool instructions
             logger: Optional logger instance
+            token_budget: Prompt token budget (default: DEFAULT_TOKEN_BUDGETS['planning'])
         """
         self.tool_manager = tool_manager
         self.logger = logger
+        self.packer = ContextPacker('planning', token_budget, logger)
         
         # Initialize prompt parts
         self.parts = PlanningPromptParts()
@@ -60,27 +67,38 @@ class PlanningConstructor:
         sections = []
         
         # 1. Personality injection (core identity)
-        sections.append(self.personality.get_personality_injection('thought'))
-        
-        # 2. Recent thoughts (for continuity)
-        sections.append(self._format_thought_chain(thought_chain))
+        sections.append(ContextSection(
+            "personality", self.personality.get_personality_injection('thought'),
+            required=True, stable=True
+        ))
         
-        # 3. Mode instructions
-        sections.append(self.parts.get_mode_instructions())
+        # 2. Mode instructions
+        sections.append(ContextSection(
+            "mode", self.parts.get_mode_instructions(), required=True, stable=True
+        ))
         
-        # 4. Tool instructions (FIXED: Check persistence and include detailed instructions)
+        # 3. Tool instructions (FIXED: Check persistence and include detailed instructions)
         if self.tool_manager:
             tool_section = self._get_tool_instructions_section()
             if tool_section:
-                sections.append(tool_section)
+                sections.append(ContextSection(
+                    "tools", tool_section, priority=7, truncatable=False, stable=True
+                ))
+        
+        # 4. Recent thoughts (for continuity) - after the stable prefix
+        sections.append(ContextSection(
+            "thoughts", self._format_thought_chain(thought_chain), required=True
+        ))
         
         # 5. Current situation
-        sections.append(self._format_current_situation(ongoing_context, time_context))
+        sections.append(ContextSection(
+            "situation", self._format_current_situation(ongoing_context, time_context), priority=6
+        ))
         
         # 6. Output format
-        sections.append(self.parts.get_output_format())
+        sections.append(ContextSection("output_format", self.parts.get_output_format(), required=True))
         
-        prompt = "\n".join(sections)
+        prompt = self.packer.pack(sections).text
         
         if self.logger:
             self.logger.prompt(f"[Planning Thinking Prompt]\n{prompt}")
@@ -4,15 +4,29 @@ Processing Delegator - REFACTORED for Modular Prompt System
 ===========================================================
 NEW: Uses SpokenConstructor for response generation
 Removed old ResponseGenerator dependency
+
+Pipeline modes (THOUGHT_PIPELINE in controls):
+- sequential: two thought passes, then the spoken reply (always 3 LLM calls)
+- gated: the second ("tool results") pass only runs if tools actually ran
+  or new events arrived during the first
+- combined: the first pass also writes the reply; if it requested no tools
+  that reply is used and the spoken stage is skipped (1 LLM call), otherwise
+  it continues as gated
+Compare them with BASE/core/pipeline_benchmark.py.
 """
+import re
 import asyncio
 import time
-from typing import Optional, List
+from collections import deque
+from typing import Optional, List, Callable
 from pathlib import Path
 
-from BASE.core.thought_processor import ThoughtProcessor
+from BASE.core.thought_processor import ThoughtProcessor, ThoughtPass
+from BASE.core.llm_client import get_ollama_client
+from BASE.core.llm_scheduler import LLMPriority
+from BASE.core.context_packer import StablePrefix
 from BASE.core.logger import Logger
-from BASE.memory.memory_search import MemorySearch
+from BASE.memory.memory_search import MemorySearch, QuerySpec
 
 # NEW: Import spoken constructor and response decider
 from BASE.core.response_decider import ResponseDecider, PriorityLevel
@@ -21,6 +35,32 @@ from BASE.core.spoken.spoken_constructor import SpokenConstructor
 from personality.controls import KILL_COMMAND
 from personality.bot_info import username, agentname
 
+RESPONSE_OPTIONS = {
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "top_k": 40,
+    "repeat_penalty": 1.1
+}
+
+THINK_PATTERN = re.compile(r"<think>(.*?)</think>", re.DOTALL)
+
+PIPELINE_MODES = ("sequential", "gated", "combined")
+
+
+def _speakable_prefix(raw: str) -> str:
+    """
+    Part of a still-streaming reply that is safe to speak: closed <think>
+    blocks removed, and cut before an unclosed (or half-arrived) <think>
+    """
+    text = THINK_PATTERN.sub('', raw)
+    start = text.find("<think>")
+    if start != -1:
+        return text[:start]
+    for size in range(len("<think>") - 1, 0, -1):
+        if text.endswith("<think>"[:size]):
+            return text[:-size]
+    return text
+
 
 class ProcessingDelegator:
     """
@@ -59,6 +99,7 @@ class ProcessingDelegator:
         # Store dependencies
         self.session_file_manager = session_file_manager
         self.tool_manager = None
+        self.llm_client = get_ollama_client(config.ollama_endpoint, config.ollama_pool_size)
         
         # Initialize STAGE 1: Thought Processor
         self.thought_processor = ThoughtProcessor(
@@ -73,7 +114,8 @@ class ProcessingDelegator:
         # NEW: Initialize STAGE 2: Spoken Constructor
         self.spoken_constructor = SpokenConstructor(
             memory_search=self.memory_search,
-            logger=self.logger
+            logger=self.logger,
+            token_budget=config.prompt_token_budgets.get('spoken')
         )
         
         # NEW: Initialize response decider (for priority detection)
@@ -83,6 +125,10 @@ class ProcessingDelegator:
             logger=self.logger
         )
         
+        # Per pipeline mode: turn latency (thoughts + reply) and skipped passes
+        self.pipeline_latencies = {mode: deque(maxlen=100) for mode in PIPELINE_MODES}
+        self.pipeline_skipped = {'tool_pass': 0, 'spoken_stage': 0}
+        
         self.logger.system("ProcessingDelegator initialized with modular spoken constructor")
     
     # ========================================================================
@@ -98,11 +144,15 @@ class ProcessingDelegator:
         image_path: Optional[Path] = None,
         timestamp: Optional[float] = None,
         username_override: Optional[str] = None,
-        context_parts: list = None
+        context_parts: list = None,
+        on_sentence: Optional[Callable[[str], None]] = None
     ) -> Optional[str]:
         """
         Process user input - REFACTORED
         NEW: Uses SpokenConstructor for response generation
+        
+        on_sentence, when given, streams the reply: it is called with each
+        finished sentence while the rest is still being generated.
         """
         # Kill command check
         if user_input and isinstance(user_input, str):
@@ -173,7 +223,9 @@ class ProcessingDelegator:
             if session_context:
                 context_parts.insert(0, session_context)
         
-        # Build memory context
+        # Build memory context (a new turn: drop the previous turn's retrieval)
+        if self.memory_search:
+            self.memory_search.begin_turn()
         recent_thoughts = self.thought_processor.thought_buffer.get_thoughts_for_response()[-5:]
         memory_context = self._build_memory_context(
             original_input, 
@@ -185,20 +237,38 @@ class ProcessingDelegator:
             context_parts.insert(0, memory_context)
             self.logger.memory("[Memory] Retrieved context")
         
-        # STAGE 1: THOUGHT PROCESSING
-        await self.thought_processor.process_thoughts(context_parts=context_parts)
-        
-        # Process tool results
-        await self.thought_processor.process_thoughts(context_parts=context_parts)
+        pipeline = self._pipeline_mode()
+        stage_start = time.perf_counter()
         
-        # STAGE 2: RESPONSE GENERATION - REFACTORED
-        response = await self._generate_spoken_response(
-            user_text=original_input,
+        # STAGE 1: THOUGHT PROCESSING
+        first_pass = await self.thought_processor.run_thought_pass(
             context_parts=context_parts,
-            chat_context=clean_chat,
-            is_chat_engagement=should_promote
+            with_reply=(pipeline == "combined")
         )
         
+        if pipeline == "combined" and first_pass.reactive and not first_pass.actions and first_pass.reply:
+            # Thoughts and reply came from one call; no tool results to wait for
+            response = self._accept_combined_reply(first_pass.reply)
+            self.pipeline_skipped['tool_pass'] += 1
+            self.pipeline_skipped['spoken_stage'] += 1
+        else:
+            # Process tool results
+            if pipeline == "sequential" or self._has_pending_results(first_pass):
+                await self.thought_processor.process_thoughts(context_parts=context_parts)
+            else:
+                self.pipeline_skipped['tool_pass'] += 1
+            
+            # STAGE 2: RESPONSE GENERATION - REFACTORED
+            response = await self._generate_spoken_response(
+                user_text=original_input,
+                context_parts=context_parts,
+                chat_context=clean_chat,
+                is_chat_engagement=should_promote,
+                on_sentence=on_sentence
+            )
+        
+        self.pipeline_latencies[pipeline].append(time.perf_counter() - stage_start)
+        
         # Add response echo immediately
         if response:
             self.thought_processor.thought_buffer.add_response_echo(
@@ -216,6 +286,50 @@ class ProcessingDelegator:
         
         return response
     
+    # ========================================================================
+    # PIPELINE MODES
+    # ========================================================================
+    
+    def _pipeline_mode(self) -> str:
+        """Current THOUGHT_PIPELINE control (unknown values fall back to gated)"""
+        mode = str(getattr(self.controls, 'THOUGHT_PIPELINE', 'gated')).lower()
+        if mode not in PIPELINE_MODES:
+            self.logger.warning(f"[Pipeline] Unknown THOUGHT_PIPELINE '{mode}', using gated")
+            return "gated"
+        return mode
+    
+    def _has_pending_results(self, first_pass: ThoughtPass) -> bool:
+        """
+        Whether a second thought pass has anything to process: tool results
+        the first pass produced, or events that arrived meanwhile (or were
+        left because the cognitive loop was busy)
+        """
+        if first_pass.actions:
+            return True
+        return bool(self.thought_processor.thought_buffer.get_unprocessed_events())
+    
+    def _accept_combined_reply(self, reply: str) -> Optional[str]:
+        """
+        Apply the spoken stage's rules to a reply from the combined call:
+        only speak when the thoughts carry a spoken trigger
+        """
+        _, has_spoken_trigger = self.response_decider._detect_priority_markers(
+            self.thought_processor.thought_buffer
+        )
+        if not has_spoken_trigger:
+            return None
+        return self._clean_reply(reply)
+    
+    @staticmethod
+    def _clean_reply(response: str) -> Optional[str]:
+        """Strip think blocks and emoji; None if nothing is left"""
+        response = THINK_PATTERN.sub('', response).strip()
+        if not response:
+            return None
+        
+        from BASE.core.clean_response import remove_emoji
+        return remove_emoji(response).strip() or None
+    
     # ========================================================================
     # RESPONSE GENERATION - REFACTORED
     # ========================================================================
@@ -225,7 +339,8 @@ class ProcessingDelegator:
         user_text: str,
         context_parts: List[str],
         chat_context: Optional[str] = None,
-        is_chat_engagement: bool = False
+        is_chat_engagement: bool = False,
+        on_sentence: Optional[Callable[[str], None]] = None
     ) -> Optional[str]:
         """
         Generate spoken response - REFACTORED
@@ -236,6 +351,7 @@ class ProcessingDelegator:
             context_parts: Additional context
             chat_context: Live chat messages
             is_chat_engagement: Whether responding to chat
+            on_sentence: Streams the reply sentence by sentence if given
         
         Returns:
             Spoken response text or None
@@ -275,7 +391,7 @@ class ProcessingDelegator:
             and not c.startswith('## MEMORY')
             and not c.startswith('## YESTERDAY')
         ]
-        response_context.extend(other_context[:3])  # Limit to 3 additional contexts
+        response_context.extend(other_context)  # SpokenConstructor packs these into its token budget
         
         # NEW: Build prompt using SpokenConstructor
         prompt = self.spoken_constructor.build_spoken_prompt(
@@ -287,60 +403,94 @@ class ProcessingDelegator:
             is_chat_engagement=is_chat_engagement
         )
         
-        # Generate response
-        response = self._call_ollama(
-            prompt=prompt,
-            model=self.config.text_model,
-            system_prompt=None
-        )
-        
-        # Clean response
-        import re
-        THINK_PATTERN = re.compile(r"<think>(.*?)</think>", re.DOTALL)
-        response = THINK_PATTERN.sub('', response).strip()
-        
-        # Validate
-        if not response:
-            return None
-        
-        # Post-process (emoji removal)
-        from BASE.core.clean_response import remove_emoji
-        response = remove_emoji(response)
+        # Generate response (the personality prefix stays in Ollama's KV cache)
+        prefix = self.spoken_constructor.packer.last_prefix
+        if on_sentence:
+            response = await self._stream_ollama(
+                prompt=prompt,
+                model=self.config.text_model,
+                on_sentence=on_sentence,
+                prefix=prefix
+            )
+        else:
+            response = await self._call_ollama(
+                prompt=prompt,
+                model=self.config.text_model,
+                system_prompt=None,
+                prefix=prefix
+            )
         
-        return response
+        # Clean response (think blocks, emoji)
+        return self._clean_reply(response)
     
-    def _call_ollama(self, prompt: str, model: str, system_prompt: Optional[str] = None) -> str:
-        """Call Ollama API"""
-        import requests
-        
+    async def _call_ollama(
+        self,
+        prompt: str,
+        model: str,
+        system_prompt: Optional[str] = None,
+        prefix: Optional[StablePrefix] = None
+    ) -> str:
+        """Call Ollama API (awaits the shared client, loop stays free)"""
         try:
-            url = f"{self.config.ollama_endpoint}/api/generate"
             full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
             
             self.logger.prompt(f"[Response Synthesis]\n{full_prompt}")
             
-            payload = {
-                "model": model,
-                "prompt": full_prompt,
-                "stream": False,
-                "temperature": 0.7,
-                "top_p": 0.9,
-                "top_k": 40,
-                "repeat_penalty": 1.1,
-                "keep_alive": "24h"
-            }
-            
-            response = requests.post(url, json=payload, timeout=30)
-            response.raise_for_status()
-            result = response.json()
-            
-            content = result.get("response", "") or result.get("message", {}).get("content", "")
-            return content.strip()
+            return await self.llm_client.complete(
+                prompt, model, system_prompt, options=RESPONSE_OPTIONS, keep_alive="24h", timeout=30,
+                priority=LLMPriority.SPOKEN, prefix=prefix
+            )
             
         except Exception as e:
             self.logger.error(f"Ollama API error: {e}")
             return ""
     
+    async def _stream_ollama(
+        self,
+        prompt: str,
+        model: str,
+        on_sentence: Callable[[str], None],
+        prefix: Optional[StablePrefix] = None
+    ) -> str:
+        """
+        Stream the reply from Ollama, handing each finished sentence to
+        on_sentence (think blocks and emoji removed) as soon as it completes
+        
+        Returns:
+            The raw reply (partial if the stream broke off)
+        """
+        from BASE.core.clean_response import remove_emoji
+        from BASE.tools.internal.voice.voice_utils import SentenceSegmenter
+        
+        self.logger.prompt(f"[Response Synthesis - streamed]\n{prompt}")
+        
+        segmenter = SentenceSegmenter()
+        raw = ""
+        spoken_upto = 0
+        
+        def emit(sentences: List[str]):
+            for sentence in sentences:
+                sentence = remove_emoji(sentence).strip()
+                if sentence:
+                    on_sentence(sentence)
+        
+        try:
+            async for chunk in self.llm_client.stream_complete(
+                prompt, model, options=RESPONSE_OPTIONS, keep_alive="24h", timeout=30,
+                priority=LLMPriority.SPOKEN, prefix=prefix
+            ):
+                raw += chunk
+                speakable = _speakable_prefix(raw)
+                emit(segmenter.feed(speakable[spoken_upto:]))
+                spoken_upto = len(speakable)
+        except Exception as e:
+            self.logger.error(f"Ollama streaming error: {e}")
+        
+        # Stream over: whatever is left (minus an unclosed think block) is final
+        speakable = THINK_PATTERN.sub('', raw).split("<think>")[0]
+        emit(segmenter.feed(speakable[spoken_upto:]) + segmenter.flush())
+        return raw
+    
     # ========================================================================
     # MEMORY CONTEXT BUILDING - Enhanced with thought chain
     # ========================================================================
@@ -385,56 +535,48 @@ class ProcessingDelegator:
                 context_sections.append("## YESTERDAY'S CONVERSATION")
                 context_sections.append(yesterday_ctx)
         
-        # Medium memory (earlier today)
-        if memory_needs['needs_medium']:
-            medium_results = self.memory_search.search_medium_memory_combined(
-                user_input=user_input,
-                recent_thoughts=recent_thoughts,
-                k=3,
-                use_embedding_combination=True
+        # One embedding and one pass over every tier this turn needs
+        tiers = tuple(
+            tier for tier in ("medium", "long", "base")
+            if memory_needs[f'needs_{tier}']
+        )
+        retrieval = None
+        if tiers:
+            retrieval = self.memory_search.retrieve(
+                QuerySpec(user_input=user_input, recent_thoughts=list(recent_thoughts or [])),
+                tiers=tiers,
+                k_per_tier={'medium': 3, 'long': 2, 'base': 3},
+                min_similarity={'base': 0.4}
             )
-            if medium_results:
-                context_sections.append("\n## EARLIER TODAY")
-                for r in medium_results:
-                    role = username if r['role'] == 'user' else agentname
-                    context_sections.append(
-                        f"[{r['timestamp']}] {role}: {r['content']} "
-                        f"(relevance: {r['similarity']:.2f})"
-                    )
+        
+        # Medium memory (earlier today)
+        if retrieval and retrieval.medium:
+            context_sections.append("\n## EARLIER TODAY")
+            for r in retrieval.medium:
+                role = username if r['role'] == 'user' else agentname
+                context_sections.append(
+                    f"[{r['timestamp']}] {role}: {r['content']} "
+                    f"(relevance: {r['similarity']:.2f})"
+                )
         
         # Long memory (past days)
-        if memory_needs['needs_long']:
-            long_results = self.memory_search.search_long_memory_combined(
-                user_input=user_input,
-                recent_thoughts=recent_thoughts,
-                k=2,
-                use_embedding_combination=True
-            )
-            if long_results:
-                context_sections.append("\n## PAST CONVERSATIONS")
-                for r in long_results:
-                    context_sections.append(
-                        f"[{r['date']}] {r['summary']} "
-                        f"(relevance: {r['similarity']:.2f})"
-                    )
+        if retrieval and retrieval.long:
+            context_sections.append("\n## PAST CONVERSATIONS")
+            for r in retrieval.long:
+                context_sections.append(
+                    f"[{r['date']}] {r['summary']} "
+                    f"(relevance: {r['similarity']:.2f})"
+                )
         
         # Base knowledge
-        if memory_needs['needs_base']:
-            base_results = self.memory_search.search_base_knowledge_combined(
-                user_input=user_input,
-                recent_thoughts=recent_thoughts,
-                k=3,
-                min_similarity=0.4,
-                use_embedding_combination=True
-            )
-            if base_results:
-                context_sections.append("\n## KNOWLEDGE BASE")
-                for r in base_results:
-                    source = r.get('metadata', {}).get('source_file', 'unknown')
-                    context_sections.append(
-                        f"[{source}] {r['text']} "
-                        f"(relevance: {r['similarity']:.2f})"
-                    )
+        if retrieval and retrieval.base:
+            context_sections.append("\n## KNOWLEDGE BASE")
+            for r in retrieval.base:
+                source = r.get('metadata', {}).get('source_file', 'unknown')
+                context_sections.append(
+                    f"[{source}] {r['text']} "
+                    f"(relevance: {r['similarity']:.2f})"
+                )
         
         return "\n".join(context_sections) if context_sections else ""
     
@@ -548,8 +690,31 @@ class ProcessingDelegator:
         if self.memory_manager:
             memory_stats = self.memory_manager.get_stats()
         
+        retrieval_stats = {}
+        if self.memory_search:
+            retrieval_stats = self.memory_search.get_cache_stats()
+        
         return {
             'thought_processor': thought_stats,
             'memory': memory_stats,
+            'retrieval': retrieval_stats,
+            'llm': self.llm_client.get_stats(),
+            'pipeline': self.get_pipeline_stats(),
             'prompt_system': 'modular_spoken'  # Flag
+        }
+    
+    def get_pipeline_stats(self) -> dict:
+        """Turn latency per pipeline mode and how many passes were skipped"""
+        latencies = {}
+        for mode, samples in self.pipeline_latencies.items():
+            samples = list(samples)
+            latencies[mode] = {
+                'turns': len(samples),
+                'avg': sum(samples) / len(samples) if samples else 0.0,
+                'max': max(samples) if samples else 0.0
+            }
+        return {
+            'mode': self._pipeline_mode(),
+            'latency': latencies,
+            'skipped': dict(self.pipeline_skipped)
         }
\ No newline at end of file
@@ -0,0 +1,174 @@
+# Filename: BASE/core/prompt_cache.py
+"""
+Prompt Prefix Sessions (KV-cache reuse)
+=======================================
+Ollama keeps the KV cache of each request in a slot and, on the next
+request, reuses it for the longest run of leading tokens that is unchanged;
+only the rest of the prompt is evaluated again. That only pays off if the
+big unchanging parts of a prompt come first and are byte-identical every
+time, which the constructors now guarantee (StablePrefix in context_packer:
+personality, mode instructions, tool list).
+
+PromptPrefixCache tracks two things:
+
+- per model, the prefix last sent to it. The KV cache belongs to the model's
+  slot, not to a prompt type: reactive, proactive, reflective and planning
+  prompts all run on the thought model and overwrite each other's cache.
+  So reuse is estimated against whatever went to that model last, counting
+  only the leading sections both prefixes share
+- per (prompt type, model), the fingerprints of that type's prefix, to
+  detect invalidation: when personality, mode or tool set change it is
+  logged with the parts that changed
+
+num_keep is pinned to the prefix length, so when a long prompt overflows
+the context window Ollama shifts out later tokens, never the prefix.
+
+The reuse figures assume one slot per model (the shipped model_concurrency
+of 1) and the order requests were built in; with more parallel slots Ollama
+picks the best-matching slot and may reuse more than is counted.
+
+Ollama's `context` field is not used for this: it is deprecated, and with
+templated prompts it cannot hold "just the prefix".
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, Tuple, List
+
+from BASE.core.context_packer import StablePrefix
+from BASE.core.logger import Logger
+
+
+@dataclass
+class PrefixSession:
+    """Prefix last built for one prompt type on one model"""
+    parts: Dict[str, str]
+    tokens: int
+    prefix_unchanged: int = 0     # Built with the same prefix as its previous request
+    invalidations: int = 0
+    last_changed: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ModelSlot:
+    """Prefix last sent to one model, and how much of each prefix was reused"""
+    parts: List[Tuple[str, str]] = field(default_factory=list)
+    ends: List[int] = field(default_factory=list)
+    full_reuse: int = 0           # Whole prefix matched the previous request
+    partial_reuse: int = 0        # Only some leading sections matched
+    misses: int = 0               # Nothing matched (cold, or another prompt's personality)
+    reused_tokens: int = 0
+    evaluated_tokens: int = 0     # Prefix tokens Ollama had to evaluate again
+
+
+class PromptPrefixCache:
+    """Tracks stable prompt prefixes per model and prompt type, and pins them in the KV cache"""
+
+    def __init__(self, logger: Optional[Logger] = None):
+        self.logger = logger or Logger(name="PromptCache")
+        self._lock = threading.Lock()
+        self._sessions: Dict[Tuple[str, str], PrefixSession] = {}
+        self._slots: Dict[str, ModelSlot] = {}
+        self.unprefixed = 0   # Requests sent without a usable prefix
+
+    def apply(self, model: str, payload: Dict[str, Any], prefix: Optional[StablePrefix]):
+        """
+        Record a /api/generate payload against its model and session, and pin num_keep
+
+        Args:
+            model: Model the request goes to
+            payload: Request payload (options updated in place)
+            prefix: Stable prefix the constructor reported, if any
+        """
+        prompt = payload.get("prompt")
+        if prefix is None or not prompt or not prompt.startswith(prefix.text):
+            with self._lock:
+                self.unprefixed += 1
+                # The slot now holds some other prompt
+                self._slots.setdefault(model, ModelSlot()).parts = []
+            return
+
+        key = (prefix.session, model)
+        changed: List[str] = []
+        with self._lock:
+            self._record_reuse(model, prefix)
+
+            session = self._sessions.get(key)
+            if session is None:
+                self._sessions[key] = PrefixSession(dict(prefix.parts), prefix.tokens)
+            elif session.parts == prefix.parts:
+                session.prefix_unchanged += 1
+            else:
+                names = set(session.parts) | set(prefix.parts)
+                changed = sorted(n for n in names if session.parts.get(n) != prefix.parts.get(n))
+                session.parts = dict(prefix.parts)
+                session.tokens = prefix.tokens
+                session.invalidations += 1
+                session.last_changed = changed
+
+        if changed:
+            self.logger.system(
+                f"[Prompt Cache] {prefix.session} prefix on {model} invalidated "
+                f"({', '.join(changed)} changed)"
+            )
+
+        options = dict(payload.get("options") or {})
+        options.setdefault("num_keep", prefix.tokens)
+        payload["options"] = options
+
+    def _record_reuse(self, model: str, prefix: StablePrefix):
+        """Compare with the prefix last sent to the model (caller holds the lock)"""
+        slot = self._slots.setdefault(model, ModelSlot())
+        parts = list(prefix.parts.items())
+
+        shared = 0
+        for previous, current in zip(slot.parts, parts):
+            if previous != current:
+                break
+            shared += 1
+
+        reused = prefix.ends[shared - 1] if shared and prefix.ends else 0
+        if shared == len(parts):
+            slot.full_reuse += 1
+        elif shared:
+            slot.partial_reuse += 1
+        else:
+            slot.misses += 1
+        slot.reused_tokens += reused
+        slot.evaluated_tokens += prefix.tokens - reused
+
+        slot.parts = parts
+        slot.ends = list(prefix.ends)
+
+    def invalidate(self, session: Optional[str] = None):
+        """Forget recorded prefixes (all, or one prompt type's)"""
+        with self._lock:
+            for key in [k for k in self._sessions if session is None or k[0] == session]:
+                del self._sessions[key]
+            if session is None:
+                self._slots.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'unprefixed': self.unprefixed,
+                'models': {
+                    model: {
+                        'full_reuse': s.full_reuse,
+                        'partial_reuse': s.partial_reuse,
+                        'misses': s.misses,
+                        'reused_tokens': s.reused_tokens,
+                        'evaluated_tokens': s.evaluated_tokens
+                    }
+                    for model, s in self._slots.items()
+                },
+                'sessions': {
+                    f"{name}@{model}": {
+                        'prefix_tokens': s.tokens,
+                        'prefix_unchanged': s.prefix_unchanged,
+                        'invalidations': s.invalidations,
+                        'last_changed': list(s.last_changed)
+                    }
+                    for (name, model), s in self._sessions.items()
+                }
+            }
@@ -8,17 +8,21 @@ FIX: Now properly retrieves and includes tool instructions from persistence mana
 
 Prompt Components:
 1. Personality (core identity + reflective style)
-2. Thought chain (recent thoughts for continuity)
-3. Memory context (retrieved memories to reflect on)
-4. Tool list OR retrieved tool instructions (based on persistence)
+2. Tool list OR retrieved tool instructions (based on persistence)
+3. Thought chain (recent thoughts for continuity)
+4. Memory context (retrieved memories to reflect on)
 5. Response guidance (how to reflect)
 
+The unchanging parts (identity, mode text, tools) lead; the prefix shifts
+once when startup mode ends and the standard mode text takes over.
+
 Focus: Looking backward, connecting past to present
 """
 
 from typing import List, Optional
 from datetime import datetime, timedelta
 from BASE.core.reflective.reflective_parts import ReflectivePromptParts
+from BASE.core.context_packer import ContextPacker, ContextSection
 from personality.prompts.personality_prompt_parts import PersonalityPromptParts
 
 
@@ -27,7 +31,7 @@ class ReflectiveConstructor:
     
     STARTUP_THOUGHT_THRESHOLD = 3  # First 3 thoughts use startup context
     
-    def __init__(self, memory_search=None, tool_manager=None, logger=None):
+    def __init__(self, memory_search=None, tool_manager=None, logger=None, token_budget: Optional[int] = None):
         """
         Initialize reflective constructor
         
@@ -35,10 +39,12 @@ class ReflectiveConstructor:
             memory_search: MemorySearch instance for memory retrieval
             tool_manager: ToolManager instance for tool instructions
             logger: Optional logger instance
+            token_budget: Prompt token budget (default: DEFAULT_TOKEN_BUDGETS['reflective'])
         """
         self.memory_search = memory_search
         self.tool_manager = tool_manager
         self.logger = logger
+        self.packer = ContextPacker('reflective', token_budget, logger)
         
         # Initialize prompt parts
         self.parts = ReflectivePromptParts()
@@ -78,34 +84,47 @@ class ReflectiveConstructor:
         sections = []
         
         # 1. Personality injection
-        sections.append(self.personality.get_personality_injection('thought'))
-        
-        # 2. Recent thoughts (if any)
-        if thought_chain:
-            sections.append(self._format_thought_chain(thought_chain))
+        sections.append(ContextSection(
+            "personality", self.personality.get_personality_injection('thought'),
+            required=True, stable=True
+        ))
         
-        # 3. Mode instructions
+        # 2. Mode instructions
         if is_actually_startup:
-            sections.append(self.parts.get_startup_instructions())
+            mode_instructions = self.parts.get_startup_instructions()
         else:
-            sections.append(self.parts.get_mode_instructions())
+            mode_instructions = self.parts.get_mode_instructions()
+        sections.append(ContextSection("mode", mode_instructions, required=True, stable=True))
         
-        # 4. Tool instructions (FIXED: Check persistence and include detailed instructions)
+        # 3. Tool instructions (FIXED: Check persistence and include detailed instructions)
         if self.tool_manager:
             tool_section = self._get_tool_instructions_section()
             if tool_section:
-                sections.append(tool_section)
+                sections.append(ContextSection(
+                    "tools", tool_section, priority=6, truncatable=False, stable=True
+                ))
         
-        # 5. Context (startup or standard)
+        # 4. Recent thoughts (if any) - after the stable prefix
+        if thought_chain:
+            sections.append(ContextSection(
+                "thoughts", self._format_thought_chain(thought_chain), required=True
+            ))
+        
+        # 5. Context (startup or standard) - most important parts come first,
+        # so truncation keeps identity / situation over older history
         if is_actually_startup:
-            sections.append(self._build_startup_context())
+            sections.append(ContextSection("startup_context", self._build_startup_context(), priority=7))
         else:
-            sections.append(self._build_standard_context(ongoing_context, query))
+            sections.append(ContextSection(
+                "memory_context", self._build_standard_context(ongoing_context, query), priority=7
+            ))
         
         # 6. Output format
-        sections.append(self.parts.get_output_format(is_startup=is_actually_startup))
+        sections.append(ContextSection(
+            "output_format", self.parts.get_output_format(is_startup=is_actually_startup), required=True
+        ))
         
-        prompt = "\n".join(sections)
+        prompt = self.packer.pack(sections).text
         
         if self.logger:
             mode = "Startup" if is_actually_startup else "Standard"
@@ -279,22 +298,10 @@ class ReflectiveConstructor:
         lines = ["You are an AI with a distinct personality. Here are examples of your behavior:", ""]
         
         for i, ex in enumerate(examples, 1):
-            text = ex['text']
-            situation = ""
-            cognition = ""
-            
-            for line in text.split('\n'):
-                if 'SITUATION:' in line:
-                    situation = line.split('SITUATION:', 1)[1].strip()
-                elif 'INTERNAL COGNITION:' in line or 'THOUGHT:' in line:
-                    delimiter = 'INTERNAL COGNITION:' if 'INTERNAL COGNITION:' in line else 'THOUGHT:'
-                    cognition = line.split(delimiter, 1)[1].strip()
-            
-            if situation and cognition:
-                lines.append(f"Example {i}:")
-                lines.append(f"  Situation: {situation}")
-                lines.append(f"  Your thought: {cognition}")
-                lines.append("")
+            lines.append(f"Example {i}:")
+            lines.append(f"  Situation: {ex['situation']}")
+            lines.append(f"  Your thought: {ex['reply']}")
+            lines.append("")
         
         return "\n".join(lines)
     
@@ -304,7 +311,7 @@ class ReflectiveConstructor:
             return ""
         
         memory_manager = self.memory_search.memory_manager
-        recent_summaries = memory_manager.long_memory[-max_summaries:]
+        recent_summaries = memory_manager.get_recent_daily_summaries(max_summaries)
         
         if not recent_summaries:
             return ""
@@ -357,8 +364,10 @@ class ReflectiveConstructor:
         
         sections = []
         
-        # Long-term memory
-        long_results = self.memory_search.search_long_memory(query, k=2)
+        # Long-term memory (repeat queries reuse the cached retrieval)
+        long_results = self.memory_search.retrieve(
+            query, tiers=("long",), k_per_tier={'long': 2}
+        ).long
         if long_results:
             sections.append("### Past Conversations")
             for r in long_results:
@@ -8,16 +8,21 @@ FIX: Now properly retrieves and includes tool instructions from persistence mana
 
 Prompt Components:
 1. Personality (core identity + thinking style)
-2. Thought chain (recent thoughts for continuity)
+2. Mode instructions
 3. Tool list OR retrieved tool instructions (based on persistence)
-4. Incoming data (events to process)
-5. Response guidance (how to think about events)
+4. Thought chain (recent thoughts for continuity)
+5. Incoming data (events to process)
+6. Response guidance (how to think about events)
+
+Sections 1-3 rarely change and come first, so consecutive prompts share a
+cacheable prefix (see StablePrefix in context_packer).
 
 Focus: Real-time processing of new information
 """
 
 from typing import List, Optional, Any
 from BASE.core.responsive.responsive_parts import ResponsivePromptParts
+from BASE.core.context_packer import ContextPacker, ContextSection
 from personality.prompts.personality_prompt_parts import PersonalityPromptParts
 from personality.bot_info import username
 
@@ -25,16 +30,18 @@ from personality.bot_info import username
 class ResponsiveConstructor:
     """Constructs prompts for responsive thinking"""
     
-    def __init__(self, tool_manager=None, logger=None):
+    def __init__(self, tool_manager=None, logger=None, token_budget: Optional[int] = None):
         """
         Initialize responsive constructor
         
         Args:
             tool_manager: ToolManager instance for tool instructions
             logger: Optional logger instance
+            token_budget: Prompt token budget (default: DEFAULT_TOKEN_BUDGETS['responsive'])
         """
         self.tool_manager = tool_manager
         self.logger = logger
+        self.packer = ContextPacker('responsive', token_budget, logger)
         
         # Initialize prompt parts
         self.parts = ResponsivePromptParts()
@@ -47,7 +54,8 @@ class ResponsiveConstructor:
         context_parts: List[str] = None,
         last_user_msg: Optional[str] = None,
         pending_actions: Optional[str] = None,
-        has_vision: bool = False
+        has_vision: bool = False,
+        with_reply: bool = False
     ) -> str:
         """
         Build complete responsive thinking prompt
@@ -59,6 +67,7 @@ class ResponsiveConstructor:
             last_user_msg: Last user message
             pending_actions: Summary of pending tool actions
             has_vision: Whether vision data is present
+            with_reply: Also ask for the spoken reply (<response>) in this call
         
         Returns:
             Complete responsive thinking prompt
@@ -68,43 +77,65 @@ class ResponsiveConstructor:
         sections = []
         
         # 1. Personality injection (core identity)
-        sections.append(self.personality.get_personality_injection('thought'))
-        
-        # 2. Recent thoughts (for continuity)
-        sections.append(self._format_thought_chain(thought_chain))
+        sections.append(ContextSection(
+            "personality", self.personality.get_personality_injection('thought'),
+            required=True, stable=True
+        ))
         
-        # 3. Mode instructions
-        sections.append(self.parts.get_mode_instructions())
+        # 2. Mode instructions
+        sections.append(ContextSection(
+            "mode", self.parts.get_mode_instructions(), required=True, stable=True
+        ))
         
-        # 4. Tool instructions (FIXED: Check persistence and include detailed instructions)
+        # 3. Tool instructions (FIXED: Check persistence and include detailed instructions)
         if self.tool_manager:
             tool_section = self._get_tool_instructions_section()
             if tool_section:
-                sections.append(tool_section)
+                # Half an instruction is worse than none: keep whole or drop
+                sections.append(ContextSection(
+                    "tools", tool_section, priority=7, truncatable=False, stable=True
+                ))
+        
+        # 4. Recent thoughts (for continuity) - changes every cycle, so after
+        # the stable prefix
+        sections.append(ContextSection(
+            "thoughts", self._format_thought_chain(thought_chain), required=True
+        ))
         
         # 5. Incoming data (events to process)
-        sections.append(self._format_incoming_data(raw_events))
+        sections.append(ContextSection(
+            "incoming", self._format_incoming_data(raw_events), required=True
+        ))
         
-        # 6. Additional context
+        # 6. Additional context - packed by priority into the budget
         if last_user_msg:
-            sections.append(f"\n## LAST USER MESSAGE\n\n**{username}:** \"{last_user_msg}\"")
+            sections.append(ContextSection(
+                "last_user_msg",
+                f"\n## LAST USER MESSAGE\n\n**{username}:** \"{last_user_msg}\"",
+                required=True
+            ))
         
         if pending_actions and pending_actions.strip():
-            sections.append(f"\n## PENDING ACTIONS\n\n{pending_actions}")
+            sections.append(ContextSection(
+                "pending_actions", f"\n## PENDING ACTIONS\n\n{pending_actions}", priority=6
+            ))
         
         if context_parts:
-            sections.append(self._format_additional_context(context_parts))
+            sections.extend(self.packer.context_sections(
+                context_parts, header="\n## ADDITIONAL CONTEXT\n"
+            ))
         
         # 7. Grounding rules (especially important for vision)
         if has_vision:
-            sections.append(self.parts.get_vision_grounding())
+            sections.append(ContextSection("vision_grounding", self.parts.get_vision_grounding(), required=True))
         
-        sections.append(self.parts.get_grounding_rules())
+        sections.append(ContextSection("grounding", self.parts.get_grounding_rules(), required=True))
         
         # 8. Output format
-        sections.append(self.parts.get_output_format())
+        output_format = self.parts.get_reply_output_format() if with_reply else self.parts.get_output_format()
+        sections.append(ContextSection("output_format", output_format, required=True))
         
-        prompt = "\n".join(sections)
+        prompt = self.packer.pack(sections).text
         
         if self.logger:
             self.logger.prompt(f"[Responsive Thinking Prompt]\n{prompt}")
@@ -192,8 +223,3 @@ class ResponsiveConstructor:
             lines.append(f"**[Event {i}]** `{source}`: {data}")
         
         return "\n".join(lines)
-    
-    def _format_additional_context(self, context_parts: List[str]) -> str:
-        """Format additional context"""
-        formatted = "\n\n".join(context_parts)
-        return f"\n## ADDITIONAL CONTEXT\n\n{formatted}"
\ No newline at end of file
@@ -5,6 +5,8 @@ Responsive Thinking Prompt Parts
 Contains reusable prompt components for responsive thinking
 """
 
+from personality.bot_info import username
+
 
 class ResponsivePromptParts:
     """Reusable prompt parts for responsive thinking"""
@@ -89,6 +91,33 @@ If vision says "person standing", don't invent what they're wearing, doing, or t
 - Actions format: `[{"tool": "tool_name", "args": ["param"]}]`
 - Strategic plan is optional - only if you're planning ahead"""
     
+    @staticmethod
+    def get_reply_output_format() -> str:
+        """Output format when the same call also writes the spoken reply"""
+        return f"""
+## EXPECTED OUTPUT FORMAT
+
+```xml
+<thoughts>
+[1] Your thought about event 1
+[2] Your thought about event 2
+</thoughts>
+
+<think>Optional strategic planning thought</think>
+
+<action_list>[]</action_list>
+
+<response>What you say aloud to {username}</response>
+```
+
+**RULES:**
+- Generate one numbered thought per event
+- Each thought should be 1-2 sentences
+- Use `<action_list>[]</action_list>` if no actions needed
+- Actions format: `[{{"tool": "tool_name", "args": ["param"]}}]`
+- `<response>`: your spoken reply, 1-2 natural sentences in your own voice, no labels or meta-text
+- Use `<response>NONE</response>` if you listed actions (their results are not in yet) or have nothing to say"""
+    
     @staticmethod
     def get_tool_state_grounding() -> str:
         """Tool status grounding rules"""
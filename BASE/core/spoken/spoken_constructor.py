@@ -15,6 +15,7 @@ Focus: Natural spoken communication based on accumulated thoughts
 
 from typing import List, Optional
 from BASE.core.spoken.spoken_parts import SpokenPromptParts
+from BASE.core.context_packer import ContextPacker, ContextSection
 from personality.prompts.personality_prompt_parts import PersonalityPromptParts
 from personality.bot_info import username
 
@@ -22,16 +23,18 @@ from personality.bot_info import username
 class SpokenConstructor:
     """Constructs prompts for spoken response generation"""
     
-    def __init__(self, memory_search=None, logger=None):
+    def __init__(self, memory_search=None, logger=None, token_budget: Optional[int] = None):
         """
         Initialize spoken constructor
         
         Args:
             memory_search: MemorySearch instance for personality examples
             logger: Optional logger instance
+            token_budget: Prompt token budget (default: DEFAULT_TOKEN_BUDGETS['spoken'])
         """
         self.memory_search = memory_search
         self.logger = logger
+        self.packer = ContextPacker('spoken', token_budget, logger)
         
         # Initialize prompt parts
         self.parts = SpokenPromptParts()
@@ -64,8 +67,11 @@ class SpokenConstructor:
         
         sections = []
         
-        # 1. Personality injection (core identity)
-        sections.append(self.personality.get_personality_injection('response'))
+        # 1. Personality injection (core identity) - the stable prefix
+        sections.append(ContextSection(
+            "personality", self.personality.get_personality_injection('response'),
+            required=True, stable=True
+        ))
         
         # 2. Response examples (personality-matched) - MOVED BEFORE THOUGHTS
         # FIXED: Now retrieves based on combined thought chain + user input
@@ -76,28 +82,32 @@ class SpokenConstructor:
                 chat_context=chat_context
             )
             if examples:
-                sections.append(examples)
+                sections.append(ContextSection("examples", examples, priority=4))
         
         # 3. Recent thoughts (what agent has been thinking)
-        sections.append(self._format_thought_chain(thought_chain))
+        sections.append(ContextSection(
+            "thoughts", self._format_thought_chain(thought_chain), required=True
+        ))
         
-        # 4. Context (memory, chat, etc.)
+        # 4. Context (memory, chat, etc.) - packed by priority into the budget
         if context_parts:
-            sections.append(self._format_context(context_parts))
+            sections.extend(self.packer.context_sections(context_parts, header="\n## CONTEXT\n"))
         
         # 5. User message
         if user_text and not is_chat_engagement:
-            sections.append(f'\n**{username}:** "{user_text}"')
+            sections.append(ContextSection("user", f'\n**{username}:** "{user_text}"', required=True))
         elif is_chat_engagement and chat_context:
-            sections.append(f'\n## CHAT TO ADDRESS\n\n{chat_context}')
+            sections.append(ContextSection("chat", f'\n## CHAT TO ADDRESS\n\n{chat_context}', required=True))
         
         # 6. Response guidance (urgency-based)
-        sections.append(self._get_response_guidance(priority_level, is_chat_engagement))
+        sections.append(ContextSection(
+            "guidance", self._get_response_guidance(priority_level, is_chat_engagement), required=True
+        ))
         
         # 7. Output format
-        sections.append(self.parts.get_output_format())
+        sections.append(ContextSection("output_format", self.parts.get_output_format(), required=True))
         
-        prompt = "\n".join(sections)
+        prompt = self.packer.pack(sections).text
         
         if self.logger:
             self.logger.prompt(f"[Spoken Response Prompt]\n{prompt}")
@@ -164,10 +174,15 @@ class SpokenConstructor:
         if user_text:
             combined_query += f" {user_text}"  # Emphasize user input
         
+        # Reuse this turn's memory retrieval embedding (user input + thoughts)
+        # instead of embedding the query again
+        turn = self.memory_search.get_turn_retrieval(user_text)
+        
         # Search for relevant examples using the stage-specific method
         examples = self.memory_search.get_response_generation_examples(
             context=combined_query,
-            k=3  # Get top 3 most relevant examples
+            k=3,  # Get top 3 most relevant examples
+            query_embedding=turn.query_embedding if turn else None
         )
         
         if not examples:
@@ -184,14 +199,6 @@ class SpokenConstructor:
         
         return f"\n## PERSONALITY EXAMPLES\n\n{examples}"
     
-    def _format_context(self, context_parts: List[str]) -> str:
-        """Format additional context"""
-        # Take first 3 context parts
-        relevant_context = context_parts[:3]
-        formatted = "\n\n".join(relevant_context)
-        
-        return f"\n## CONTEXT\n\n{formatted}"
-    
     def _get_response_guidance(
         self,
         priority_level: int,
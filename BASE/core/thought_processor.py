@@ -14,6 +14,9 @@ from dataclasses import dataclass, asdict
 import re
 
 from BASE.core.thought_buffer import ThoughtBuffer
+from BASE.core.llm_client import get_ollama_client
+from BASE.core.llm_scheduler import LLMPriority, LLMPreempted
+from BASE.core.context_packer import StablePrefix
 from BASE.core.logger import Logger
 from BASE.core.thinking_modes import ThinkingModes
 
@@ -46,6 +49,15 @@ class ThoughtState:
         return cls(**data)
 
 
+@dataclass
+class ThoughtPass:
+    """What one thought pass did"""
+    processed: bool = False
+    reactive: bool = False
+    actions: int = 0              # Tool actions executed (results are now in the buffer)
+    reply: Optional[str] = None   # Spoken reply, when the pass was asked for one
+
+
 class ThoughtProcessor:
     """
     Core thought processor with modular prompt construction
@@ -53,7 +65,7 @@ class ThoughtProcessor:
     """
     __slots__ = (
         'config', 'controls', 'project_root', 'memory_search',
-        'session_file_manager', 'logger', 'thought_buffer',
+        'session_file_manager', 'logger', 'thought_buffer', 'llm_client',
         '_is_processing', '_last_memory_integration',
         'cognitive_loop', 'event_loop', '_ai_core_ref',
         'thinking_modes', 'action_state_manager', 'tool_manager',
@@ -81,6 +93,9 @@ class ThoughtProcessor:
         # Initialize thought buffer
         self.thought_buffer = ThoughtBuffer(max_thoughts=25)
         
+        # Shared pooled Ollama client (awaited, so LLM waits don't block the loop)
+        self.llm_client = get_ollama_client(config.ollama_endpoint, config.ollama_pool_size)
+        
         # NEW: Initialize modular prompt system
         from personality.bot_info import agentname
         
@@ -90,20 +105,25 @@ class ThoughtProcessor:
             logger=self.logger
         )
         
+        budgets = config.prompt_token_budgets
+        
         self.responsive_constructor = ResponsiveConstructor(
             tool_manager=None,  # Injected later
-            logger=self.logger
+            logger=self.logger,
+            token_budget=budgets.get('responsive')
         )
         
         self.reflective_constructor = ReflectiveConstructor(
             memory_search=memory_search,
             tool_manager=None,  # Injected later
-            logger=self.logger
+            logger=self.logger,
+            token_budget=budgets.get('reflective')
         )
         
         self.planning_constructor = PlanningConstructor(
             tool_manager=None,  # Injected later
-            logger=self.logger
+            logger=self.logger,
+            token_budget=budgets.get('planning')
         )
         
         # State tracking
@@ -160,46 +180,41 @@ class ThoughtProcessor:
             f"{enabled_count} tools available to all constructors"
         )
     
-    def _call_ollama(self, prompt: str, model: str, system_prompt: Optional[str] = None, 
-                    image_data: str = "") -> str:
-        """Call Ollama API with keep-alive"""
-        import requests
+    async def _call_ollama(self, prompt: str, model: str, system_prompt: Optional[str] = None, 
+                    image_data: str = "", priority: LLMPriority = LLMPriority.REACTIVE,
+                    prefix: Optional[StablePrefix] = None) -> str:
+        """
+        Call Ollama API with keep-alive (awaits the shared client, loop stays free)
         
-        try:
-            if image_data:
-                url = f"{self.config.ollama_endpoint}/api/chat"
-                messages = []
-                if system_prompt:
-                    messages.append({"role": "system", "content": system_prompt})
-                messages.append({"role": "user", "content": prompt, "images": [image_data]})
-                payload = {"model": model, "messages": messages, "stream": False, "keep_alive": "24h"}
-            else:
-                url = f"{self.config.ollama_endpoint}/api/generate"
-                full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
-                
-                self.logger.prompt(f"{full_prompt}")
-                
-                payload = {
-                    "model": model, "prompt": full_prompt, "stream": False,
-                    "temperature": self.config.ollama_temperature,
-                    "top_p": self.config.ollama_top_p,
-                    "top_k": self.config.ollama_top_k,
-                    "repeat_penalty": self.config.ollama_repeat_penalty,
-                    "num_predict": self.config.ollama_max_tokens,
-                    "keep_alive": "24h"
-                }
-                
-                if self.config.ollama_seed is not None:
-                    payload["seed"] = self.config.ollama_seed
-            
-            response = requests.post(url, json=payload, timeout=self.config.ollama_timeout)
-            response.raise_for_status()
-            result = response.json()
-            content = result.get("response", "") or result.get("message", {}).get("content", "")
+        priority is the scheduler class; preempted proactive calls return ""
+        prefix is the constructor's stable prompt prefix (KV-cache reuse)
+        """
+        options = None
+        if not image_data:
+            full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+            self.logger.prompt(f"{full_prompt}")
             
+            options = {
+                "temperature": self.config.ollama_temperature,
+                "top_p": self.config.ollama_top_p,
+                "top_k": self.config.ollama_top_k,
+                "repeat_penalty": self.config.ollama_repeat_penalty,
+                "num_predict": self.config.ollama_max_tokens
+            }
+            if self.config.ollama_seed is not None:
+                options["seed"] = self.config.ollama_seed
+        
+        try:
+            content = await self.llm_client.complete(
+                prompt, model, system_prompt, image_data,
+                options=options, keep_alive="24h", timeout=self.config.ollama_timeout,
+                priority=priority, prefix=prefix
+            )
             self.logger.thinking(f"{content}")
-            
-            return content.strip()
+            return content
+        except LLMPreempted as e:
+            self.logger.system(f"[Scheduler] {e} - yielding to user-facing work")
+            return ""
         except Exception as e:
             self.logger.error(f"Ollama API error: {e}")
             return ""
@@ -209,7 +224,8 @@ class ThoughtProcessor:
         result = {
             'thoughts': [],
             'strategic_plan': '',
-            'actions': []
+            'actions': [],
+            'response': ''
         }
         
         # Extract thoughts
@@ -240,6 +256,13 @@ class ThoughtProcessor:
                 except json.JSONDecodeError as e:
                     self.logger.error(f"[Parse] JSON decode error: {e}")
         
+        # Extract spoken reply (single-call pipeline only)
+        response_match = re.search(r'<response>(.*?)</response>', response, re.DOTALL | re.IGNORECASE)
+        if response_match:
+            reply = response_match.group(1).strip()
+            if reply.upper() != 'NONE':
+                result['response'] = reply
+        
         return result
     
     # ========================================================================
@@ -312,8 +335,20 @@ class ThoughtProcessor:
         Main cognitive processing loop - REFACTORED
         NOW PASSES TIMESTAMP TO THOUGHT BUFFER
         """
+        return (await self.run_thought_pass(context_parts)).processed
+    
+    async def run_thought_pass(self, context_parts: List[str] = None, with_reply: bool = False) -> ThoughtPass:
+        """
+        One reactive or proactive pass, reporting what it did
+        
+        Args:
+            context_parts: Context for the prompt (built if empty)
+            with_reply: On a reactive pass, have the same LLM call write the
+                spoken reply (ThoughtPass.reply; "" if it declined)
+        """
+        thought_pass = ThoughtPass()
         if self._is_processing:
-            return False
+            return thought_pass
         
         self._is_processing = True
         
@@ -343,9 +378,11 @@ class ThoughtProcessor:
                 # REACTIVE PROCESSING
                 self.thought_buffer.reset_consecutive_counter()
                 
-                thoughts, actions = await self._reactive_processing(
-                    raw_events, context_parts
+                thoughts, actions, reply = await self._reactive_processing(
+                    raw_events, context_parts, with_reply
                 )
+                thought_pass.reactive = True
+                thought_pass.reply = reply
                 
                 if thoughts:
                     for thought_data in thoughts:
@@ -363,6 +400,7 @@ class ThoughtProcessor:
                     await self.tool_manager.execute_structured_actions(
                         actions, self.thought_buffer
                     )
+                    thought_pass.actions = len(actions)
                 
                 self.thought_buffer.mark_events_processed(len(raw_events))
                 processing_occurred = True
@@ -397,6 +435,7 @@ class ThoughtProcessor:
                         await self.tool_manager.execute_structured_actions(
                             proactive_actions, self.thought_buffer
                         )
+                        thought_pass.actions = len(proactive_actions)
             
             # Background maintenance
             await self._check_urgent_reminders()
@@ -405,7 +444,8 @@ class ThoughtProcessor:
                 await self.thinking_modes.periodic_memory_integration()
                 self._last_memory_integration = time.time()
             
-            return processing_occurred
+            thought_pass.processed = processing_occurred
+            return thought_pass
         
         finally:
             self._is_processing = False
@@ -414,10 +454,13 @@ class ThoughtProcessor:
     # REACTIVE PROCESSING - REFACTORED
     # ========================================================================
     
-    async def _reactive_processing(self, raw_events, context_parts):
+    async def _reactive_processing(self, raw_events, context_parts, with_reply: bool = False):
         """
         Process events reactively - REFACTORED
         NOW PRESERVES PRIORITY AND TIMESTAMP THROUGH PIPELINE
+        
+        Returns (thoughts, actions, reply); reply is None unless with_reply,
+        in which case the call runs on the text model at spoken priority
         """
         from BASE.core.thought_buffer import Priority
         
@@ -445,12 +488,20 @@ class ThoughtProcessor:
             context_parts=context_parts,
             last_user_msg=last_user_msg,
             pending_actions=pending_actions,
-            has_vision=has_vision
+            has_vision=has_vision,
+            with_reply=with_reply
         )
         
-        # Call LLM
-        response = self._call_ollama(
-            prompt=prompt, model=self.config.thought_model, system_prompt=None
+        # Call LLM (events that are all tool output are follow-ups, not user-facing)
+        if with_reply:
+            model, priority = self.config.text_model, LLMPriority.SPOKEN
+        elif all(self._is_tool_followup_source(e.source) for e in raw_events):
+            model, priority = self.config.thought_model, LLMPriority.TOOL_FOLLOWUP
+        else:
+            model, priority = self.config.thought_model, LLMPriority.REACTIVE
+        response = await self._call_ollama(
+            prompt=prompt, model=model, system_prompt=None, priority=priority,
+            prefix=self.responsive_constructor.packer.last_prefix
         )
         
         # Parse response
@@ -509,7 +560,7 @@ class ThoughtProcessor:
         # Validate actions
         actions = self._validate_actions(parsed['actions'])
         
-        return thoughts, actions
+        return thoughts, actions, (parsed['response'] if with_reply else None)
     
     # ========================================================================
     # PROACTIVE PROCESSING - REFACTORED
@@ -536,6 +587,7 @@ class ThoughtProcessor:
         
         if prompt_type == PromptType.REFLECTIVE:
             # Use ReflectiveConstructor
+            packer = self.reflective_constructor.packer
             thought_count = len(self.thought_buffer.get_thoughts_for_response())
             is_startup = thought_count < 3
             
@@ -548,6 +600,7 @@ class ThoughtProcessor:
         
         elif prompt_type == PromptType.PLANNING:
             # Use PlanningConstructor
+            packer = self.planning_constructor.packer
             time_since_user = self.thought_buffer.get_time_since_last_user_input()
             time_context = (
                 f"{username} was active {time_since_user // 60:.0f} minutes ago"
@@ -562,15 +615,18 @@ class ThoughtProcessor:
         
         else:
             # Default to planning
+            packer = self.planning_constructor.packer
             prompt = self.planning_constructor.build_planning_prompt(
                 thought_chain=recent_thoughts,
                 ongoing_context=ongoing_ctx if ongoing_ctx else "Planning next actions",
                 time_context=None
             )
         
-        # Call LLM
-        response = self._call_ollama(
-            prompt=prompt, model=self.config.thought_model, system_prompt=None
+        # Call LLM (preempted if user-facing work arrives meanwhile)
+        response = await self._call_ollama(
+            prompt=prompt, model=self.config.thought_model, system_prompt=None,
+            priority=LLMPriority.PROACTIVE,
+            prefix=packer.last_prefix
         )
         
         # Parse response
@@ -609,6 +665,11 @@ class ThoughtProcessor:
     # HELPER METHODS
     # ========================================================================
     
+    @staticmethod
+    def _is_tool_followup_source(source: str) -> bool:
+        """Event produced by a tool rather than by a person"""
+        return source.startswith('tool_') or source in ('vision_result', 'search_result', 'memory_result')
+    
     def _check_chat_engagement_need(self) -> bool:
         """Check if chat engagement needed"""
         chat_enabled = getattr(self.controls, 'CHAT_ENGAGEMENT', False)
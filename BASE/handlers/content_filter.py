@@ -16,6 +16,8 @@ from pathlib import Path
 from functools import lru_cache
 import hashlib
 
+from BASE.core.llm_client import get_ollama_client
+
 
 class ContentFilter:
     def __init__(self, ollama_endpoint: str = "http://127.0.0.1:11434", use_ai_filter: bool = True):
@@ -118,31 +120,23 @@ Text: "{text}"
 
 Response (one word only):"""
 
-            payload = {
-                "model": "llama3.2:3b",
-                "prompt": filter_prompt,
-                "stream": False,
+            options = {
                 "temperature": 0.1,
-                "max_tokens": 10,
+                "num_predict": 10,
                 "stop": ["\n", ".", ","]
             }
             
-            response = requests.post(
-                f"{self.ollama_endpoint}/api/generate",
-                json=payload,
-                timeout=3
-            )
+            # Pooled connection from the shared client (no per-call handshake)
+            ai_response = get_ollama_client(self.ollama_endpoint).sync.generate(
+                "llama3.2:3b", filter_prompt, options=options, timeout=3
+            ).strip().upper()
             
-            if response.status_code == 200:
-                result = response.json()
-                ai_response = result.get("response", "").strip().upper()
-                
-                if "PROFANITY" in ai_response:
-                    return True, "profanity"
-                elif "HATE" in ai_response:
-                    return True, "hate_speech"
-                elif "CONTROVERSIAL" in ai_response:
-                    return True, "controversial"
+            if "PROFANITY" in ai_response:
+                return True, "profanity"
+            elif "HATE" in ai_response:
+                return True, "hate_speech"
+            elif "CONTROVERSIAL" in ai_response:
+                return True, "controversial"
             
             return False, ""
             
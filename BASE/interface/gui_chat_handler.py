@@ -8,6 +8,8 @@ from datetime import datetime
 from typing import Optional
 import threading
 
+from BASE.memory.date_index import iso_timestamp_of
+
 
 class GUIMessageHandler:
     """
@@ -96,23 +98,23 @@ class GUIMessageHandler:
     def load_conversation_history(self, messages_to_load: int = 400):
         """Load conversation history from memory and display in GUI"""
         try:
+            # Older days are summarized in the background; history shows now
             self.logger.memory("Checking for date rollover and previous day summarization...")
             self.ai_core.memory_manager.check_and_summarize_previous_day()
             
-            all_messages = []
-            all_messages.extend(self.ai_core.memory_manager.short_memory)
-            all_messages.extend(self.ai_core.memory_manager.medium_memory)
-            
             from datetime import datetime, timedelta
             current_date = datetime.now().strftime('%Y-%m-%d')
             yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
             
-            recent_messages = [
-                msg for msg in all_messages
-                if msg.get('date') in [current_date, yesterday]
-            ]
+            # Date-indexed lookups touch only yesterday's and today's entries
+            memory_manager = self.ai_core.memory_manager
+            recent_messages = (
+                memory_manager.get_entries_for_date(yesterday) +
+                memory_manager.get_entries_for_date(current_date)
+            )
             
-            recent_messages.sort(key=lambda x: self._parse_sortable_datetime(x))
+            # ISO keys sort as strings (already near-sorted, so this is cheap)
+            recent_messages.sort(key=iso_timestamp_of)
             recent_messages = recent_messages[-messages_to_load:]
             
             for msg in recent_messages:
@@ -139,22 +141,3 @@ class GUIMessageHandler:
             self.logger.error(f"Failed to load conversation history: {e}")
             import traceback
             traceback.print_exc()
-    
-    def _parse_sortable_datetime(self, msg: dict) -> datetime:
-        """Parse message timestamp into sortable datetime"""
-        try:
-            date_str = msg.get('date', '')
-            timestamp_str = msg.get('timestamp', '')
-            
-            if " at " in timestamp_str:
-                dt = datetime.strptime(timestamp_str, "%A, %B %d, %Y at %I:%M:%S %p")
-                return dt
-            
-            if date_str:
-                return datetime.strptime(date_str, "%Y-%m-%d")
-            
-            return datetime.fromtimestamp(0)
-            
-        except Exception as e:
-            self.logger.warning(f"Failed to parse datetime for sorting: {e}")
-            return datetime.fromtimestamp(0)
\ No newline at end of file
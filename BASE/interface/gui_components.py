@@ -326,7 +326,8 @@ class ControlPanelManager:
             ],
             "Output Actions": [
                 ("TTS Speech", "AVATAR_SPEECH", "Enable text-to-speech"),
-                ("Custom Voice", "USE_CUSTOM_VOICE", "Use voice cloning instead of system TTS")
+                ("Custom Voice", "USE_CUSTOM_VOICE", "Use voice cloning instead of system TTS"),
+                ("Stream Speech", "STREAM_SPEECH", "Start speaking before the full reply is generated")
             ],
             "Filters": [
                 ("Content Filter", "ENABLE_CONTENT_FILTER",
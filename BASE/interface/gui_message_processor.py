@@ -4,10 +4,14 @@ Message processing logic for the GUI - fully delegated to AI Core
 FIXED: No user message saving here - handled by gui_chat_handler
 FIXED: Empty messages trigger background checks without displaying empty responses
 FIXED: TTS speech interruption and state management
+NEW: Streamed speech (STREAM_SPEECH) - sentences reach TTS while the reply
+is still being generated; time-to-first-audio is tracked for both modes
 """
 
+import time
 import threading
 import asyncio
+from collections import deque
 from pathlib import Path
 from typing import Optional
 from personality.bot_info import agentname, username
@@ -27,6 +31,12 @@ class MessageProcessor:
         self._is_speaking = False
         self._speech_lock = threading.Lock()
         self._speech_stop_event = threading.Event()
+        
+        # Time-to-first-audio samples (seconds) per mode
+        self.first_audio_latencies = {
+            'streamed': deque(maxlen=50),
+            'full_reply': deque(maxlen=50)
+        }
 
         self.agentname = agentname
         self.username = username
@@ -48,27 +58,40 @@ class MessageProcessor:
             if is_auto_prompt:
                 self.logger.system("Processing auto-prompt (background check)")
             
+            started_at = time.perf_counter()
+            
+            # Streamed speech: sentences go to TTS as they are generated
+            import personality.controls as controls
+            speech_stream = None
+            if controls.AVATAR_SPEECH and getattr(controls, 'STREAM_SPEECH', False):
+                speech_stream = self._create_speech_stream(started_at)
+            
             # Process message through AI Core
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             
             try:
-                response = loop.run_until_complete(
-                    self.ai_core.process_user_message(
-                        message=message if message else "",  # Ensure empty string not None
-                        source="GUI"
+                try:
+                    response = loop.run_until_complete(
+                        self.ai_core.process_user_message(
+                            message=message if message else "",  # Ensure empty string not None
+                            source="GUI",
+                            on_sentence=self._stream_sentence_sink(speech_stream) if speech_stream else None
+                        )
                     )
-                )
+                finally:
+                    if speech_stream:
+                        speech_stream.close()
                 
                 if response and response.strip():
                     # Bot response already saved by AI Core
                     # Just display it (3-tuple format)
                     self.message_queue.put(("agent", self.agentname, response))
                     
-                    # Handle TTS if enabled
-                    import personality.controls as controls
-                    if controls.AVATAR_SPEECH and len(response) < 1000:
-                        self._play_tts(response)
+                    # Handle TTS if enabled (unless it was already streamed)
+                    streamed = speech_stream is not None and speech_stream.sentences_fed > 0
+                    if controls.AVATAR_SPEECH and not streamed and len(response) < 1000:
+                        self._play_tts(response, started_at=started_at)
                 # else:
                 #     # No response generated (normal for auto-prompts)
                 #     if is_auto_prompt:
@@ -90,14 +113,8 @@ class MessageProcessor:
             # Signal processing complete
             self.message_queue.put(("processing_complete", None, None))
         
-    def _play_tts(self, text: str):
-        """
-        Play TTS using centralized AI Core tools
-        FIXED: Proper interruption without race conditions
-        
-        Args:
-            text: Text to speak
-        """
+    def _interrupt_speech(self):
+        """Stop the previous response's speech before starting a new one"""
         # CRITICAL FIX: Acquire lock BEFORE checking state
         with self._speech_lock:
             # Stop previous speech if running
@@ -126,6 +143,79 @@ class MessageProcessor:
         
         # CRITICAL: Clear stop event BEFORE starting new thread
         self._speech_stop_event.clear()
+    
+    def _create_speech_stream(self, started_at: float):
+        """
+        SpeechStream for one response, or None if TTS is unavailable
+        
+        Args:
+            started_at: time.perf_counter() when the request began
+        """
+        if not self.ai_core.tts_tool or not self.ai_core.tts_tool.is_available():
+            return None
+        
+        from BASE.tools.internal.voice.tts_tool import SpeechStream
+        return SpeechStream(self.ai_core.tts_tool, self._speech_stop_event, started_at)
+    
+    def _stream_sentence_sink(self, stream):
+        """
+        Sentence callback for a SpeechStream; the first sentence interrupts
+        the previous response's speech and starts the speech thread (so
+        speech is still only ever interrupted by a newer response)
+        """
+        def feed(sentence: str):
+            if stream.sentences_fed == 0:
+                self._start_speech_stream(stream)
+            stream.feed(sentence)
+        return feed
+    
+    def _start_speech_stream(self, stream):
+        """Interrupt previous speech and speak the stream on a new thread"""
+        self._interrupt_speech()
+        
+        def speak_stream():
+            with self._speech_lock:
+                self._is_speaking = True
+            
+            try:
+                result = stream.run()
+                
+                if stream.time_to_first_audio is not None:
+                    self.first_audio_latencies['streamed'].append(stream.time_to_first_audio)
+                
+                if result == "Interrupted":
+                    self.logger.speech("Speech interrupted by newer response")
+                elif "error" in result.lower():
+                    self.logger.error(f"TTS error: {result}")
+                elif stream.sentences_spoken:
+                    self.logger.speech(f"[COMPLETE] Streamed speech completed ({stream.sentences_spoken} sentences)")
+                    
+            except Exception as e:
+                self.logger.error(f"Speech error: {e}")
+                import traceback
+                traceback.print_exc()
+            finally:
+                with self._speech_lock:
+                    self._is_speaking = False
+        
+        self.speech_thread = threading.Thread(
+            target=speak_stream,
+            daemon=True,
+            name="GUI_Speech_Thread"
+        )
+        self.speech_thread.start()
+    
+    def _play_tts(self, text: str, started_at: Optional[float] = None):
+        """
+        Play TTS using centralized AI Core tools
+        FIXED: Proper interruption without race conditions
+        
+        Args:
+            text: Text to speak
+            started_at: time.perf_counter() when the request began (for
+                the time-to-first-audio metric)
+        """
+        self._interrupt_speech()
         
         # Start new speech thread
         def speak_async():
@@ -139,6 +229,11 @@ class MessageProcessor:
                 
                 # Use AI Core's TTS tool directly
                 if self.ai_core.tts_tool and self.ai_core.tts_tool.is_available():
+                    if started_at is not None:
+                        latency = time.perf_counter() - started_at
+                        self.first_audio_latencies['full_reply'].append(latency)
+                        self.logger.speech(f"[Latency] First audio after {latency:.2f}s (full reply)")
+                    
                     result = self.ai_core.tts_tool.speak(text, stream=True)
                     
                     # Check if we were interrupted
@@ -196,6 +291,18 @@ class MessageProcessor:
         # Clear state
         with self._speech_lock:
             self._is_speaking = False
+    
+    def get_speech_stats(self) -> dict:
+        """Time-to-first-audio per mode: sample count, last and average seconds"""
+        stats = {}
+        for mode, samples in self.first_audio_latencies.items():
+            samples = list(samples)
+            stats[mode] = {
+                'count': len(samples),
+                'last': samples[-1] if samples else None,
+                'avg': sum(samples) / len(samples) if samples else None
+            }
+        return stats
 
 
 # Legacy function for backward compatibility
@@ -0,0 +1,309 @@
+# Filename: BASE/memory/ann_index.py
+"""
+Approximate Nearest Neighbour Index for Base Knowledge (Tier 4)
+
+Pure-NumPy inverted file index (IVF): vectors are clustered with spherical
+k-means and stored grouped by cluster. A query scores the centroids first
+and only scans the `nprobe` closest clusters, trading recall for latency.
+
+IVF files are built offline next to each embedded document:
+    <name>_embeddings.json  ->  <name>_embeddings.ivf.npz
+and loaded lazily on the first search that needs them. Files below
+`min_chunks` (and files without an IVF) are always searched exactly.
+
+Usage:
+    python -m BASE.memory.ann_index build [paths...] [--lists N]
+"""
+
+import sys
+import argparse
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from BASE.memory.vector_store import load_vector_json, has_embedding
+from BASE.memory.vector_index import VectorIndex, top_k_indices
+
+IVF_SUFFIX = ".ivf.npz"
+
+
+def ivf_path_for(json_path: Path) -> Path:
+    """IVF file that sits next to an embeddings JSON file"""
+    return json_path.with_suffix(IVF_SUFFIX)
+
+
+def indexable_vectors(file_data) -> np.ndarray:
+    """
+    Extract the vectors MemoryManager keeps from one embeddings file, in
+    load order (chunks with an embedding and non-empty text)
+    """
+    if isinstance(file_data, dict):
+        raw_chunks = file_data.get('chunks') or file_data.get('entries') or []
+    elif isinstance(file_data, list):
+        raw_chunks = file_data
+    else:
+        raw_chunks = []
+
+    rows = []
+    for chunk in raw_chunks:
+        if not isinstance(chunk, dict) or not has_embedding(chunk):
+            continue
+        text = chunk.get('text') or chunk.get('content')
+        if not text or not isinstance(text, str) or not text.strip():
+            continue
+        rows.append(chunk['embedding'])
+
+    return np.asarray(rows, dtype=np.float32)
+
+
+class IVFIndex:
+    """Inverted file index over a fixed, row-ordered set of vectors"""
+
+    def __init__(self, centroids: np.ndarray, offsets: np.ndarray, ids: np.ndarray, count: int):
+        self.centroids = centroids
+        self.offsets = offsets
+        self.ids = ids
+        self.count = count
+
+    @property
+    def n_lists(self) -> int:
+        return self.centroids.shape[0]
+
+    # ========================================================================
+    # BUILD / PERSIST
+    # ========================================================================
+
+    @classmethod
+    def build(
+        cls,
+        vectors: np.ndarray,
+        n_lists: Optional[int] = None,
+        iterations: int = 10,
+        seed: int = 0
+    ) -> "IVFIndex":
+        """
+        Cluster vectors with spherical k-means
+
+        Args:
+            vectors: Row vectors (any norm)
+            n_lists: Number of clusters (default ~4 * sqrt(N))
+            iterations: k-means iterations on the training sample
+            seed: RNG seed for reproducible builds
+        """
+        data = np.asarray(vectors, dtype=np.float32)
+        data = data / np.maximum(np.linalg.norm(data, axis=1, keepdims=True), 1e-8)
+        count = data.shape[0]
+
+        if n_lists is None:
+            n_lists = int(4 * np.sqrt(count))
+        n_lists = max(1, min(n_lists, count))
+
+        rng = np.random.default_rng(seed)
+        sample_size = min(count, max(n_lists * 40, 10000))
+        sample = data[rng.choice(count, sample_size, replace=False)]
+
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            assign = cls._assign(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            sizes = np.bincount(assign, minlength=n_lists)
+
+            empty = sizes == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-8)
+
+        assign = cls._assign(data, centroids)
+        order = np.argsort(assign, kind='stable')
+        sizes = np.bincount(assign, minlength=n_lists)
+        offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+
+        return cls(centroids.astype(np.float32), offsets, order.astype(np.int64), count)
+
+    @staticmethod
+    def _assign(data: np.ndarray, centroids: np.ndarray, batch: int = 8192) -> np.ndarray:
+        """Nearest centroid per row, batched to bound memory"""
+        assign = np.empty(data.shape[0], dtype=np.int64)
+        for start in range(0, data.shape[0], batch):
+            block = data[start:start + batch] @ centroids.T
+            assign[start:start + batch] = np.argmax(block, axis=1)
+        return assign
+
+    def save(self, path: Path):
+        """Write index arrays to a single .npz file"""
+        np.savez(
+            path,
+            centroids=self.centroids,
+            offsets=self.offsets,
+            ids=self.ids,
+            count=np.array(self.count, dtype=np.int64)
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "IVFIndex":
+        with np.load(path) as data:
+            return cls(
+                data['centroids'].astype(np.float32),
+                data['offsets'],
+                data['ids'],
+                int(data['count'])
+            )
+
+    # ========================================================================
+    # QUERY
+    # ========================================================================
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Row ids (local to this index) in the `nprobe` closest clusters"""
+        nprobe = max(1, min(nprobe, self.n_lists))
+        scores = self.centroids @ query
+        probe = top_k_indices(scores, nprobe)
+        return np.concatenate([
+            self.ids[self.offsets[c]:self.offsets[c + 1]] for c in probe
+        ])
+
+
+class BaseAnnSearch:
+    """
+    Segment-aware search over the combined base knowledge index
+
+    Each loaded base file is a contiguous row segment of the base
+    VectorIndex. Large segments with a matching IVF file are probed
+    approximately; everything else is scanned exactly.
+    """
+
+    def __init__(self, index: VectorIndex, logger, nprobe: int = 8, min_chunks: int = 20000):
+        """
+        Args:
+            index: Combined base tier VectorIndex
+            logger: Logger instance for all output
+            nprobe: Clusters probed per large file (recall/latency knob)
+            min_chunks: Segments smaller than this are always exact
+        """
+        self.index = index
+        self.logger = logger
+        self.nprobe = nprobe
+        self.min_chunks = min_chunks
+        self._segments: List[Tuple[Path, int, int]] = []
+        self._ivf_cache: Dict[Path, Optional[IVFIndex]] = {}
+        self.active = False  # True if any large segment has an IVF file
+
+    def set_segments(self, segments: List[Tuple[Path, int, int]]):
+        """
+        Register row segments after the base index is rebuilt
+
+        Args:
+            segments: (json_path, start_row, stop_row) per loaded file
+        """
+        self._segments = segments
+        self._ivf_cache = {}
+        self.active = any(
+            stop - start >= self.min_chunks and ivf_path_for(path).exists()
+            for path, start, stop in segments
+        )
+
+    def _get_ivf(self, path: Path, rows: int) -> Optional[IVFIndex]:
+        """Lazily load and validate the IVF for one segment"""
+        if path in self._ivf_cache:
+            return self._ivf_cache[path]
+
+        ivf = None
+        ivf_file = ivf_path_for(path)
+        if ivf_file.exists():
+            try:
+                ivf = IVFIndex.load(ivf_file)
+                if ivf.count != rows:
+                    self.logger.warning(
+                        f"[Tier 4] Stale ANN index for {path.name} "
+                        f"({ivf.count} vs {rows} chunks), using exact search"
+                    )
+                    ivf = None
+                else:
+                    self.logger.memory(f"[Tier 4] Loaded ANN index for {path.name} ({ivf.n_lists} lists)")
+            except Exception as e:
+                self.logger.error(f"[Tier 4] Failed to load ANN index {ivf_file.name}: {e}")
+                ivf = None
+
+        self._ivf_cache[path] = ivf
+        return ivf
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        k: int,
+        min_similarity: Optional[float] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Top-k over the base tier, approximate where an IVF applies"""
+        if not self.active:
+            return self.index.search(query_embedding, k, min_similarity)
+
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        query = query / max(float(np.linalg.norm(query)), 1e-8)
+
+        parts = []
+        for path, start, stop in self._segments:
+            rows = stop - start
+            ivf = self._get_ivf(path, rows) if rows >= self.min_chunks else None
+
+            if ivf is not None:
+                parts.append(ivf.candidates(query, self.nprobe) + start)
+            else:
+                parts.append(np.arange(start, stop))
+
+        if not parts:
+            return []
+
+        return self.index.search_rows(query, np.concatenate(parts), k, min_similarity)
+
+
+# ============================================================================
+# OFFLINE BUILD COMMAND
+# ============================================================================
+
+def build_for_file(json_path: Path, n_lists: Optional[int] = None) -> Optional[Path]:
+    """Build and save the IVF for one embeddings file"""
+    vectors = indexable_vectors(load_vector_json(json_path))
+    if len(vectors) == 0:
+        print(f"  No embeddings in {json_path.name}, skipping")
+        return None
+
+    ivf = IVFIndex.build(vectors, n_lists=n_lists)
+    out = ivf_path_for(json_path)
+    ivf.save(out)
+    print(f"  Built ANN index for {json_path.name}: {ivf.count} vectors, {ivf.n_lists} lists -> {out.name}")
+    return out
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Build IVF ANN indexes for base knowledge files")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Build .ivf.npz next to embeddings files")
+    build.add_argument("paths", nargs="*", type=Path,
+                       help="Embeddings JSON files (default: all base memories)")
+    build.add_argument("--lists", type=int, default=None,
+                       help="Number of clusters (default ~4*sqrt(N))")
+
+    args = parser.parse_args(argv)
+
+    paths = args.paths
+    if not paths:
+        base_dir = Path(__file__).resolve().parents[2] / "personality" / "base_memory" / "base_memories"
+        paths = sorted(base_dir.glob("*.json")) if base_dir.exists() else []
+
+    if not paths:
+        print("No embeddings files found")
+        return
+
+    for path in paths:
+        try:
+            build_for_file(path, n_lists=args.lists)
+        except Exception as e:
+            print(f"  [FAILED] {path}: {e}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,157 @@
+# Filename: BASE/memory/bm25_index.py
+"""
+Per-Tier BM25 Inverted Index
+Lexical counterpart of VectorIndex: same items, same rebuild/add/clear
+lifecycle, so MemoryManager keeps both in step. Exact names, numbers and
+error codes that embeddings blur together are matched here.
+
+Postings are appended incrementally; per-term NumPy arrays are built
+lazily and cached until that term changes, so scoring a query is a few
+vectorized passes over the postings of its terms.
+"""
+
+import re
+import math
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterable
+
+from BASE.memory.vector_index import top_k_indices
+
+# Keeps version numbers, hex codes, hyphenated ids and contractions whole
+_TOKEN_PATTERN = re.compile(r"[a-z0-9_]+(?:[.'\-][a-z0-9_]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased lexical tokens"""
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+class BM25Index:
+    """Okapi BM25 over one tier's items"""
+
+    def __init__(self, name: str = "index", k1: float = 1.2, b: float = 0.75):
+        """
+        Args:
+            name: Tier name, used in log lines by owners
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.name = name
+        self.k1 = k1
+        self.b = b
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    # ========================================================================
+    # BUILDING
+    # ========================================================================
+
+    def clear(self):
+        """Drop all documents"""
+        self.items: List[Dict[str, Any]] = []
+        self._doc_len: List[int] = []
+        self._total_len = 0
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._doc_len_array: Optional[np.ndarray] = None
+
+    def rebuild(self, items: Iterable[Dict[str, Any]], text_fn: Callable[[Dict[str, Any]], str]):
+        """Rebuild from items, using text_fn to pick each item's text"""
+        self.clear()
+        for item in items:
+            self.add(item, text_fn(item))
+
+    def add(self, item: Dict[str, Any], text: str) -> bool:
+        """
+        Append one document
+
+        Returns:
+            True if the document had any tokens
+        """
+        tokens = tokenize(text)
+        if not tokens:
+            return False
+
+        doc_id = len(self.items)
+        self.items.append(item)
+        self._doc_len.append(len(tokens))
+        self._total_len += len(tokens)
+        self._doc_len_array = None
+
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+
+        for term, tf in counts.items():
+            ids, tfs = self._postings.setdefault(term, ([], []))
+            ids.append(doc_id)
+            tfs.append(tf)
+            self._arrays.pop(term, None)
+
+        return True
+
+    # ========================================================================
+    # SCORING
+    # ========================================================================
+
+    def idf(self, term: str) -> float:
+        """Lucene-style idf (always positive); unseen terms get the maximum"""
+        posting = self._postings.get(term)
+        n = len(posting[0]) if posting else 0
+        count = len(self.items)
+        return math.log(1.0 + (count - n + 0.5) / (n + 0.5))
+
+    def _term_arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            posting = self._postings.get(term)
+            if posting is None:
+                return None
+            arrays = (np.asarray(posting[0], dtype=np.int64), np.asarray(posting[1], dtype=np.float32))
+            self._arrays[term] = arrays
+        return arrays
+
+    def search(self, query: str, k: int) -> List[Tuple[Dict[str, Any], float, float]]:
+        """
+        Top-k BM25 search
+
+        Returns:
+            (item, bm25 score, strength) best first. Strength is the score
+            divided by the summed idf of all query terms (what a doc of
+            average length containing each term once would get), clipped to
+            1.0, so it measures how much of the query's information one
+            document covers.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.items or k <= 0:
+            return []
+
+        if self._doc_len_array is None:
+            self._doc_len_array = np.asarray(self._doc_len, dtype=np.float32)
+        avg_len = self._total_len / len(self.items)
+        length_norm = self.k1 * (1.0 - self.b + self.b * self._doc_len_array / avg_len)
+
+        scores = np.zeros(len(self.items), dtype=np.float32)
+        ceiling = 0.0
+        for term in terms:
+            idf = self.idf(term)
+            ceiling += idf
+            arrays = self._term_arrays(term)
+            if arrays is None:
+                continue
+            ids, tfs = arrays
+            scores[ids] += idf * tfs * (self.k1 + 1.0) / (tfs + length_norm[ids])
+
+        candidates = np.flatnonzero(scores)
+        if candidates.size == 0:
+            return []
+
+        top = top_k_indices(scores[candidates], k)
+        ceiling = max(ceiling, 1e-8)
+        return [
+            (self.items[candidates[i]], float(scores[candidates[i]]),
+             min(1.0, float(scores[candidates[i]]) / ceiling))
+            for i in top
+        ]
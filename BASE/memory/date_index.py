@@ -0,0 +1,137 @@
+# Filename: BASE/memory/date_index.py
+"""
+Per-Tier Date Index
+Tiers 1 and 2 are append-only lists in conversation order, so one day's
+entries sit in a few contiguous runs. DateIndex keeps date -> [start, end)
+ranges over a tier list and stays in step on append, on dropping the
+oldest entries (short -> medium rollover) and on bulk rebuild. Day-level
+lookups, counts and "keep only these days" then cost time proportional to
+the days involved, not to the whole tier.
+
+Positions are absolute: dropping entries from the front only advances an
+offset, so surviving ranges never need renumbering.
+
+Entries also carry an ISO-8601 'iso_timestamp' so they sort as plain
+strings; iso_timestamp_of() backfills it for entries written before that
+field existed.
+"""
+
+from datetime import datetime
+from typing import List, Dict, Any, Iterable
+
+ISO_FIELD = "iso_timestamp"
+_DISPLAY_FORMAT = "%A, %B %d, %Y at %I:%M:%S %p"
+
+
+def iso_timestamp_of(entry: Dict[str, Any]) -> str:
+    """
+    ISO sort key of an entry, parsing the display timestamp (and caching
+    the result on the entry) only if the field is missing
+    """
+    iso = entry.get(ISO_FIELD)
+    if iso:
+        return iso
+
+    timestamp = entry.get('timestamp', '')
+    try:
+        iso = datetime.strptime(timestamp, _DISPLAY_FORMAT).isoformat()
+    except (TypeError, ValueError):
+        iso = entry.get('date', '')
+    entry[ISO_FIELD] = iso
+    return iso
+
+
+class DateIndex:
+    """date -> [start, end) ranges over one tier list"""
+
+    def __init__(self, name: str = "index"):
+        """
+        Args:
+            name: Tier name, used in log lines by owners
+        """
+        self.name = name
+        self.clear()
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ========================================================================
+    # BUILDING
+    # ========================================================================
+
+    def clear(self):
+        """Forget all entries"""
+        self._ranges: Dict[str, List[List[int]]] = {}
+        self._offset = 0   # Absolute position of list index 0
+        self._count = 0
+
+    def rebuild(self, entries: Iterable[Dict[str, Any]]):
+        """Re-index a whole tier list"""
+        self.clear()
+        for entry in entries:
+            self.append(entry)
+
+    def append(self, entry: Dict[str, Any]):
+        """Index one entry appended at the end of the tier list"""
+        date = entry.get('date', '')
+        position = self._offset + self._count
+        ranges = self._ranges.setdefault(date, [])
+        if ranges and ranges[-1][1] == position:
+            ranges[-1][1] += 1
+        else:
+            ranges.append([position, position + 1])
+        self._count += 1
+
+    def drop_oldest(self, entries: List[Dict[str, Any]]):
+        """
+        Forget entries just removed from the front of the tier list
+
+        Args:
+            entries: The removed entries, with their dates as indexed
+        """
+        if not entries:
+            return
+        self._offset += len(entries)
+        self._count -= len(entries)
+
+        for date in {e.get('date', '') for e in entries}:
+            ranges = self._ranges.get(date)
+            if not ranges:
+                continue
+            while ranges and ranges[0][1] <= self._offset:
+                ranges.pop(0)
+            if ranges:
+                ranges[0][0] = max(ranges[0][0], self._offset)
+            else:
+                del self._ranges[date]
+
+    # ========================================================================
+    # LOOKUPS
+    # ========================================================================
+
+    def dates(self) -> List[str]:
+        """Indexed dates (unordered)"""
+        return list(self._ranges)
+
+    def count(self, date: str) -> int:
+        """Number of entries on a date"""
+        return sum(end - start for start, end in self._ranges.get(date, ()))
+
+    def counts(self) -> Dict[str, int]:
+        """Entry count per date"""
+        return {date: self.count(date) for date in self._ranges if date}
+
+    def entries(self, tier_list: List[Dict[str, Any]], date: str) -> List[Dict[str, Any]]:
+        """One day's entries from the indexed list, in list order"""
+        result: List[Dict[str, Any]] = []
+        for start, end in self._ranges.get(date, ()):
+            result.extend(tier_list[start - self._offset:end - self._offset])
+        return result
+
+    def select(self, tier_list: List[Dict[str, Any]], dates: Iterable[str]) -> List[Dict[str, Any]]:
+        """Entries of several dates, in list order"""
+        spans = sorted(span for date in set(dates) for span in self._ranges.get(date, ()))
+        result: List[Dict[str, Any]] = []
+        for start, end in spans:
+            result.extend(tier_list[start - self._offset:end - self._offset])
+        return result
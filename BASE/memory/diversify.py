@@ -0,0 +1,165 @@
+# Filename: BASE/memory/diversify.py
+"""
+Result Diversification
+Overlapping document chunks (200-char overlap) and repeated chat lines
+make top-k lists full of near-identical hits. Two vectorized passes over
+a candidate list fix that before it reaches a prompt:
+
+- drop_near_duplicates(): greedy filter, a candidate is dropped if its
+  cosine to an already kept one is at or above the cutoff
+- mmr_select(): maximal marginal relevance re-ranking,
+  lambda * relevance - (1 - lambda) * max similarity to the picks so far
+
+Both work on stored embeddings where items have them; items without one
+(lexical-only hits, pending medium entries, plain text) are compared with
+hashed bag-of-words vectors, so no embedding request is ever made here.
+"""
+
+import zlib
+import numpy as np
+from typing import List, Dict, Any, Optional, Sequence
+
+from BASE.memory.vector_store import has_embedding, VECTOR_FIELD
+from BASE.memory.bm25_index import tokenize
+
+HASHED_DIM = 2048
+
+
+def hashed_term_vectors(texts: Sequence[str], dim: int = HASHED_DIM) -> np.ndarray:
+    """L2-normalized hashed term-frequency rows (one per text)"""
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for token in tokenize(text):
+            matrix[row, zlib.crc32(token.encode()) % dim] += 1.0
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-8)
+
+
+def similarity_matrix(items: Sequence[Dict[str, Any]], text_fn) -> np.ndarray:
+    """
+    Pairwise cosine similarity between items
+
+    Uses stored embeddings when every item has one of the same size,
+    otherwise hashed term vectors of text_fn(item) for all of them (so
+    all pairs are on one scale).
+    """
+    if len(items) == 0:
+        return np.zeros((0, 0), dtype=np.float32)
+
+    if all(has_embedding(item) for item in items):
+        dims = {len(item[VECTOR_FIELD]) for item in items}
+        if len(dims) == 1:
+            matrix = np.asarray([item[VECTOR_FIELD] for item in items], dtype=np.float32)
+            matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-8)
+            return matrix @ matrix.T
+
+    matrix = hashed_term_vectors([text_fn(item) for item in items])
+    return matrix @ matrix.T
+
+
+def drop_near_duplicates(
+    similarities: np.ndarray,
+    threshold: float,
+    seeds: int = 0
+) -> List[int]:
+    """
+    Greedy near-duplicate filter in rank order
+
+    Args:
+        similarities: Pairwise cosine matrix, rows in rank order
+        threshold: Candidates this similar to a kept row are dropped
+        seeds: Leading rows that are already in the prompt; they are never
+            returned but still suppress their duplicates
+
+    Returns:
+        Indices (>= seeds) of the rows to keep, in order
+    """
+    n = similarities.shape[0]
+    if n <= seeds:
+        return []
+
+    suppressed = np.zeros(n, dtype=bool)
+    if seeds:
+        suppressed[seeds:] = (similarities[:seeds, seeds:] >= threshold).any(axis=0)
+
+    kept = []
+    for i in range(seeds, n):
+        if suppressed[i]:
+            continue
+        kept.append(i)
+        suppressed[i + 1:] |= similarities[i, i + 1:] >= threshold
+    return kept
+
+
+def mmr_select(
+    relevance: np.ndarray,
+    similarities: np.ndarray,
+    k: int,
+    lambda_: float = 0.7
+) -> List[int]:
+    """
+    Maximal marginal relevance order
+
+    Args:
+        relevance: Relevance score per candidate (e.g. query similarity)
+        similarities: Pairwise cosine matrix between candidates
+        k: Number to select
+        lambda_: 1.0 is pure relevance, 0.0 pure diversity
+
+    Returns:
+        Indices of the selected candidates in pick order
+    """
+    n = len(relevance)
+    if n == 0 or k <= 0:
+        return []
+
+    relevance = np.asarray(relevance, dtype=np.float32)
+    selected = [int(np.argmax(relevance))]
+    available = np.ones(n, dtype=bool)
+    available[selected[0]] = False
+    redundancy = similarities[selected[0]].copy()
+
+    while len(selected) < min(k, n):
+        scores = lambda_ * relevance - (1.0 - lambda_) * redundancy
+        scores[~available] = -np.inf
+        pick = int(np.argmax(scores))
+        selected.append(pick)
+        available[pick] = False
+        np.maximum(redundancy, similarities[pick], out=redundancy)
+
+    return selected
+
+
+def diversify_hits(
+    hits: List[tuple],
+    k: int,
+    text_fn,
+    dedup_threshold: Optional[float] = 0.95,
+    mmr_lambda: Optional[float] = None
+) -> List[tuple]:
+    """
+    Near-duplicate filter then (optionally) MMR over (item, similarity) hits
+
+    Args:
+        hits: Candidates best first, usually more than k
+        k: Number of hits to return
+        text_fn: item -> text, for items compared without embeddings
+        dedup_threshold: Cosine cutoff for duplicates (None disables)
+        mmr_lambda: MMR trade-off (None keeps relevance order)
+    """
+    if len(hits) <= 1 or (dedup_threshold is None and mmr_lambda is None):
+        return hits[:k]
+
+    items = [item for item, _ in hits]
+    similarities = similarity_matrix(items, text_fn)
+
+    rows = list(range(len(hits)))
+    if dedup_threshold is not None:
+        rows = drop_near_duplicates(similarities, dedup_threshold)
+
+    if mmr_lambda is not None and len(rows) > 1:
+        sub = similarities[np.ix_(rows, rows)]
+        relevance = np.asarray([hits[r][1] for r in rows], dtype=np.float32)
+        rows = [rows[i] for i in mmr_select(relevance, sub, k, mmr_lambda)]
+
+    return [hits[r] for r in rows[:k]]
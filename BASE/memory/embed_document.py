@@ -2,27 +2,63 @@
 """
 Batch Document Embedding Script for RAG System
 Processes all files in a directory and saves embeddings to another directory
-Usage: python embed_document.py
+
+Files are streamed through a pipeline (see ingest_pipeline.py): blocks
+are read and decoded on a reader thread, chunked by a generator, embedded
+in batches with a bounded number of concurrent requests and written to
+disk as they complete, so large logs and CSVs are never loaded whole.
+
+Runs are incremental: unchanged sources (same mtime and size, or same
+content hash) are skipped, edited sources are re-chunked and only chunks
+with a new hash are embedded, and outputs whose source was deleted are
+removed.
+
+Usage: python embed_document.py [--full] [--workers N]
 """
 
 import sys
 import json
 import os
+import argparse
 import requests
 from typing import List, Dict, Any
 import hashlib
 import re
 from pathlib import Path
 
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from BASE.memory.vector_store import (
+    save_vector_json, load_vector_json, sidecar_file, remove_stale_sidecars, VectorStreamWriter
+)
+from BASE.memory.ingest_pipeline import (
+    IngestProgress, detect_encoding, iter_text_blocks, iter_chunks, embed_stream, prefetch
+)
+from BASE.memory.ann_index import build_for_file, ivf_path_for
+from BASE.memory.embedding_client import EmbeddingClient
+from BASE.memory.embedding_cache import EmbeddingCache, default_cache_path
+
 class DocumentEmbedder:
     def __init__(self, ollama_url: str = "http://localhost:11434"):
         self.ollama_url = ollama_url
         self.embed_model = "nomic-embed-text"
+        # Documents with at least this many chunks also get an IVF index
+        # (keep in sync with memory.ann_min_chunks in config.json)
+        self.ann_min_chunks = 20000
+        # Concurrent embedding requests per file in the streaming pipeline
+        self.concurrency = 4
         
         # Get the script's directory and build paths relative to it
         script_dir = Path(__file__).parent
         base_dir = script_dir.parent.parent  # Go up two levels from BASE/memory/ to Esther_AI
         
+        # Shared on-disk cache: unchanged chunks are never re-embedded
+        self.embedding_client = EmbeddingClient(
+            ollama_url, self.embed_model,
+            cache=EmbeddingCache(default_cache_path(base_dir))
+        )
+        
         # Define the directory paths
         self.input_dir = base_dir / "personality" / "base_memory" / "base_files"
         self.output_dir = base_dir / "personality" / "base_memory" / "base_memories"
@@ -66,20 +102,11 @@ class DocumentEmbedder:
     
     def get_embedding(self, text: str) -> List[float]:
         """Get embedding for text using Ollama."""
-        try:
-            response = requests.post(
-                f"{self.ollama_url}/api/embeddings",
-                json={
-                    "model": self.embed_model,
-                    "prompt": text
-                },
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()["embedding"]
-        except Exception as e:
-            print(f"Error getting embedding: {e}")
-            return []
+        return self.embedding_client.embed_one(text) or []
+    
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Get embeddings for many texts using batched requests."""
+        return [e or [] for e in self.embedding_client.embed(texts)]
     
     def load_document(self, filepath: Path) -> str:
         """Load document content from file."""
@@ -96,8 +123,40 @@ class DocumentEmbedder:
                     continue
             raise Exception(f"Unable to decode file {filepath}")
     
-    def embed_document(self, filepath: Path) -> Dict[str, Any]:
-        """Process document and create embeddings."""
+    def file_fingerprint(self, filepath: Path) -> Dict[str, Any]:
+        """Cheap change-detection fields for a source file."""
+        stat = filepath.stat()
+        return {
+            "source_mtime": stat.st_mtime,
+            "source_size": stat.st_size
+        }
+    
+    def file_hash(self, filepath: Path) -> str:
+        """SHA-256 of the raw source bytes."""
+        digest = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def load_previous_output(self, output_path: Path) -> Dict[str, Any]:
+        """Load an existing output file (empty dict if missing or unreadable)."""
+        if not output_path.exists():
+            return {}
+        try:
+            data = load_vector_json(output_path)
+            return data if isinstance(data, dict) else {}
+        except Exception as e:
+            print(f"Could not read existing output {output_path.name}: {e}")
+            return {}
+    
+    def embed_document(self, filepath: Path, previous: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Process document and create embeddings.
+        
+        Chunks whose hash appears in `previous` (an earlier output for the
+        same source) reuse that embedding instead of being embedded again.
+        """
         if not filepath.exists():
             raise FileNotFoundError(f"File {filepath} not found")
         
@@ -109,40 +168,143 @@ class DocumentEmbedder:
         # Create chunks
         print("Chunking document...")
         chunks = self.chunk_text(text)
+        hashes = [hashlib.md5(chunk.encode()).hexdigest() for chunk in chunks]
         print(f"Created {len(chunks)} chunks")
         
+        # Embeddings from the previous run, keyed by chunk hash
+        known = {}
+        if previous and previous.get("embed_model") == self.embed_model:
+            for chunk_data in previous.get("chunks", []):
+                embedding = chunk_data.get("embedding")
+                if chunk_data.get("hash") and embedding is not None and len(embedding):
+                    known[chunk_data["hash"]] = embedding
+        
         # Create embeddings
-        print("Creating embeddings...")
         embeddings_data = {
             "source_file": str(filepath),
+            **self.file_fingerprint(filepath),
+            "source_hash": self.file_hash(filepath),
             "total_chunks": len(chunks),
             "embed_model": self.embed_model,
             "chunks": []
         }
         
-        for i, chunk in enumerate(chunks):
-            print(f"Processing chunk {i+1}/{len(chunks)}")
-            embedding = self.get_embedding(chunk)
-            
-            if embedding:
+        embeddings = [known.get(h) for h in hashes]
+        todo = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if known:
+            print(f"Reusing {len(chunks) - len(todo)} unchanged chunks, embedding {len(todo)} new")
+        
+        print("Creating embeddings...")
+        batch_size = self.embedding_client.max_batch_size
+        for start in range(0, len(todo), batch_size):
+            batch = todo[start:start+batch_size]
+            print(f"Processing chunks {start+1}-{start+len(batch)}/{len(todo)}")
+            for i, embedding in zip(batch, self.get_embeddings([chunks[j] for j in batch])):
+                embeddings[i] = embedding
+        
+        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
+            if embedding is not None and len(embedding):
                 chunk_data = {
                     "id": i,
                     "text": chunk,
                     "embedding": embedding,
-                    "hash": hashlib.md5(chunk.encode()).hexdigest()
+                    "hash": hashes[i]
                 }
                 embeddings_data["chunks"].append(chunk_data)
             else:
                 print(f"Failed to get embedding for chunk {i+1}")
         
+        embeddings_data["failed_chunks"] = len(chunks) - len(embeddings_data["chunks"])
         return embeddings_data
     
+    def embed_document_streaming(
+        self,
+        filepath: Path,
+        output_path: Path,
+        previous: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Stream a document through read -> chunk -> embed -> write.
+        
+        Produces the same output as embed_document() + save_embeddings()
+        with memory bounded by the in-flight batches.
+        
+        Returns:
+            Summary with total, embedded, reused and failed chunk counts
+        """
+        if not filepath.exists():
+            raise FileNotFoundError(f"File {filepath} not found")
+        
+        # Embeddings from the previous run, keyed by chunk hash
+        known = {}
+        if previous and previous.get("embed_model") == self.embed_model:
+            for chunk_data in previous.get("chunks", []):
+                embedding = chunk_data.get("embedding")
+                if chunk_data.get("hash") and embedding is not None and len(embedding):
+                    known[chunk_data["hash"]] = embedding
+        
+        fingerprint = self.file_fingerprint(filepath)
+        encoding = detect_encoding(filepath)
+        progress = IngestProgress(filepath.name, fingerprint["source_size"])
+        digest = hashlib.sha256()
+        print(f"Streaming {filepath.name} ({fingerprint['source_size'] / (1024 * 1024):.1f} MB, {encoding})")
+        
+        blocks = prefetch(iter_text_blocks(filepath, encoding, progress, digest))
+        results = embed_stream(
+            iter_chunks(blocks),
+            self.embedding_client.embed,
+            batch_size=self.embedding_client.max_batch_size,
+            concurrency=self.concurrency,
+            known=known,
+            progress=progress
+        )
+        
+        writer = VectorStreamWriter(output_path, {
+            "source_file": str(filepath),
+            **fingerprint,
+            "embed_model": self.embed_model
+        })
+        
+        try:
+            for i, (chunk, chunk_hash, embedding) in enumerate(results):
+                if embedding is not None and len(embedding):
+                    writer.add({
+                        "id": i,
+                        "text": chunk,
+                        "embedding": embedding,
+                        "hash": chunk_hash
+                    })
+                else:
+                    print(f"Failed to get embedding for chunk {i+1}")
+            
+            # failed_chunks > 0 makes the next incremental run retry this
+            # file (see is_unchanged); stored chunks are reused by hash
+            vectors_file = writer.close({
+                "source_hash": digest.hexdigest(),
+                "total_chunks": progress.chunks,
+                "failed_chunks": progress.failed
+            })
+        except BaseException:
+            writer.abort()
+            raise
+        
+        print(progress.format_line())
+        print(f"Embeddings saved to {output_path} (vectors: {vectors_file.name}) "
+              f"in {progress.elapsed:.1f}s")
+        
+        return {
+            "total_chunks": progress.chunks,
+            "embedded": progress.embedded,
+            "reused": progress.reused,
+            "failed": progress.failed,
+            "stored_chunks": writer.entries
+        }
+    
     def save_embeddings(self, embeddings_data: Dict[str, Any], output_file: Path):
-        """Save embeddings to JSON file."""
+        """Save chunk index to JSON and vectors to a memory-mapped .npy sidecar."""
         print(f"Saving embeddings to {output_file}")
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(embeddings_data, f, indent=2)
-        print(f"Embeddings saved successfully!")
+        vectors_file = save_vector_json(output_file, embeddings_data)
+        print(f"Embeddings saved successfully! (vectors: {vectors_file.name})")
 
     def get_supported_files(self) -> List[Path]:
         """Get list of supported files from input directory."""
@@ -157,14 +319,80 @@ class DocumentEmbedder:
         
         return files
 
-    def process_all_files(self):
-        """Process all files in the input directory."""
+    def output_path_for(self, file_path: Path) -> Path:
+        """Embeddings file produced for a source file."""
+        return self.output_dir / f"{file_path.stem}_embeddings.json"
+    
+    def is_unchanged(self, file_path: Path, previous: Dict[str, Any]) -> bool:
+        """
+        True if the source matches the fingerprint stored in its output.
+        
+        mtime+size is checked first; on a mismatch the content hash decides
+        (touched-but-identical files are not re-chunked). An output with
+        failed chunks never counts as unchanged, so those chunks are retried.
+        """
+        if not previous or previous.get("embed_model") != self.embed_model:
+            return False
+        
+        if previous.get("failed_chunks"):
+            return False
+        
+        fingerprint = self.file_fingerprint(file_path)
+        if all(previous.get(k) == v for k, v in fingerprint.items()):
+            return True
+        
+        return previous.get("source_hash") == self.file_hash(file_path)
+    
+    def remove_output(self, output_path: Path):
+        """Delete an output file with its vector sidecar and ANN index."""
+        for path in (sidecar_file(output_path), ivf_path_for(output_path), output_path):
+            if path is not None and path.exists():
+                try:
+                    path.unlink()
+                except OSError as e:
+                    print(f"Could not remove {path.name}: {e}")
+    
+    def prune_deleted_sources(self, source_files: List[Path]) -> int:
+        """Remove outputs whose source document no longer exists."""
+        current = {self.output_path_for(f).name for f in source_files}
+        removed = 0
+        
+        for output_path in self.output_dir.glob("*_embeddings.json"):
+            if output_path.name in current:
+                continue
+            
+            try:
+                with open(output_path, 'r', encoding='utf-8') as f:
+                    source = json.load(f).get("source_file")
+            except (OSError, json.JSONDecodeError, AttributeError):
+                continue
+            
+            # Only touch outputs this script produced from the input folder
+            if not source or Path(source).parent.resolve() != self.input_dir.resolve():
+                continue
+            
+            print(f"Source removed, deleting {output_path.name}")
+            self.remove_output(output_path)
+            removed += 1
+        
+        return removed
+    
+    def process_all_files(self, incremental: bool = True):
+        """
+        Process all files in the input directory.
+        
+        Args:
+            incremental: Skip unchanged files and reuse unchanged chunk
+                embeddings; False re-embeds everything
+        """
         # Create output directory if it doesn't exist
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
         # Get all supported files
         files_to_process = self.get_supported_files()
         
+        removed_outputs = self.prune_deleted_sources(files_to_process)
+        
         if not files_to_process:
             print(f"No supported files found in {self.input_dir}")
             print("Supported extensions: .txt, .md, .rst, .py, .js, .html, .css, .json, .xml, .csv, .log")
@@ -173,6 +401,7 @@ class DocumentEmbedder:
         print(f"Found {len(files_to_process)} files to process")
         
         successful_embeddings = 0
+        skipped_files = 0
         failed_embeddings = 0
         
         for i, file_path in enumerate(files_to_process, 1):
@@ -180,22 +409,33 @@ class DocumentEmbedder:
             
             try:
                 # Generate output filename
-                output_filename = f"{file_path.stem}_embeddings.json"
-                output_path = self.output_dir / output_filename
+                output_path = self.output_path_for(file_path)
+                previous = self.load_previous_output(output_path) if incremental else {}
                 
-                # Skip if embeddings already exist
-                if output_path.exists():
-                    print(f"Embeddings already exist for {file_path.name}, skipping...")
+                # Skip if the source has not changed since its last embedding
+                if self.is_unchanged(file_path, previous):
+                    print(f"{file_path.name} unchanged, skipping...")
+                    skipped_files += 1
                     continue
                 
-                # Process document
-                embeddings_data = self.embed_document(file_path)
-                self.save_embeddings(embeddings_data, output_path)
+                # Stream document through the pipeline (reusing embeddings of unchanged chunks)
+                summary = self.embed_document_streaming(file_path, output_path, previous)
+                
+                # Reused vectors came from the old sidecar's memory map; release
+                # it so the replaced sidecar can be deleted (Windows refuses while mapped)
+                previous = None
+                remove_stale_sidecars(output_path)
+                
+                if summary['stored_chunks'] >= self.ann_min_chunks:
+                    build_for_file(output_path)
+                elif ivf_path_for(output_path).exists():
+                    ivf_path_for(output_path).unlink()
                 
                 print(f"[SUCCESS] Successfully processed {file_path.name}")
                 print(f"  Output: {output_path}")
-                print(f"  Total chunks: {embeddings_data['total_chunks']}")
-                print(f"  Successful embeddings: {len(embeddings_data['chunks'])}")
+                print(f"  Total chunks: {summary['total_chunks']}")
+                print(f"  Successful embeddings: {summary['stored_chunks']} "
+                      f"({summary['reused']} reused, {summary['embedded']} new)")
                 
                 successful_embeddings += 1
                 
@@ -206,13 +446,23 @@ class DocumentEmbedder:
         print(f"BATCH PROCESSING COMPLETE")
         print(f"Total files processed: {len(files_to_process)}")
         print(f"Successful embeddings: {successful_embeddings}")
+        print(f"Unchanged (skipped): {skipped_files}")
+        print(f"Removed outputs for deleted sources: {removed_outputs}")
         print(f"Failed embeddings: {failed_embeddings}")
         print(f"Input directory: {self.input_dir}")
         print(f"Output directory: {self.output_dir}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Embed documents for the base knowledge tier")
+    parser.add_argument("--full", action="store_true",
+                        help="Re-embed every file instead of only changed chunks")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Concurrent embedding requests per file (default 4)")
+    args = parser.parse_args()
+    
     try:
         embedder = DocumentEmbedder()
+        embedder.concurrency = max(1, args.workers)
         
         # Check if input directory exists
         if not embedder.input_dir.exists():
@@ -241,7 +491,7 @@ def main():
             sys.exit(1)
         
         # Process all files
-        embedder.process_all_files()
+        embedder.process_all_files(incremental=not args.full)
         
     except Exception as e:
         print(f"Error: {e}")
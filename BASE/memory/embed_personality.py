@@ -9,21 +9,32 @@ Usage: python embed_personality.py
 """
 
 import sys
-import json
 import requests
 import hashlib
 import importlib.util
 from pathlib import Path
 from typing import List, Dict, Any, Tuple, Optional
 
+project_root = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(project_root))
+
+from BASE.memory.vector_store import save_vector_json
+from BASE.memory.embedding_client import EmbeddingClient
+from BASE.memory.embedding_cache import EmbeddingCache, default_cache_path
+
 class PersonalityEmbedder:
     def __init__(self, ollama_url: str = "http://localhost:11434"):
         self.ollama_url = ollama_url
         self.embed_model = "nomic-embed-text"
-        
         script_dir = Path(__file__).resolve().parent
         base_dir = script_dir.parents[1]
         
+        # Shared on-disk cache: re-runs only embed new or edited examples
+        self.embedding_client = EmbeddingClient(
+            ollama_url, self.embed_model,
+            cache=EmbeddingCache(default_cache_path(base_dir))
+        )
+        
         self.input_dir = base_dir / "personality" / "base_memory" / "base_personality"
         self.output_base = base_dir / "personality" / "base_memory" / "base_memories"
         self.thought_output_dir = self.output_base / "thought_examples"
@@ -47,17 +58,7 @@ class PersonalityEmbedder:
         
     def get_embedding(self, text: str) -> List[float]:
         """Get embedding for text using Ollama."""
-        try:
-            response = requests.post(
-                f"{self.ollama_url}/api/embeddings",
-                json={"model": self.embed_model, "prompt": text},
-                timeout=30
-            )
-            response.raise_for_status()
-            return response.json()["embedding"]
-        except Exception as e:
-            print(f"Error getting embedding: {e}")
-            return []
+        return self.embedding_client.embed_one(text) or []
     
     def load_training_module(self, filepath: Path) -> Optional[Tuple[List[Dict], str, str]]:
         """
@@ -123,6 +124,9 @@ KEYWORDS: {', '.join(keywords)}"""
         return {
             "text": chunk_text,
             "searchable_text": searchable_text,
+            # Pre-parsed for MemorySearch (no text parsing at load/search time)
+            "situation": context,
+            "reply": response,
             "metadata": {
                 "type": f"{stage}_example",
                 "stage": stage,
@@ -193,11 +197,11 @@ KEY PATTERNS: {', '.join(top_keywords)}"""
         """Generate embeddings for chunks."""
         print(f"  Generating {stage} embeddings for {len(chunks)} chunks...")
         
+        embed_texts = [chunk.get('searchable_text', chunk['text']) for chunk in chunks]
+        embeddings = self.embedding_client.embed(embed_texts)
+        
         embedded_chunks = []
-        for i, chunk in enumerate(chunks, 1):
-            embed_text = chunk.get('searchable_text', chunk['text'])
-            embedding = self.get_embedding(embed_text)
-            
+        for i, (chunk, embedding) in enumerate(zip(chunks, embeddings), 1):
             if embedding:
                 chunk['embedding'] = embedding
                 chunk['hash'] = hashlib.md5(chunk['text'].encode()).hexdigest()
@@ -246,10 +250,10 @@ KEY PATTERNS: {', '.join(top_keywords)}"""
             "chunks": chunks
         }
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        vectors_path = save_vector_json(output_path, output_data)
         
         print(f"  [SUCCESS] Saved {stage} to: {output_filename}")
+        print(f"    Vectors: {vectors_path.name}")
         print(f"    Size: {output_path.stat().st_size / 1024:.1f} KB")
         print(f"    Unique keywords: {len(unique_keywords)}")
     
@@ -0,0 +1,190 @@
+# Filename: BASE/memory/embedding_cache.py
+"""
+Persistent Content-Addressed Embedding Cache
+Maps (embed_model, sha256(text)) -> float32 vector, stored as raw BLOBs in
+a small SQLite database shared by the agent and the offline embedders.
+Total vector bytes are bounded; least recently used rows are evicted first.
+
+Restarting the agent, rebuilding a tier or re-running embed_personality.py
+then costs almost no embedding calls for text that was seen before.
+"""
+
+import time
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+from pathlib import Path
+from typing import List, Optional, Dict
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_path(project_root: Path) -> Path:
+    """Shared cache location used by the agent and both embedders"""
+    return project_root / "personality" / "memory" / "embedding_cache.sqlite3"
+
+
+def normalize_model_name(model: str) -> str:
+    """Treat 'name' and 'name:latest' as the same model"""
+    return model[:-len(":latest")] if model.endswith(":latest") else model
+
+
+class EmbeddingCache:
+    """Size-bounded LRU embedding cache on disk"""
+
+    def __init__(self, path: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Open (or create) the cache database
+
+        Args:
+            path: SQLite database file
+            max_bytes: Upper bound on stored vector bytes
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS embeddings (
+                   model TEXT NOT NULL,
+                   text_hash BLOB NOT NULL,
+                   vector BLOB NOT NULL,
+                   last_used REAL NOT NULL,
+                   PRIMARY KEY (model, text_hash)
+               ) WITHOUT ROWID"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)"
+        )
+        self._conn.commit()
+
+        row = self._conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()
+        self._total_bytes = int(row[0])
+
+        # Hit/miss counters for this process
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.sha256(text.encode('utf-8')).digest()
+
+    # ========================================================================
+    # LOOKUP / STORE
+    # ========================================================================
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Look up cached vectors
+
+        Returns:
+            Vectors aligned with `texts`; None for misses
+        """
+        model = normalize_model_name(model)
+        keys = [self._key(t) for t in texts]
+        found: Dict[bytes, List[float]] = {}
+
+        with self._lock:
+            # Chunked IN queries stay under SQLite's parameter limit
+            unique = list(dict.fromkeys(keys))
+            for start in range(0, len(unique), 500):
+                chunk = unique[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *chunk]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[bytes(text_hash)] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, k) for k in found]
+                )
+                self._conn.commit()
+
+        results = [found.get(k) for k in keys]
+        hit_count = sum(1 for r in results if r is not None)
+        self.hits += hit_count
+        self.misses += len(results) - hit_count
+        return results
+
+    def put_many(self, model: str, texts: List[str], vectors: List[Optional[List[float]]]):
+        """Store vectors for texts (None vectors are skipped)"""
+        model = normalize_model_name(model)
+        now = time.time()
+        rows = [
+            (model, self._key(t), np.asarray(v, dtype=np.float32).tobytes(), now)
+            for t, v in zip(texts, vectors) if v
+        ]
+        if not rows:
+            return
+
+        with self._lock:
+            for model_name, key, blob, used in rows:
+                previous = self._conn.execute(
+                    "SELECT LENGTH(vector) FROM embeddings WHERE model = ? AND text_hash = ?",
+                    (model_name, key)
+                ).fetchone()
+                if previous:
+                    self._total_bytes -= int(previous[0])
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, last_used) "
+                    "VALUES (?, ?, ?, ?)",
+                    (model_name, key, blob, used)
+                )
+                self._total_bytes += len(blob)
+
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used rows until under 90% of the byte budget"""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        while self._total_bytes > target:
+            rows = self._conn.execute(
+                "SELECT model, text_hash, LENGTH(vector) FROM embeddings "
+                "ORDER BY last_used LIMIT 256"
+            ).fetchall()
+            if not rows:
+                self._total_bytes = 0
+                break
+
+            for model, key, size in rows:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE model = ? AND text_hash = ?", (model, key)
+                )
+                self._total_bytes -= int(size)
+                if self._total_bytes <= target:
+                    break
+
+    # ========================================================================
+    # STATS
+    # ========================================================================
+
+    def get_stats(self) -> Dict[str, int]:
+        """Entry count, byte usage and this process's hit/miss counts"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        return {
+            'entries': count,
+            'bytes': self._total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,198 @@
+# Filename: BASE/memory/embedding_client.py
+"""
+Shared Batched Embedding Client
+Sends lists of texts to Ollama's batch /api/embed endpoint instead of one
+HTTP round-trip per text. Batches are bounded by item count and by payload
+bytes. Servers without /api/embed fall back to the legacy per-text
+/api/embeddings endpoint automatically; other failures return None for
+the batch and are retried by the caller.
+
+An optional persistent EmbeddingCache is consulted first, so only texts
+never seen before reach the server.
+
+Used by MemoryManager, MemorySearch, DocumentEmbedder and PersonalityEmbedder.
+"""
+
+import requests
+from typing import List, Optional, Callable, Iterator, Tuple
+
+from BASE.memory.embedding_cache import EmbeddingCache
+
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_BATCH_BYTES = 256 * 1024
+
+
+class EmbeddingClient:
+    """Batching Ollama embedding client with a persistent HTTP session"""
+
+    def __init__(
+        self,
+        endpoint: str,
+        model: str,
+        log_error: Optional[Callable[[str], None]] = None,
+        max_batch_size: int = DEFAULT_BATCH_SIZE,
+        max_batch_bytes: int = DEFAULT_BATCH_BYTES,
+        timeout: int = 60,
+        cache: Optional[EmbeddingCache] = None
+    ):
+        """
+        Initialize embedding client
+
+        Args:
+            endpoint: Ollama base URL
+            model: Embedding model name
+            log_error: Error sink (Logger.error or print); defaults to print
+            max_batch_size: Max texts per request
+            max_batch_bytes: Max UTF-8 payload bytes per request
+            timeout: Per-request timeout in seconds
+            cache: Persistent embedding cache (None disables caching)
+        """
+        self.endpoint = endpoint.rstrip('/')
+        self.model = model
+        self.log_error = log_error or print
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_batch_bytes = max(1, max_batch_bytes)
+        self.timeout = timeout
+        self.cache = cache
+
+        self._session = requests.Session()
+        self._batch_supported = True
+
+        # Request accounting (for throughput reporting)
+        self.requests_made = 0
+        self.texts_embedded = 0
+
+    # ========================================================================
+    # PUBLIC API
+    # ========================================================================
+
+    def embed_one(self, text: str) -> Optional[List[float]]:
+        """Embed a single text, None on failure"""
+        return self.embed([text])[0]
+
+    def embed(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Embed many texts with as few requests as the limits allow
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embeddings aligned with `texts`; None for texts that failed
+        """
+        if self.cache is not None:
+            results = self.cache.get_many(self.model, texts)
+        else:
+            results = [None] * len(texts)
+
+        missing = [i for i, r in enumerate(results) if r is None]
+        if not missing:
+            return results
+
+        missing_texts = [texts[i] for i in missing]
+        fetched: List[Optional[List[float]]] = [None] * len(missing_texts)
+
+        for start, batch in self._batches(missing_texts):
+            fetched[start:start + len(batch)] = self._embed_batch(batch)
+
+        for i, embedding in zip(missing, fetched):
+            results[i] = embedding
+
+        if self.cache is not None:
+            try:
+                self.cache.put_many(self.model, missing_texts, fetched)
+            except Exception as e:
+                self.log_error(f"Embedding cache write failed: {e}")
+
+        return results
+
+    # ========================================================================
+    # BATCHING
+    # ========================================================================
+
+    def _batches(self, texts: List[str]) -> Iterator[Tuple[int, List[str]]]:
+        """Split texts into (start_index, batch) respecting count and byte limits"""
+        batch: List[str] = []
+        batch_bytes = 0
+        start = 0
+
+        for i, text in enumerate(texts):
+            size = len(text.encode('utf-8'))
+
+            if batch and (len(batch) >= self.max_batch_size or
+                          batch_bytes + size > self.max_batch_bytes):
+                yield start, batch
+                batch, batch_bytes, start = [], 0, i
+
+            batch.append(text)
+            batch_bytes += size
+
+        if batch:
+            yield start, batch
+
+    def _embed_batch(self, batch: List[str]) -> List[Optional[List[float]]]:
+        """
+        Embed one batch
+
+        Only a server without /api/embed is served per text; any other
+        failure (timeout, connection error, HTTP error) leaves the whole
+        batch as None for the caller's retry path instead of multiplying
+        it into one request per text.
+        """
+        if not self._batch_supported:
+            return [self._embed_single(text) for text in batch]
+
+        try:
+            response = self._session.post(
+                f"{self.endpoint}/api/embed",
+                json={"model": self.model, "input": batch},
+                timeout=self.timeout
+            )
+            self.requests_made += 1
+
+            if self._endpoint_missing(response):
+                # Ollama < 0.3 has no batch endpoint
+                self._batch_supported = False
+                return [self._embed_single(text) for text in batch]
+
+            response.raise_for_status()
+            embeddings = response.json().get("embeddings") or []
+            if len(embeddings) == len(batch):
+                self.texts_embedded += len(batch)
+                return embeddings
+            self.log_error(
+                f"Embedding batch returned {len(embeddings)} vectors for {len(batch)} texts"
+            )
+        except Exception as e:
+            self.log_error(f"Embedding batch API error: {e}")
+
+        return [None] * len(batch)
+
+    @staticmethod
+    def _endpoint_missing(response) -> bool:
+        """True if the server has no /api/embed route (not e.g. an unknown model)"""
+        if response.status_code not in (404, 405):
+            return False
+        try:
+            # Ollama answers a missing model with a JSON error; a missing route is plain text
+            return "error" not in response.json()
+        except ValueError:
+            return True
+
+    def _embed_single(self, text: str) -> Optional[List[float]]:
+        """Legacy per-text endpoint"""
+        try:
+            response = self._session.post(
+                f"{self.endpoint}/api/embeddings",
+                json={"model": self.model, "prompt": text},
+                timeout=self.timeout
+            )
+            self.requests_made += 1
+            response.raise_for_status()
+            embedding = response.json().get("embedding")
+            if embedding:
+                self.texts_embedded += 1
+            return embedding
+        except Exception as e:
+            self.log_error(f"Embedding API error: {e}")
+            return None
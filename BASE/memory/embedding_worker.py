@@ -0,0 +1,209 @@
+# Filename: BASE/memory/embedding_worker.py
+"""
+Background Embedding Worker
+Embeds Tier 2 entries off the chat path. Entries overflowing from short
+memory are written to medium memory un-embedded (so they are durable and
+lexically searchable at once) and queued here; the worker embeds them in
+batches and hands each vector back to MemoryManager.
+
+Failed entries are retried with exponential backoff kept per entry, so
+one entry that keeps failing neither stalls the entries queued behind it
+nor has its delay reset when others succeed. After max_attempts an entry
+is parked (left un-embedded). Nothing is lost: parked entries, and
+anything still queued on exit, stay un-embedded on disk and are re-queued
+when memory is loaded again.
+"""
+
+import time
+import heapq
+import threading
+from collections import deque
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+from BASE.core.logger import Logger
+
+
+class EmbeddingWorker:
+    """Single daemon thread draining a FIFO of entries to embed"""
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], List[Optional[List[float]]]],
+        on_embedded: Callable[[Dict[str, Any], List[float]], None],
+        logger: Logger,
+        batch_size: int = 64,
+        retry_min_seconds: float = 2.0,
+        retry_max_seconds: float = 60.0,
+        max_attempts: int = 8
+    ):
+        """
+        Args:
+            embed_fn: Batched embedding function (texts -> vectors or None)
+            on_embedded: Callback receiving (entry, embedding) on success
+            logger: Logger instance for all output
+            batch_size: Max entries embedded per request
+            retry_min_seconds: First retry delay after a failure
+            retry_max_seconds: Cap on the exponential retry delay
+            max_attempts: Tries per entry before it is parked
+        """
+        self.embed_fn = embed_fn
+        self.on_embedded = on_embedded
+        self.logger = logger
+        self.batch_size = max(1, batch_size)
+        self.retry_min_seconds = retry_min_seconds
+        self.retry_max_seconds = max(retry_min_seconds, retry_max_seconds)
+        self.max_attempts = max(1, max_attempts)
+
+        self._queue: deque = deque()   # New entries, FIFO
+        self._retry: List[Tuple[float, int, int, Dict[str, Any]]] = []   # Heap of (due, seq, attempts, entry)
+        self._retry_seq = 0
+        self._cond = threading.Condition()
+        self._busy = False
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Counters for stats
+        self.embedded = 0
+        self.failures = 0
+        self.parked = 0
+
+    # ========================================================================
+    # PUBLIC API
+    # ========================================================================
+
+    def submit(self, entries: List[Dict[str, Any]]):
+        """
+        Queue entries for embedding (their 'content' field is embedded)
+
+        After stop() entries are dropped; they stay un-embedded on disk and
+        are re-queued when memory is loaded again.
+        """
+        if not entries:
+            return
+
+        with self._cond:
+            if self._stopped:
+                return
+            self._queue.extend(entries)
+            self._ensure_thread()
+            self._cond.notify()
+
+    def pending_count(self) -> int:
+        """Entries queued or waiting for a retry"""
+        with self._cond:
+            return len(self._queue) + len(self._retry)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the queue is drained
+
+        Returns:
+            True if everything queued was embedded before the timeout
+        """
+        with self._cond:
+            self._cond.notify()
+            return self._cond.wait_for(
+                lambda: not self._queue and not self._retry and not self._busy, timeout=timeout
+            )
+
+    def stop(self):
+        """Stop the worker thread for good (queued entries stay un-embedded on disk)"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'pending': self.pending_count(),
+            'embedded': self.embedded,
+            'failures': self.failures,
+            'parked': self.parked
+        }
+
+    # ========================================================================
+    # WORKER LOOP
+    # ========================================================================
+
+    def _ensure_thread(self):
+        """Start the daemon thread on first use (caller holds the lock)"""
+        if self._thread and self._thread.is_alive():
+            return
+
+        self._thread = threading.Thread(
+            target=self._run, daemon=True, name="MemoryEmbeddingWorker"
+        )
+        self._thread.start()
+
+    def _take_batch(self) -> List[Tuple[int, Dict[str, Any]]]:
+        """Due retries first, then new entries, as (attempts, entry) (caller holds the lock)"""
+        now = time.monotonic()
+        batch = []
+        while self._retry and self._retry[0][0] <= now and len(batch) < self.batch_size:
+            _, _, attempts, entry = heapq.heappop(self._retry)
+            batch.append((attempts, entry))
+        while self._queue and len(batch) < self.batch_size:
+            batch.append((0, self._queue.popleft()))
+        return batch
+
+    def _retry_later(self, attempts: int, entry: Dict[str, Any]) -> bool:
+        """
+        Schedule a failed entry's next try, or park it (caller holds the lock)
+
+        Returns:
+            True if the entry was parked
+        """
+        if attempts >= self.max_attempts:
+            self.parked += 1
+            return True
+
+        delay = min(self.retry_min_seconds * 2 ** (attempts - 1), self.retry_max_seconds)
+        self._retry_seq += 1
+        heapq.heappush(self._retry, (time.monotonic() + delay, self._retry_seq, attempts, entry))
+        return False
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopped:
+                        return
+                    batch = self._take_batch()
+                    if batch:
+                        break
+                    # Idle, or only retries that are not due yet
+                    timeout = self._retry[0][0] - time.monotonic() if self._retry else None
+                    self._cond.wait(timeout)
+                self._busy = True
+
+            try:
+                embeddings = self.embed_fn([e.get('content', '') for _, e in batch])
+            except Exception as e:
+                self.logger.error(f"[Tier 2] Background embedding failed: {e}")
+                embeddings = [None] * len(batch)
+
+            failed = []
+            for (attempts, entry), embedding in zip(batch, embeddings):
+                if not embedding:
+                    failed.append((attempts + 1, entry))
+                    continue
+                try:
+                    self.on_embedded(entry, embedding)
+                    self.embedded += 1
+                except Exception as e:
+                    self.logger.error(f"[Tier 2] Storing background embedding failed: {e}")
+
+            parked = 0
+            with self._cond:
+                self._busy = False
+                if failed:
+                    self.failures += 1
+                    parked = sum(self._retry_later(attempts, entry) for attempts, entry in failed)
+                self._cond.notify_all()
+
+            if parked:
+                self.logger.warning(
+                    f"[Tier 2] {parked} entries not embedded after {self.max_attempts} attempts, "
+                    f"left un-embedded until memory is reloaded"
+                )
+            if len(failed) > parked:
+                self.logger.warning(f"[Tier 2] {len(failed) - parked} entries not embedded, will retry")
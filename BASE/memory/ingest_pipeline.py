@@ -0,0 +1,346 @@
+# Filename: BASE/memory/ingest_pipeline.py
+"""
+Streaming Document Ingestion Pipeline
+Stages used by DocumentEmbedder for large files:
+
+1. read/decode   iter_text_blocks()  fixed-size binary reads + incremental
+                                     decoder, prefetched on a reader thread
+2. chunk         iter_chunks()       generator producing exactly the chunks
+                                     DocumentEmbedder.chunk_text() would
+3. embed         embed_stream()      batches embedded on a bounded thread
+                                     pool, results yielded in order
+4. write         VectorStreamWriter  (vector_store.py) streams the index
+                                     and vector sidecar to disk
+
+Memory use is bounded by the block size and the number of in-flight
+batches, not by file size, so multi-hundred-MB logs and CSVs are fine.
+"""
+
+import re
+import time
+import codecs
+import hashlib
+import threading
+import queue
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator, Iterable, List, Optional, Callable, Dict, Tuple, Any
+
+BLOCK_SIZE = 1 << 20  # 1 MiB reads
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+# ============================================================================
+# PROGRESS
+# ============================================================================
+
+class IngestProgress:
+    """Byte/chunk counters with periodic throughput lines"""
+
+    def __init__(self, name: str, total_bytes: int, interval: float = 2.0, out: Callable = print):
+        self.name = name
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.out = out
+
+        self.bytes_read = 0
+        self.chunks = 0
+        self.embedded = 0
+        self.reused = 0
+        self.failed = 0
+
+        self._started = time.perf_counter()
+        self._last_report = self._started
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def maybe_report(self):
+        now = time.perf_counter()
+        if now - self._last_report >= self.interval:
+            self._last_report = now
+            self.out(self.format_line())
+
+    def format_line(self) -> str:
+        elapsed = max(self.elapsed, 1e-6)
+        mb_read = self.bytes_read / (1024 * 1024)
+        percent = (100.0 * self.bytes_read / self.total_bytes) if self.total_bytes else 100.0
+        return (
+            f"  {self.name}: {mb_read:.1f}/{self.total_bytes / (1024 * 1024):.1f} MB ({percent:.0f}%) | "
+            f"{self.chunks} chunks ({self.embedded} embedded, {self.reused} reused) | "
+            f"{self.chunks / elapsed:.1f} chunks/s, {mb_read / elapsed:.2f} MB/s"
+        )
+
+
+# ============================================================================
+# STAGE 1: READ / DECODE
+# ============================================================================
+
+def detect_encoding(path: Path, block_size: int = BLOCK_SIZE) -> str:
+    """
+    Pick a decoder without loading the file: BOM first, then a streaming
+    UTF-8 validation pass, falling back to latin-1 (which never fails)
+    """
+    with open(path, 'rb') as f:
+        head = f.read(4)
+        if head.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+            return 'utf-16'
+
+        f.seek(0)
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            for block in iter(lambda: f.read(block_size), b''):
+                decoder.decode(block)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return 'latin-1'
+
+    return 'utf-8'
+
+
+def iter_text_blocks(
+    path: Path,
+    encoding: str,
+    progress: Optional[IngestProgress] = None,
+    digest: Optional["hashlib._Hash"] = None,
+    block_size: int = BLOCK_SIZE
+) -> Iterator[str]:
+    """Yield decoded text blocks, updating byte counters and a content hash"""
+    decoder = codecs.getincrementaldecoder(encoding)()
+
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            if digest is not None:
+                digest.update(block)
+            if progress is not None:
+                progress.bytes_read += len(block)
+            text = decoder.decode(block)
+            if text:
+                yield text
+
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def prefetch(iterable: Iterable, depth: int = 4) -> Iterator:
+    """Run an iterator on a background thread, buffering up to `depth` items"""
+    buffer: "queue.Queue" = queue.Queue(maxsize=depth)
+    done = object()
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    def produce():
+        try:
+            for item in iterable:
+                while not stop.is_set():
+                    try:
+                        buffer.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            buffer.put(done)
+
+    thread = threading.Thread(target=produce, daemon=True, name="IngestReader")
+    thread.start()
+
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        stop.set()
+
+    if errors:
+        raise errors[0]
+
+
+# ============================================================================
+# STAGE 2: CHUNK
+# ============================================================================
+
+def normalize_whitespace(blocks: Iterable[str]) -> Iterator[str]:
+    """
+    Streaming equivalent of re.sub(r'\\s+', ' ', text).strip(): whitespace
+    runs that straddle block boundaries collapse to a single space
+    """
+    pending_space = False
+    started = False
+
+    for block in blocks:
+        text = _WHITESPACE.sub(' ', block)
+        if not text:
+            continue
+
+        if text[0] == ' ':
+            pending_space = True
+            text = text[1:]
+        if text.endswith(' '):
+            text = text[:-1]
+            trailing = True
+        else:
+            trailing = False
+
+        if text:
+            if pending_space and started:
+                text = ' ' + text
+            yield text
+            started = True
+            pending_space = trailing
+        elif trailing:
+            pending_space = True
+
+
+def iter_chunks(blocks: Iterable[str], chunk_size: int = 1000, overlap: int = 200) -> Iterator[str]:
+    """
+    Generator form of DocumentEmbedder.chunk_text over streamed text blocks
+
+    Produces the same chunks (and therefore the same chunk hashes) while
+    only buffering about one chunk of text.
+    """
+    source = normalize_whitespace(blocks)
+    buf = ""        # normalized text starting at absolute offset `base`
+    base = 0
+    start = 0
+    eof = False
+    emitted = False
+
+    while True:
+        # Buffer past start + chunk_size so "end < len(text)" is decidable
+        while not eof and base + len(buf) <= start + chunk_size:
+            try:
+                buf += next(source)
+            except StopIteration:
+                eof = True
+
+        total = base + len(buf) if eof else None
+
+        if not emitted and eof and total <= chunk_size:
+            if buf:
+                yield buf
+            return
+
+        if eof and start >= total:
+            return
+
+        end = start + chunk_size
+
+        if total is None or end < total:
+            # Look for sentence boundary, then word boundary (as chunk_text)
+            sentence_end = buf.rfind('.', start - base, end - base)
+            if sentence_end != -1 and sentence_end + base > start + chunk_size // 2:
+                end = sentence_end + base + 1
+            else:
+                word_end = buf.rfind(' ', start - base, end - base)
+                if word_end != -1 and word_end + base > start + chunk_size // 2:
+                    end = word_end + base
+
+        chunk = buf[start - base:end - base].strip()
+        if chunk:
+            yield chunk
+            emitted = True
+
+        start = end - overlap
+        if eof and start >= total:
+            return
+
+        # Drop text no later chunk can reach
+        if start > base:
+            buf = buf[start - base:]
+            base = start
+
+
+# ============================================================================
+# STAGE 3: EMBED
+# ============================================================================
+
+def chunk_hash(chunk: str) -> str:
+    """Chunk identity used for incremental reuse (matches stored 'hash')"""
+    return hashlib.md5(chunk.encode()).hexdigest()
+
+
+def _batched(items: Iterable[str], size: int) -> Iterator[List[str]]:
+    batch: List[str] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def embed_stream(
+    chunks: Iterable[str],
+    embed_fn: Callable[[List[str]], List[Optional[List[float]]]],
+    batch_size: int = 64,
+    concurrency: int = 4,
+    known: Optional[Dict[str, Any]] = None,
+    progress: Optional[IngestProgress] = None
+) -> Iterator[Tuple[str, str, Optional[Any]]]:
+    """
+    Embed chunks with at most `concurrency` batch requests in flight
+
+    Args:
+        chunks: Chunk texts (consumed lazily)
+        embed_fn: Batched embedding function
+        batch_size: Chunks per request
+        concurrency: Max concurrent requests (also bounds buffered batches)
+        known: hash -> embedding from a previous run, reused without a request
+        progress: Counters to update
+
+    Yields:
+        (chunk, hash, embedding or None) in input order
+    """
+    known = known or {}
+    concurrency = max(1, concurrency)
+
+    def drain(pending) -> Iterator[Tuple[str, str, Optional[Any]]]:
+        batch, hashes, todo, future = pending
+        embeddings = [known.get(h) for h in hashes]
+        if future is not None:
+            try:
+                fetched = future.result()
+            except Exception:
+                fetched = [None] * len(todo)
+            for i, embedding in zip(todo, fetched):
+                embeddings[i] = embedding
+
+        for chunk, h, embedding in zip(batch, hashes, embeddings):
+            if progress is not None:
+                progress.chunks += 1
+                if embedding is None or not len(embedding):
+                    progress.failed += 1
+            yield chunk, h, embedding
+
+        if progress is not None:
+            progress.reused += len(batch) - len(todo)
+            progress.embedded += sum(1 for i in todo if embeddings[i] is not None and len(embeddings[i]))
+            progress.maybe_report()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="IngestEmbed") as pool:
+        in_flight: deque = deque()
+
+        for batch in _batched(chunks, batch_size):
+            hashes = [chunk_hash(c) for c in batch]
+            todo = [i for i, h in enumerate(hashes) if h not in known]
+            future = pool.submit(embed_fn, [batch[i] for i in todo]) if todo else None
+            in_flight.append((batch, hashes, todo, future))
+
+            while len(in_flight) > concurrency:
+                yield from drain(in_flight.popleft())
+
+        while in_flight:
+            yield from drain(in_flight.popleft())
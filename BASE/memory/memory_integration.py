@@ -10,6 +10,8 @@ from datetime import datetime, timedelta
 import requests
 import json
 
+from BASE.core.context_packer import ContextPacker
+
 @dataclass
 class MemoryRelevanceScore:
     """Tracks when memory should be consulted"""
@@ -31,6 +33,11 @@ class MemoryAwarePromptBuilder:
         self.controls = controls_module
         self.memory_search = memory_search
         self._token_budget = 1500
+        self.packer = ContextPacker('memory', self._token_budget)
+        
+        # Cross-tier near-duplicate cutoff (None disables; per-tier MMR and
+        # duplicate filtering happen inside MemorySearch)
+        self.dedup_threshold = getattr(memory_search, 'dedup_threshold', None)
         
         # Memory relevance patterns
         self._memory_triggers = {
@@ -120,12 +127,14 @@ class MemoryAwarePromptBuilder:
     ) -> str:
         """
         Build memory context based on relevance score
-        Returns formatted context string with appropriate memory tiers
+        Returns formatted context string with appropriate memory tiers,
+        packed into _token_budget (see self.packer.last_result for cuts)
         """
         if not self.memory_search:
             return ""
         
         context_parts = []
+        seen = []  # Text already in the context, for near-duplicate checks
         
         # TIER 1: Short Memory (Recent conversation - always included)
         if relevance.needs_short_memory:
@@ -133,6 +142,10 @@ class MemoryAwarePromptBuilder:
             if short_mem:
                 context_parts.append("## RECENT CONVERSATION")
                 context_parts.append(short_mem)
+                seen.extend(
+                    entry.get('content', '')
+                    for entry in self.memory_search.memory_manager.short_memory[-10:]
+                )
         
         # TIER 1.5: Yesterday's Conversation (if relevant)
         if relevance.needs_yesterday:
@@ -148,6 +161,7 @@ class MemoryAwarePromptBuilder:
                 relevance.query_hint, 
                 k=3
             )
+            medium_results = self._drop_repeats(medium_results, 'content', seen)
             if medium_results:
                 context_parts.append("\n## EARLIER TODAY")
                 for r in medium_results:
@@ -161,6 +175,7 @@ class MemoryAwarePromptBuilder:
                 relevance.query_hint,
                 k=2
             )
+            long_results = self._drop_repeats(long_results, 'summary', seen)
             if long_results:
                 context_parts.append("\n## PAST DAYS")
                 for r in long_results:
@@ -174,6 +189,7 @@ class MemoryAwarePromptBuilder:
                 k=3,
                 min_similarity=0.4  # Higher threshold for base knowledge
             )
+            base_results = self._drop_repeats(base_results, 'text', seen)
             if base_results:
                 # Separate personality from documents
                 personality = [r for r in base_results 
@@ -195,7 +211,38 @@ class MemoryAwarePromptBuilder:
                         context_parts.append(r['text'])
                         context_parts.append(f"(relevance: {r['similarity']:.2f})")
         
-        return "\n".join(context_parts) if context_parts else ""
+        if not context_parts:
+            return ""
+        
+        # One section per tier heading; recent conversation is never cut
+        sections = self.packer.context_sections(self._split_by_heading(context_parts), name_prefix="memory")
+        for section in sections:
+            if section.text.startswith("## RECENT CONVERSATION"):
+                section.required = True
+        
+        self.packer.budget = self._token_budget
+        return self.packer.pack(sections).text
+    
+    @staticmethod
+    def _split_by_heading(lines: List[str]) -> List[str]:
+        """Group flat context lines into one block per '## ' heading"""
+        blocks: List[List[str]] = []
+        for line in lines:
+            if line.lstrip().startswith("## ") or not blocks:
+                blocks.append([line])
+            else:
+                blocks[-1].append(line)
+        return ["\n".join(block) for block in blocks]
+    
+    def _drop_repeats(self, results: List[Dict], text_key: str, seen: List[str]) -> List[Dict]:
+        """Drop results that near-duplicate each other or text already in context"""
+        if not results or self.dedup_threshold is None:
+            return results
+        
+        texts = [r.get(text_key, '') for r in results]
+        keep = self.memory_search.filter_near_duplicates(texts, seen=seen, threshold=self.dedup_threshold)
+        seen.extend(texts[i] for i in keep)
+        return [results[i] for i in keep]
     
     # ============================================================================
     # INTEGRATED PROMPT BUILDING
@@ -0,0 +1,312 @@
+# Filename: BASE/memory/memory_journal.py
+"""
+Append-Only Journal Storage for Memory Tiers
+
+Each journaled tier is stored as two files:
+- <tier>.json     Snapshot of the tier at the last compaction
+- <tier>.journal  Compact JSON-lines log of changes since that snapshot
+
+Every chat turn appends one small record ("add", "pop" or "set") instead of
+re-serializing the whole tier, so a write costs O(entry) not O(tier).
+Records carry a monotonically increasing sequence number, and the snapshot
+stores the sequence number it covers, so replay is idempotent even if the
+process dies half-way through a compaction.
+
+Snapshot format:
+    {"seq": <last applied record>, "entries": [...]}
+Legacy snapshots (a bare JSON list) are still accepted and treated as seq 0.
+Tiers that carry embeddings can store snapshot vectors in a memory-mapped
+sidecar (see vector_store.py); journal records keep their vectors inline.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from BASE.core.logger import Logger
+from BASE.memory.vector_store import load_vector_json, save_vector_json
+
+
+class MemoryJournal:
+    """
+    Journaled persistence for a single list-shaped memory tier
+
+    The owner keeps the live list in memory and mirrors every mutation here.
+    Compaction (snapshot rewrite + journal truncation) runs on a background
+    thread once enough records have accumulated.
+    """
+
+    def __init__(
+        self,
+        snapshot_file: Path,
+        logger: Logger,
+        label: str,
+        compact_threshold: int = 200,
+        vector_dtype: Optional[str] = None
+    ):
+        """
+        Initialize journal for one tier
+
+        Args:
+            snapshot_file: Path to the tier's JSON snapshot
+            logger: Logger instance for all output
+            label: Short tier label used in log lines (e.g. "Tier 1")
+            compact_threshold: Records appended before background compaction
+            vector_dtype: Sidecar dtype for embedded tiers, None for plain JSON
+        """
+        self.snapshot_file = snapshot_file
+        self.journal_file = snapshot_file.with_suffix('.journal')
+        self.logger = logger
+        self.label = label
+        self.compact_threshold = max(1, compact_threshold)
+        self.vector_dtype = vector_dtype
+
+        # _write_lock guards the journal file and sequence counter,
+        # _compact_lock serializes snapshot rewrites
+        self._write_lock = threading.Lock()
+        self._compact_lock = threading.Lock()
+
+        self._seq = 0
+        self._pending_records = 0
+        self._compact_thread: Optional[threading.Thread] = None
+
+    # ========================================================================
+    # LOADING / REPLAY
+    # ========================================================================
+
+    def exists(self) -> bool:
+        """Check whether any persisted state exists for this tier"""
+        return self.snapshot_file.exists() or self.journal_file.exists()
+
+    def load(self) -> List[Dict[str, Any]]:
+        """
+        Load snapshot and replay journal records written after it
+
+        Returns:
+            Reconstructed list of tier entries
+        """
+        entries, snapshot_seq = self._read_snapshot()
+        last_seq = snapshot_seq
+        replayed = 0
+
+        if self.journal_file.exists():
+            # Byte offsets, so a torn tail can be cut off before appending
+            offset = 0
+            good_end = 0
+            tail_needs_newline = False
+
+            with open(self.journal_file, 'rb') as f:
+                for line_no, raw in enumerate(f, 1):
+                    offset += len(raw)
+                    line = raw.strip()
+                    if not line:
+                        continue
+
+                    try:
+                        record = json.loads(line.decode('utf-8'))
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        # A torn final line from a crash mid-append is expected
+                        self.logger.warning(
+                            f"[{self.label}] Skipping unreadable journal line {line_no}"
+                        )
+                        continue
+
+                    good_end = offset
+                    tail_needs_newline = not raw.endswith(b'\n')
+
+                    seq = record.get('s', 0)
+                    if seq <= snapshot_seq:
+                        continue
+
+                    self._apply(entries, record)
+                    last_seq = max(last_seq, seq)
+                    replayed += 1
+
+            self._repair_tail(offset, good_end, tail_needs_newline)
+
+        self._seq = last_seq
+        self._pending_records = replayed
+
+        if replayed:
+            self.logger.memory(f"[{self.label}] Replayed {replayed} journal records")
+
+        return entries
+
+    def _repair_tail(self, size: int, good_end: int, needs_newline: bool):
+        """
+        Drop bytes after the last good record (and terminate that record)
+        so the next append starts on a fresh line instead of being glued
+        onto a torn fragment
+        """
+        if good_end == size and not needs_newline:
+            return
+
+        with self._write_lock:
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(good_end)
+                if needs_newline:
+                    f.seek(good_end)
+                    f.write(b'\n')
+
+        if good_end < size:
+            self.logger.warning(
+                f"[{self.label}] Cut {size - good_end} bytes of torn journal tail"
+            )
+
+    def _read_snapshot(self) -> Tuple[List[Dict[str, Any]], int]:
+        """Read snapshot file, accepting both legacy list and seq-tagged formats"""
+        if not self.snapshot_file.exists():
+            return [], 0
+
+        data = load_vector_json(self.snapshot_file)
+
+        if isinstance(data, list):
+            return data, 0
+
+        return list(data.get('entries', [])), int(data.get('seq', 0))
+
+    @staticmethod
+    def _apply(entries: List[Dict[str, Any]], record: Dict[str, Any]):
+        """Apply a single journal record to the entry list"""
+        op = record.get('op')
+
+        if op == 'add':
+            entries.append(record['entry'])
+        elif op == 'pop':
+            del entries[:record.get('n', 1)]
+        elif op == 'set':
+            index = record.get('i', -1)
+            if 0 <= index < len(entries):
+                entry = entries[index]
+                match = record.get('match') or {}
+                if all(entry.get(k) == v for k, v in match.items()):
+                    entry.update(record.get('fields', {}))
+
+    # ========================================================================
+    # APPENDING
+    # ========================================================================
+
+    def append(self, entry: Dict[str, Any]):
+        """Record a new entry appended to the end of the tier"""
+        self._write_record({'op': 'add', 'entry': entry})
+
+    def remove_oldest(self, count: int):
+        """Record removal of the oldest `count` entries"""
+        if count > 0:
+            self._write_record({'op': 'pop', 'n': count})
+
+    def update(self, index: int, fields: Dict[str, Any], match: Optional[Dict[str, Any]] = None):
+        """
+        Record fields merged into the entry at `index` (e.g. a late embedding)
+
+        Args:
+            index: Position of the entry in the tier
+            fields: Fields to set on the entry
+            match: Fields the entry must still have for replay to apply it
+        """
+        record = {'op': 'set', 'i': index, 'fields': fields}
+        if match:
+            record['match'] = match
+        self._write_record(record)
+
+    def _write_record(self, record: Dict[str, Any]):
+        """Serialize one record as a single compact journal line"""
+        with self._write_lock:
+            self._seq += 1
+            record['s'] = self._seq
+            line = json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+            self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+            self._pending_records += 1
+
+    # ========================================================================
+    # COMPACTION
+    # ========================================================================
+
+    def maybe_compact(self, entries: List[Dict[str, Any]]):
+        """Start a background compaction if enough records have accumulated"""
+        if self._pending_records < self.compact_threshold:
+            return
+
+        if self._compact_thread and self._compact_thread.is_alive():
+            return
+
+        snapshot, seq = self._capture(entries)
+
+        self._compact_thread = threading.Thread(
+            target=self._compact,
+            args=(snapshot, seq),
+            daemon=True,
+            name=f"MemoryJournal_{self.snapshot_file.stem}"
+        )
+        self._compact_thread.start()
+
+    def rewrite(self, entries: List[Dict[str, Any]]):
+        """
+        Synchronously replace the whole tier (bulk edits such as clears
+        and date rollover, which are not expressible as add/pop records)
+        """
+        with self._compact_lock:
+            snapshot, seq = self._capture(entries)
+            self._write_snapshot(snapshot, seq)
+            self._truncate_journal(seq)
+
+    def _capture(self, entries: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """Take a consistent shallow copy of the tier and its sequence number"""
+        with self._write_lock:
+            self._pending_records = 0
+            return [dict(e) for e in entries], self._seq
+
+    def _compact(self, snapshot: List[Dict[str, Any]], seq: int):
+        """Background worker: write snapshot, then drop records it covers"""
+        try:
+            with self._compact_lock:
+                self._write_snapshot(snapshot, seq)
+                self._truncate_journal(seq)
+            self.logger.memory(f"[{self.label}] Journal compacted ({len(snapshot)} entries)")
+        except Exception as e:
+            self.logger.error(f"[{self.label}] Journal compaction failed: {e}")
+
+    def _write_snapshot(self, snapshot: List[Dict[str, Any]], seq: int):
+        """Atomically replace the snapshot file"""
+        if self.vector_dtype:
+            save_vector_json(
+                self.snapshot_file,
+                {'seq': seq, 'entries': snapshot},
+                dtype=self.vector_dtype
+            )
+            return
+
+        self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.snapshot_file.with_suffix('.json.tmp')
+
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'seq': seq, 'entries': snapshot}, f, ensure_ascii=False, indent=2)
+
+        os.replace(tmp_file, self.snapshot_file)
+
+    def _truncate_journal(self, seq: int):
+        """Rewrite the journal keeping only records newer than `seq`"""
+        with self._write_lock:
+            if not self.journal_file.exists():
+                return
+
+            kept = []
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        if json.loads(line).get('s', 0) > seq:
+                            kept.append(line)
+                    except json.JSONDecodeError:
+                        continue
+
+            tmp_file = self.journal_file.with_suffix('.journal.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.writelines(kept)
+
+            os.replace(tmp_file, self.journal_file)
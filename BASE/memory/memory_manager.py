@@ -15,13 +15,27 @@ Key Changes:
 - All logging through injected Logger
 """
 
-import json
-import requests
+import threading
+import numpy as np
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Callable
 
 from BASE.core.logger import Logger
+from BASE.memory.memory_journal import MemoryJournal
+from BASE.memory.vector_store import (
+    load_vector_json, save_vector_json, has_embedding
+)
+from BASE.memory.vector_index import VectorIndex
+from BASE.memory.bm25_index import BM25Index
+from BASE.memory.date_index import DateIndex, ISO_FIELD
+from BASE.memory.ann_index import BaseAnnSearch
+from BASE.memory.embedding_client import EmbeddingClient
+from BASE.memory.embedding_cache import EmbeddingCache, default_cache_path
+from BASE.memory.embedding_worker import EmbeddingWorker
+from BASE.memory.summary_jobs import SummaryJobQueue
+from BASE.memory.rollups import RollupSearch, is_rollup, due_rollups, period_bounds, period_key, WEEKLY
+from BASE.memory.sqlite_store import SQLiteMemoryStore, default_db_path
 
 from personality.controls import KILL_COMMAND
 
@@ -65,6 +79,17 @@ class MemoryManager:
         self.agentname = config.agentname
         self.username = config.username
         
+        # Shared batching client for every embedding this process makes
+        self.embedding_cache = self._open_embedding_cache()
+        self.embedding_client = EmbeddingClient(
+            self.ollama_endpoint,
+            self.embed_model,
+            log_error=logger.error,
+            max_batch_size=config.embed_batch_size,
+            max_batch_bytes=config.embed_batch_max_bytes,
+            cache=self.embedding_cache
+        )
+        
         # Memory limits
         self.short_memory_limit = short_memory_limit
         self.max_context_entries = max_context_entries
@@ -75,12 +100,95 @@ class MemoryManager:
         self.medium_memory_file = self.memory_dir / "medium_memory.json"
         self.long_memory_file = self.memory_dir / "long_memory.json"
         
+        # Embedded tiers keep vectors in memory-mapped .npy sidecars
+        self.vector_dtype = config.memory_vector_dtype
+        
+        # Append-only journals for the per-message tiers (1 and 2)
+        compact_threshold = config.memory_journal_compact_threshold
+        self._short_journal = MemoryJournal(
+            self.short_memory_file, logger, "Tier 1", compact_threshold
+        )
+        self._medium_journal = MemoryJournal(
+            self.medium_memory_file, logger, "Tier 2", compact_threshold,
+            vector_dtype=self.vector_dtype
+        )
+        
+        # Optional SQLite backend (memory.backend = "sqlite"); None means the
+        # JSON snapshot + journal files above are the source of truth
+        self.store: Optional[SQLiteMemoryStore] = None
+        if config.memory_backend == "sqlite":
+            try:
+                self.store = SQLiteMemoryStore(
+                    default_db_path(project_root), logger, vector_dtype=self.vector_dtype
+                )
+                self.logger.memory(f"SQLite memory backend: {self.store.db_path.name}")
+            except Exception as e:
+                self.logger.error(f"SQLite backend unavailable, using JSON files: {e}")
+        
         # Memory storage
         self.short_memory: List[Dict[str, Any]] = []
         self.medium_memory: List[Dict[str, Any]] = []
         self.long_memory: List[Dict[str, Any]] = []
         self.base_knowledge: List[Dict[str, Any]] = []
         
+        # Normalized search matrices for embedded tiers (2-4), kept in sync
+        # incrementally on append and rebuilt after bulk edits
+        self.medium_index = VectorIndex("medium")
+        self.long_index = VectorIndex("long")
+        self.base_index = VectorIndex("base")
+        
+        # BM25 twins of the vector indexes for hybrid search
+        # (memory.search_mode = "hybrid"); built only when that mode is on
+        self.lexical_enabled = config.memory_search_mode == "hybrid"
+        self.medium_lexical = BM25Index("medium")
+        self.long_lexical = BM25Index("long")
+        self.base_lexical = BM25Index("base")
+        
+        # date -> entry ranges over Tiers 1/2 for day-level lookups and
+        # rollover (the SQLite backend answers those with SQL instead)
+        self.short_dates = DateIndex("short")
+        self.medium_dates = DateIndex("medium")
+        
+        # Weekly/monthly rollups narrow Tier 3 search to the relevant days;
+        # long_index and long_lexical hold daily summaries only
+        self.rollups_enabled = config.rollups_enabled
+        self.long_rollups = RollupSearch(
+            self.long_index,
+            min_days=config.rollup_search_min_days,
+            top_months=config.rollup_top_months,
+            top_weeks=config.rollup_top_weeks
+        )
+        self._failed_rollups: set = set()
+        
+        # Optional IVF acceleration for large base knowledge files
+        self.base_ann = BaseAnnSearch(
+            self.base_index,
+            logger,
+            nprobe=config.memory_ann_nprobe,
+            min_chunks=config.memory_ann_min_chunks
+        )
+        
+        # Tier 2 entries are embedded off the chat path; the lock serializes
+        # the worker's index/journal updates, background day archiving and
+        # chat appends with bulk tier edits
+        self._medium_lock = threading.RLock()
+        self.embedding_worker = EmbeddingWorker(
+            self._get_ollama_embeddings,
+            self._on_medium_entry_embedded,
+            logger,
+            batch_size=config.embed_batch_size,
+            retry_max_seconds=config.embed_retry_max_seconds,
+            max_attempts=config.embed_max_attempts
+        )
+        
+        # Past days are summarized off the startup path, a few at a time
+        self.summary_jobs = SummaryJobQueue(
+            self._run_summary_job,
+            logger,
+            max_workers=config.summary_max_concurrency,
+            on_drained=self._queue_due_rollups
+        )
+        
         # Interaction tracking
         self.interaction_count = 0
         self.last_summarization_count = 0
@@ -108,13 +216,80 @@ class MemoryManager:
         except Exception as e:
             self.logger.error(f"Embedding test failed: {e}")
     
+    def _open_embedding_cache(self) -> Optional[EmbeddingCache]:
+        """Open the persistent embedding cache (None if disabled or unavailable)"""
+        if not self.config.embedding_cache_enabled:
+            return None
+        
+        try:
+            cache = EmbeddingCache(
+                default_cache_path(self.project_root),
+                max_bytes=self.config.embedding_cache_max_mb * 1024 * 1024
+            )
+            self.logger.memory(f"Embedding cache ready ({cache.get_stats()['entries']} vectors)")
+            return cache
+        except Exception as e:
+            self.logger.error(f"Embedding cache unavailable, continuing without it: {e}")
+            return None
+    
     def _load_all_memory(self):
         """Load all memory tiers"""
+        if self.store is not None:
+            self._import_json_into_store()
         self._load_short_memory()
         self._load_medium_memory()
         self._load_long_memory()
         self._load_base_memory()
     
+    def _import_json_into_store(self):
+        """One-time copy of existing JSON tiers into a fresh SQLite database"""
+        if any(self.store.tier_count(t) for t in ("short", "medium", "long")):
+            return
+        
+        try:
+            imported = {}
+            if self._short_journal.exists():
+                imported['short'] = self._short_journal.load()
+            if self._medium_journal.exists():
+                imported['medium'] = self._medium_journal.load()
+            if self.long_memory_file.exists():
+                data = load_vector_json(self.long_memory_file)
+                imported['long'] = data if isinstance(data, list) else data.get('entries', [])
+            
+            for tier, entries in imported.items():
+                if entries:
+                    self.store.replace_tier(tier, entries)
+                    self.logger.memory(f"[SQLite] Imported {len(entries)} {tier} entries from JSON")
+        except Exception as e:
+            self.logger.error(f"[SQLite] JSON import failed: {e}")
+    
+    def _reindex_short_memory(self):
+        """Rebuild the Tier 1 date index after a bulk change"""
+        self.short_dates.rebuild(self.short_memory)
+    
+    def _reindex_medium_memory(self):
+        """Rebuild Tier 2 search indexes after a bulk change"""
+        with self._medium_lock:
+            self.medium_index.rebuild(self.medium_memory)
+            self.medium_dates.rebuild(self.medium_memory)
+            if self.lexical_enabled:
+                self.medium_lexical.rebuild(self.medium_memory, lambda e: e.get('content', ''))
+    
+    def _reindex_long_memory(self):
+        """Rebuild Tier 3 search indexes after a bulk change"""
+        dailies = [e for e in self.long_memory if not is_rollup(e)]
+        self.long_index.rebuild(dailies)
+        if self.lexical_enabled:
+            self.long_lexical.rebuild(dailies, lambda e: e.get('summary', ''))
+        self.long_rollups.rebuild(self.long_memory)
+    
+    def _index_long_entry(self, entry: Dict[str, Any]):
+        """Add one new Tier 3 daily summary to the search indexes"""
+        self.long_index.add(entry)
+        if self.lexical_enabled:
+            self.long_lexical.add(entry, entry.get('summary', ''))
+        self.long_rollups.rebuild(self.long_memory)
+    
     def _get_ollama_embedding(self, text: str) -> Optional[List[float]]:
         """
         Get embedding from Ollama API
@@ -125,15 +300,21 @@ class MemoryManager:
         Returns:
             List of floats (embedding vector) or None if failed
         """
-        try:
-            url = f"{self.ollama_endpoint}/api/embeddings"
-            payload = {"model": self.embed_model, "prompt": text}
-            response = requests.post(url, json=payload, timeout=30)
-            response.raise_for_status()
-            return response.json().get("embedding")
-        except Exception as e:
-            self.logger.error(f"Embedding API error: {e}")
-            return None
+        return self.embedding_client.embed_one(text)
+    
+    def _get_ollama_embeddings(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Get embeddings for many texts using batched requests
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            Embeddings aligned with texts (None where embedding failed)
+        """
+        if not texts:
+            return []
+        return self.embedding_client.embed(texts)
     
     # ========================================================================
     # TIER 1: SHORT MEMORY (Recent Messages, Not Embedded)
@@ -142,9 +323,11 @@ class MemoryManager:
     def _load_short_memory(self):
         """Load Tier 1: Short memory (most recent 25, not embedded)"""
         try:
-            if self.short_memory_file.exists():
-                with open(self.short_memory_file, 'r', encoding='utf-8') as f:
-                    self.short_memory = json.load(f)
+            if self.store is not None:
+                self.short_memory = self.store.load_tier("short")
+                self.logger.memory(f"[Tier 1] Loaded {len(self.short_memory)} short memory entries")
+            elif self._short_journal.exists():
+                self.short_memory = self._short_journal.load()
                 self.logger.memory(f"[Tier 1] Loaded {len(self.short_memory)} short memory entries")
             else:
                 self.short_memory = []
@@ -152,35 +335,147 @@ class MemoryManager:
         except Exception as e:
             self.logger.error(f"[Tier 1] Load failed: {e}")
             self.short_memory = []
+        
+        self._reindex_short_memory()
     
     def _save_short_memory(self):
-        """Save Tier 1: Short memory"""
+        """Save Tier 1: Short memory (full rewrite, for bulk edits only)"""
         try:
-            self.memory_dir.mkdir(parents=True, exist_ok=True)
-            with open(self.short_memory_file, 'w', encoding='utf-8') as f:
-                json.dump(self.short_memory, f, ensure_ascii=False, indent=2)
+            if self.store is not None:
+                self.store.replace_tier("short", self.short_memory)
+            else:
+                self._short_journal.rewrite(self.short_memory)
         except Exception as e:
             self.logger.error(f"[Tier 1] Save failed: {e}")
     
+    def _append_short_memory(self, entry: Dict[str, Any]):
+        """Append one entry to Tier 1 and journal it"""
+        self.short_memory.append(entry)
+        self.short_dates.append(entry)
+        try:
+            if self.store is not None:
+                self.store.append("short", [entry])
+                return
+            self._short_journal.append(entry)
+            self._short_journal.maybe_compact(self.short_memory)
+        except Exception as e:
+            self.logger.error(f"[Tier 1] Journal append failed: {e}")
+    
     def _move_to_medium_memory(self):
         """Move oldest entries from short to medium memory when limit exceeded"""
-        while len(self.short_memory) > self.short_memory_limit:
-            oldest_entry = self.short_memory.pop(0)
-            
-            # Generate embedding for the entry
-            content = oldest_entry['content']
-            embedding = self._get_ollama_embedding(content)
-            
-            if embedding:
-                oldest_entry['embedding'] = embedding
+        overflow = len(self.short_memory) - self.short_memory_limit
+        if overflow <= 0:
+            return
+        
+        popped_entries = self.short_memory[:overflow]
+        del self.short_memory[:overflow]
+        self.short_dates.drop_oldest(popped_entries)
+        
+        # Entries land in medium memory un-embedded (durable and lexically
+        # searchable right away); the background worker adds the vectors
+        with self._medium_lock:
+            for oldest_entry in popped_entries:
                 oldest_entry['date'] = self.current_date
                 self.medium_memory.append(oldest_entry)
-                self.logger.memory("Moved entry to medium memory (embedded)")
-            else:
-                self.logger.error("Failed to embed entry, discarding")
+                self.medium_dates.append(oldest_entry)
+                if self.lexical_enabled:
+                    self.medium_lexical.add(oldest_entry, oldest_entry.get('content', ''))
+            
+            try:
+                if self.store is not None:
+                    self.store.move(popped_entries, "medium")
+                else:
+                    self._short_journal.remove_oldest(len(popped_entries))
+                    for entry in popped_entries:
+                        self._medium_journal.append(entry)
+                    
+                    self._short_journal.maybe_compact(self.short_memory)
+                    self._medium_journal.maybe_compact(self.medium_memory)
+            except Exception as e:
+                self.logger.error(f"[Tier 2] Journal append failed: {e}")
         
-        self._save_short_memory()
-        self._save_medium_memory()
+        self.embedding_worker.submit(popped_entries)
+        self.logger.memory(f"Moved {len(popped_entries)} entries to medium memory (embedding queued)")
+    
+    def _on_medium_entry_embedded(self, entry: Dict[str, Any], embedding: List[float]):
+        """Worker callback: attach a finished embedding to its Tier 2 entry"""
+        with self._medium_lock:
+            # Identity lookup: the entry may have been archived or cleared meanwhile
+            position = next(
+                (i for i, e in enumerate(self.medium_memory) if e is entry), None
+            )
+            if position is None:
+                return
+            
+            entry['embedding'] = embedding
+            self.medium_index.add(entry)
+            
+            try:
+                if self.store is not None:
+                    self.store.set_vector(entry, embedding)
+                    return
+                self._medium_journal.update(
+                    position, {'embedding': embedding},
+                    match={'timestamp': entry.get('timestamp')}
+                )
+                self._medium_journal.maybe_compact(self.medium_memory)
+            except Exception as e:
+                self.logger.error(f"[Tier 2] Journal update failed: {e}")
+    
+    # ========================================================================
+    # INDEXED LOOKUPS (SQL with the SQLite backend, DateIndex otherwise)
+    # ========================================================================
+    
+    def get_entries_for_date(self, date: str, tiers: tuple = ("medium", "short")) -> List[Dict[str, Any]]:
+        """
+        Tier 1/2 entries from one day, in conversation order
+        
+        Args:
+            date: YYYY-MM-DD
+            tiers: Tiers to include, in the order they should appear
+        """
+        if self.store is not None:
+            return self.store.entries_for_date(date, tiers)
+        
+        result = []
+        with self._medium_lock:
+            for tier in tiers:
+                tier_list, dates = self._tier_dates(tier)
+                result.extend(dates.entries(tier_list, date))
+        return result
+    
+    def count_entries_by_date(self) -> Dict[str, int]:
+        """Number of Tier 1/2 entries per date"""
+        if self.store is not None:
+            return self.store.count_by_date()
+        
+        with self._medium_lock:
+            counts = self.medium_dates.counts()
+            for d, n in self.short_dates.counts().items():
+                counts[d] = counts.get(d, 0) + n
+        return counts
+    
+    def _tier_dates(self, tier: str):
+        """(tier list, its DateIndex) for Tier 1 or 2"""
+        if tier == "medium":
+            return self.medium_memory, self.medium_dates
+        return self.short_memory, self.short_dates
+    
+    def get_pending_medium_entries(self) -> List[Dict[str, Any]]:
+        """Tier 2 entries still waiting for an embedding (lexical search only)"""
+        return [e for e in self.medium_memory if not has_embedding(e)]
+    
+    def flush_pending_embeddings(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued Tier 2 embeddings are written (True if drained)"""
+        return self.embedding_worker.flush(timeout)
+    
+    def shutdown(self):
+        """
+        Stop background work; un-embedded entries are re-queued and
+        unsummarized days re-submitted on next load
+        """
+        self.embedding_worker.stop()
+        self.summary_jobs.stop()
     
     # ========================================================================
     # TIER 2: MEDIUM MEMORY (Today's Older Messages, Embedded)
@@ -189,9 +484,11 @@ class MemoryManager:
     def _load_medium_memory(self):
         """Load Tier 2: Medium memory (today's older messages, embedded)"""
         try:
-            if self.medium_memory_file.exists():
-                with open(self.medium_memory_file, 'r', encoding='utf-8') as f:
-                    self.medium_memory = json.load(f)
+            if self.store is not None:
+                self.medium_memory = self.store.load_tier("medium")
+                self.logger.memory(f"[Tier 2] Loaded {len(self.medium_memory)} medium memory entries")
+            elif self._medium_journal.exists():
+                self.medium_memory = self._medium_journal.load()
                 self.logger.memory(f"[Tier 2] Loaded {len(self.medium_memory)} medium memory entries")
             else:
                 self.medium_memory = []
@@ -199,13 +496,22 @@ class MemoryManager:
         except Exception as e:
             self.logger.error(f"[Tier 2] Load failed: {e}")
             self.medium_memory = []
+        
+        self._reindex_medium_memory()
+        
+        # Resume embedding anything left pending by the previous session
+        pending = self.get_pending_medium_entries()
+        if pending:
+            self.logger.memory(f"[Tier 2] Re-queued {len(pending)} entries for embedding")
+            self.embedding_worker.submit(pending)
     
     def _save_medium_memory(self):
-        """Save Tier 2: Medium memory"""
+        """Save Tier 2: Medium memory (full rewrite, for bulk edits only)"""
         try:
-            self.memory_dir.mkdir(parents=True, exist_ok=True)
-            with open(self.medium_memory_file, 'w', encoding='utf-8') as f:
-                json.dump(self.medium_memory, f, ensure_ascii=False, indent=2)
+            if self.store is not None:
+                self.store.replace_tier("medium", self.medium_memory)
+            else:
+                self._medium_journal.rewrite(self.medium_memory)
         except Exception as e:
             self.logger.error(f"[Tier 2] Save failed: {e}")
     
@@ -216,9 +522,12 @@ class MemoryManager:
     def _load_long_memory(self):
         """Load Tier 3: Long memory (daily summaries, embedded)"""
         try:
-            if self.long_memory_file.exists():
-                with open(self.long_memory_file, 'r', encoding='utf-8') as f:
-                    self.long_memory = json.load(f)
+            if self.store is not None:
+                self.long_memory = self.store.load_tier("long")
+                self.logger.memory(f"[Tier 3] Loaded {len(self.long_memory)} long memory summaries")
+            elif self.long_memory_file.exists():
+                data = load_vector_json(self.long_memory_file)
+                self.long_memory = data if isinstance(data, list) else data.get('entries', [])
                 self.logger.memory(f"[Tier 3] Loaded {len(self.long_memory)} long memory summaries")
             else:
                 self.long_memory = []
@@ -226,13 +535,16 @@ class MemoryManager:
         except Exception as e:
             self.logger.error(f"[Tier 3] Load failed: {e}")
             self.long_memory = []
+        
+        self._reindex_long_memory()
     
     def _save_long_memory(self):
         """Save Tier 3: Long memory"""
         try:
-            self.memory_dir.mkdir(parents=True, exist_ok=True)
-            with open(self.long_memory_file, 'w', encoding='utf-8') as f:
-                json.dump(self.long_memory, f, ensure_ascii=False, indent=2)
+            if self.store is not None:
+                self.store.replace_tier("long", self.long_memory)
+            else:
+                save_vector_json(self.long_memory_file, self.long_memory, dtype=self.vector_dtype)
         except Exception as e:
             self.logger.error(f"[Tier 3] Save failed: {e}")
     
@@ -243,6 +555,10 @@ class MemoryManager:
     def _load_base_memory(self):
         """Load Tier 4: Base knowledge from external files"""
         self.base_knowledge = []
+        self.base_index.clear()
+        self.base_lexical.clear()
+        self.base_ann.set_segments([])
+        segments = []
         
         try:
             base_dir = self.project_root / "personality" / "base_memory" / "base_memories"
@@ -262,16 +578,16 @@ class MemoryManager:
             
             for json_file in json_files:
                 try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        file_data = json.load(f)
+                    file_data = load_vector_json(json_file)
                     
                     # Extract chunks from various formats
                     chunks = self._extract_chunks_from_file(file_data, json_file.name)
                     
                     file_count = 0
+                    segment_start = len(self.base_knowledge)
                     for chunk in chunks:
                         # Only add chunks with valid embeddings
-                        if chunk.get('embedding') and isinstance(chunk['embedding'], list):
+                        if has_embedding(chunk):
                             self.base_knowledge.append(chunk)
                             file_count += 1
                             
@@ -283,6 +599,7 @@ class MemoryManager:
                                 document_count += 1
                     
                     total_loaded += file_count
+                    segments.append((json_file, segment_start, len(self.base_knowledge)))
                     self.logger.success(f"[Tier 4] Loaded {file_count} chunks from {json_file.name}")
                     
                 except Exception as e:
@@ -291,6 +608,22 @@ class MemoryManager:
             self.logger.success(f"[Tier 4] Total: {total_loaded} chunks from {len(json_files)} files")
             self.logger.memory(f"[Tier 4] Breakdown: {personality_count} personality, {document_count} document")
             
+            self.base_index.rebuild(self.base_knowledge)
+            if self.lexical_enabled:
+                self.base_lexical.rebuild(
+                    self.base_knowledge,
+                    lambda c: c.get('searchable_text') or c.get('text', '')
+                )
+            if self.base_index.skipped:
+                # Row segments no longer line up with files; stay exact
+                self.logger.warning(
+                    f"[Tier 4] {self.base_index.skipped} chunks skipped (embedding dimension mismatch)"
+                )
+            else:
+                self.base_ann.set_segments(segments)
+                if self.base_ann.active:
+                    self.logger.memory(f"[Tier 4] ANN search enabled (nprobe={self.base_ann.nprobe})")
+            
         except Exception as e:
             self.logger.error(f"[Tier 4] Base memory load failed: {e}")
     
@@ -325,9 +658,9 @@ class MemoryManager:
         """Normalize different chunk formats to standard structure"""
         try:
             # Must have embedding
-            embedding = chunk.get('embedding')
-            if not embedding or not isinstance(embedding, list):
+            if not has_embedding(chunk):
                 return None
+            embedding = chunk['embedding']
             
             # Get text content (try different keys)
             text = chunk.get('text') or chunk.get('content')
@@ -373,25 +706,24 @@ class MemoryManager:
         if not self.controls.SAVE_MEMORY or not user_input or (user_input == KILL_COMMAND):
             return None
         
-        # Generate timestamp
-        timestamp = self._format_timestamp()
+        # Generate timestamp (display form plus ISO sort key)
+        now = datetime.now()
+        timestamp = self._format_timestamp(now)
         
         # Create user entry
         user_entry = {
             "role": "user",
             "content": user_input,
             "timestamp": timestamp,
+            ISO_FIELD: self._get_sortable_timestamp(now),
             "date": self.current_date
         }
         
-        # Add to short memory
-        self.short_memory.append(user_entry)
-        
-        # Check for overflow to medium memory
-        self._move_to_medium_memory()
-        
-        # Save to file
-        self._save_short_memory()
+        # Add to short memory (journaled append) and check for overflow to
+        # medium memory, as one step against background day archiving
+        with self._medium_lock:
+            self._append_short_memory(user_entry)
+            self._move_to_medium_memory()
         
         # Log if enabled
         self.logger.memory(
@@ -416,25 +748,24 @@ class MemoryManager:
         if not self.controls.SAVE_MEMORY or not bot_response or (bot_response == KILL_COMMAND):
             return None
         
-        # Generate timestamp
-        timestamp = self._format_timestamp()
+        # Generate timestamp (display form plus ISO sort key)
+        now = datetime.now()
+        timestamp = self._format_timestamp(now)
         
         # Create bot entry
         bot_entry = {
             "role": "assistant",
             "content": bot_response,
             "timestamp": timestamp,
+            ISO_FIELD: self._get_sortable_timestamp(now),
             "date": self.current_date
         }
         
-        # Add to short memory
-        self.short_memory.append(bot_entry)
-        
-        # Check for overflow to medium memory
-        self._move_to_medium_memory()
-        
-        # Save to file
-        self._save_short_memory()
+        # Add to short memory (journaled append) and check for overflow to
+        # medium memory, as one step against background day archiving
+        with self._medium_lock:
+            self._append_short_memory(bot_entry)
+            self._move_to_medium_memory()
         
         # Update interaction count
         self.interaction_count += 1
@@ -448,10 +779,19 @@ class MemoryManager:
         # Return entry for GUI display
         return bot_entry
         
-    def check_and_summarize_previous_day(self):
+    def check_and_summarize_previous_day(self, wait: bool = False) -> List[str]:
         """
         Summarize entries from 2+ days ago, keep yesterday's full detail
         ONLY called on GUI/CLI startup, not on every save_interaction
+        
+        Days are summarized in the background (see SummaryJobQueue); each
+        one's entries leave Tier 1/2 when its summary is archived.
+        
+        Args:
+            wait: Block until the queued days are done
+            
+        Returns:
+            Dates queued for summarization
         """
         current_date = datetime.now().date()
         yesterday = (current_date - timedelta(days=1)).strftime('%Y-%m-%d')
@@ -460,11 +800,8 @@ class MemoryManager:
         self.logger.memory(f"Checking for entries to archive (today: {current_date_str}, yesterday: {yesterday})")
         
         # Collect dates from all active memory
-        dates = set()
-        for e in self.short_memory + self.medium_memory:
-            d = e.get('date', '')
-            if d and d != current_date_str:
-                dates.add(d)
+        counts_by_date = self.count_entries_by_date()
+        dates = {d for d in counts_by_date if d != current_date_str}
         
         # Separate yesterday from older dates
         dates_to_summarize = []
@@ -473,50 +810,83 @@ class MemoryManager:
         for d in sorted(dates):
             if d == yesterday:
                 # Count yesterday's entries but don't summarize yet
-                yesterday_entries = sum(
-                    1 for e in self.short_memory + self.medium_memory 
-                    if e.get('date') == d
-                )
+                yesterday_entries = counts_by_date.get(d, 0)
                 self.logger.memory(f"Keeping {yesterday_entries} entries from yesterday ({d}) in full detail")
             else:
                 dates_to_summarize.append(d)
         
-        # Summarize dates older than yesterday
-        if dates_to_summarize:
-            self.logger.memory(f"Found {len(dates_to_summarize)} older day(s) to summarize: {dates_to_summarize}")
-            
-            for past_date in dates_to_summarize:
-                self.logger.memory(f"Summarizing {past_date}...")
-                from BASE.memory.summarizer import summarize_previous_day
-                success = summarize_previous_day(self, past_date)
-                
-                if success:
-                    self.logger.success(f"Archived {past_date} to long-term")
-            
-            # Remove ONLY the summarized entries (2+ days old)
-            orig_medium = len(self.medium_memory)
-            self.medium_memory = [
-                e for e in self.medium_memory 
-                if e.get('date') in [current_date_str, yesterday]
-            ]
-            removed_medium = orig_medium - len(self.medium_memory)
-            
-            orig_short = len(self.short_memory)
-            self.short_memory = [
-                e for e in self.short_memory 
-                if e.get('date') in [current_date_str, yesterday]
-            ]
-            removed_short = orig_short - len(self.short_memory)
-            
-            if removed_medium or removed_short:
-                self.logger.memory(f"Removed {removed_medium + removed_short} entries from 2+ days ago")
+        # Update current date tracker
+        self.current_date = current_date_str
+        
+        if not dates_to_summarize:
+            self.logger.memory("No entries older than yesterday found")
+            self._queue_due_rollups()
+            return []
+        
+        # A day whose summary is already in long memory was interrupted
+        # between archiving and pruning; finish the prune instead
+        archived = {
+            e.get('date') for e in self.long_memory
+            if e.get('metadata', {}).get('archived_from') == 'previous_day'
+        }
+        for past_date in [d for d in dates_to_summarize if d in archived]:
+            self.logger.memory(f"{past_date} already archived, removing its entries")
+            self._remove_date_entries(past_date)
+            dates_to_summarize.remove(past_date)
+        
+        queued = self.summary_jobs.submit(dates_to_summarize)
+        if not queued:
+            self._queue_due_rollups()
+        else:
+            self.logger.memory(
+                f"Summarizing {len(queued)} older day(s) in background "
+                f"(up to {self.summary_jobs.max_workers} at once): {queued}"
+            )
+        
+        if wait:
+            self.summary_jobs.wait()
+        
+        return queued
+    
+    def _run_summary_job(self, key: str) -> bool:
+        """SummaryJobQueue callback: one past day, or one '<level>:<period>' rollup"""
+        if ":" in key:
+            level, period = key.split(":", 1)
+            try:
+                if self._build_rollup(level, period):
+                    return True
+            except Exception as e:
+                self.logger.error(f"[Tier 3] Rollup {key} failed: {e}")
+            # Not re-queued this session (on_drained would otherwise resubmit it)
+            self._failed_rollups.add(key)
+            return False
+        
+        from BASE.memory.summarizer import summarize_previous_day
+        self.logger.memory(f"Summarizing {key}...")
+        return summarize_previous_day(self, key)
+    
+    def _remove_date_entries(self, date: str):
+        """Drop one day's entries from Tiers 1/2 and persist (index-sliced)"""
+        with self._medium_lock:
+            removed = 0
+            if self.medium_dates.count(date):
+                keep = [d for d in self.medium_dates.dates() if d != date]
+                orig = len(self.medium_memory)
+                self.medium_memory = self.medium_dates.select(self.medium_memory, keep)
+                removed += orig - len(self.medium_memory)
+                self._reindex_medium_memory()
                 self._save_medium_memory()
+            
+            if self.short_dates.count(date):
+                keep = [d for d in self.short_dates.dates() if d != date]
+                orig = len(self.short_memory)
+                self.short_memory = self.short_dates.select(self.short_memory, keep)
+                removed += orig - len(self.short_memory)
+                self._reindex_short_memory()
                 self._save_short_memory()
-        else:
-            self.logger.memory("No entries older than yesterday found")
         
-        # Update current date tracker
-        self.current_date = current_date_str
+        if removed:
+            self.logger.memory(f"Removed {removed} entries from {date}")
     
     def archive_current_day(self, summary: str):
         """
@@ -525,34 +895,42 @@ class MemoryManager:
         Args:
             summary: Summary text for today's conversation
         """
-        if not self.short_memory and not self.medium_memory:
-            return
+        with self._medium_lock:
+            if not self.short_memory and not self.medium_memory:
+                return
         
         summary_entry = {
             'summary': summary,
             'date': self.current_date,
             'timestamp': self._format_timestamp(),
-            'entry_count': len(self.short_memory) + len(self.medium_memory),
             'metadata': {
                 'archived_from': 'short_and_medium',
                 'entry_type': 'daily_summary'
             }
         }
         
-        # Generate embedding
+        # Generate embedding (outside the lock; it is a network call)
         embedding = self._get_ollama_embedding(summary)
         if embedding:
             summary_entry['embedding'] = embedding
         
-        # Add to long memory
-        self.long_memory.append(summary_entry)
-        self._save_long_memory()
-        
-        # Clear today's memories
-        self.short_memory = []
-        self.medium_memory = []
-        self._save_short_memory()
-        self._save_medium_memory()
+        # Archive and clear in one step, so background embedding updates and
+        # day jobs never land on a half-archived day
+        with self._medium_lock:
+            summary_entry['entry_count'] = len(self.short_memory) + len(self.medium_memory)
+            
+            # Add to long memory
+            self.long_memory.append(summary_entry)
+            self._index_long_entry(summary_entry)
+            self._save_long_memory()
+            
+            # Clear today's memories
+            self.short_memory = []
+            self.medium_memory = []
+            self._reindex_medium_memory()
+            self._reindex_short_memory()
+            self._save_short_memory()
+            self._save_medium_memory()
         
         self.last_summarization_count = self.interaction_count
         self.logger.success("Current day archived to long memory")
@@ -589,14 +967,105 @@ class MemoryManager:
             }
         }
         
-        # Add to long memory
-        self.long_memory.append(archive_entry)
-        
-        # Save to file
-        self._save_long_memory()
+        # Add to long memory and drop the day's raw entries together, so
+        # concurrent day jobs and chat appends never see a half-archived day
+        with self._medium_lock:
+            self.long_memory.append(archive_entry)
+            self._index_long_entry(archive_entry)
+            self._save_long_memory()
+            self._remove_date_entries(date)
         
         self.logger.success(f"Archived summary for {date} to long-term memory")
     
+    # ========================================================================
+    # TIER 3 ROLLUPS (Weekly / Monthly)
+    # ========================================================================
+    
+    def _queue_due_rollups(self):
+        """Queue rollups for finished weeks/months with new or changed dailies"""
+        if not self.rollups_enabled:
+            return
+        
+        yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+        with self._medium_lock:
+            long_memory = list(self.long_memory)
+        
+        # Days still in Tier 1/2 (not yet summarized) hold their periods back
+        due = due_rollups(long_memory, yesterday, list(self.count_entries_by_date()))
+        keys = [f"{level}:{period}" for level, period, _ in due]
+        keys = [k for k in keys if k not in self._failed_rollups]
+        
+        queued = self.summary_jobs.submit(keys)
+        if queued:
+            self.logger.memory(f"[Tier 3] Building {len(queued)} rollup(s) in background: {queued}")
+    
+    def _build_rollup(self, level: str, period: str) -> bool:
+        """Summarize one week's/month's daily summaries and archive the rollup"""
+        with self._medium_lock:
+            dailies = sorted(
+                (e for e in self.long_memory
+                 if not is_rollup(e) and e.get('date') and period_key(level, e['date']) == period),
+                key=lambda e: e.get('date', '')
+            )
+        if not dailies:
+            return False
+        
+        start, end = period_bounds(level, period)
+        if len(dailies) == 1:
+            # Nothing to condense; reuse the day's text and vector
+            summary = dailies[0].get('summary', '')
+            if has_embedding(dailies[0]):
+                # Copy: the row may be a view into a memmapped sidecar
+                embedding = np.asarray(dailies[0]['embedding'], dtype=np.float32).tolist()
+            else:
+                embedding = self._get_ollama_embedding(summary)
+        else:
+            from BASE.memory.summarizer import summarize_period
+            span = f"the {'week' if level == WEEKLY else 'month'} of {start} to {end}"
+            summary = summarize_period(self, span, dailies)
+            embedding = self._get_ollama_embedding(summary) if summary else None
+        
+        if not summary or embedding is None or not len(embedding):
+            return False
+        
+        rollup_entry = {
+            'summary': summary,
+            'date': start,
+            'period': period,
+            'timestamp': self._format_timestamp(),
+            'entry_count': sum(e.get('entry_count', 0) for e in dailies),
+            'embedding': embedding,
+            'metadata': {
+                'archived_from': 'daily_summaries',
+                'entry_type': level,
+                'period_end': end,
+                'source_dates': [e.get('date', '') for e in dailies]
+            }
+        }
+        
+        # Replace any stale rollup of the same period
+        with self._medium_lock:
+            self.long_memory = [
+                e for e in self.long_memory
+                if not (is_rollup(e) and e['metadata']['entry_type'] == level and e.get('period') == period)
+            ]
+            self.long_memory.append(rollup_entry)
+            self.long_rollups.rebuild(self.long_memory)
+            self._save_long_memory()
+        
+        self.logger.success(f"[Tier 3] Rolled up {period} ({len(dailies)} days)")
+        return True
+    
+    def get_recent_daily_summaries(self, count: int) -> List[Dict[str, Any]]:
+        """Newest daily Tier 3 summaries (rollups skipped), oldest first"""
+        recent = []
+        for entry in reversed(self.long_memory):
+            if len(recent) >= count:
+                break
+            if not is_rollup(entry):
+                recent.append(entry)
+        return recent[::-1]
+    
     # ========================================================================
     # UTILITY METHODS
     # ========================================================================
@@ -619,12 +1088,16 @@ class MemoryManager:
     
     def clear_memory(self):
         """Clear personal memory (Tiers 1-3), preserve base knowledge (Tier 4)"""
-        self.short_memory = []
-        self.medium_memory = []
-        self.long_memory = []
-        self._save_short_memory()
-        self._save_medium_memory()
-        self._save_long_memory()
+        with self._medium_lock:
+            self.short_memory = []
+            self.medium_memory = []
+            self.long_memory = []
+            self._reindex_short_memory()
+            self._reindex_medium_memory()
+            self._reindex_long_memory()
+            self._save_short_memory()
+            self._save_medium_memory()
+            self._save_long_memory()
         self.interaction_count = 0
         self.last_summarization_count = 0
         self.logger.success("Personal memory cleared (base knowledge preserved)")
@@ -637,10 +1110,13 @@ class MemoryManager:
             True if successful, False otherwise
         """
         try:
-            self.short_memory = []
-            self.medium_memory = []
-            self._save_short_memory()
-            self._save_medium_memory()
+            with self._medium_lock:
+                self.short_memory = []
+                self.medium_memory = []
+                self._reindex_medium_memory()
+                self._reindex_short_memory()
+                self._save_short_memory()
+                self._save_medium_memory()
             self.logger.success("Today's memory cleared")
             return True
         except Exception as e:
@@ -706,6 +1182,9 @@ class MemoryManager:
             'base_knowledge_chunks': len(self.base_knowledge),
             'base_personality_chunks': personality_count,
             'base_document_chunks': document_count,
+            'pending_embeddings': self.embedding_worker.pending_count(),
+            'pending_summaries': self.summary_jobs.pending(),
+            'long_memory_rollups': self.long_rollups.get_stats(),
             'total_interactions': self.interaction_count,
             'interactions_since_summary': self.interaction_count - self.last_summarization_count,
             'current_date': self.current_date
@@ -720,14 +1199,9 @@ class MemoryManager:
         """
         yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
         
-        yesterday_count = sum(
-            1 for e in self.short_memory + self.medium_memory 
-            if e.get('date') == yesterday
-        )
-        today_count = sum(
-            1 for e in self.short_memory + self.medium_memory 
-            if e.get('date') == self.current_date
-        )
+        counts_by_date = self.count_entries_by_date()
+        yesterday_count = counts_by_date.get(yesterday, 0)
+        today_count = counts_by_date.get(self.current_date, 0)
         
         return {
             'today_count': today_count,
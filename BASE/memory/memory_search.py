@@ -5,10 +5,103 @@ Memory search now considers both user input AND recent thoughts for relevance
 """
 
 import numpy as np
-from typing import List, Dict, Optional
-from functools import lru_cache
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Tuple, Union
 from pathlib import Path
-import json
+
+from BASE.memory.vector_store import load_vector_json, has_embedding
+from BASE.memory.vector_index import VectorIndex
+from BASE.memory.bm25_index import tokenize
+from BASE.memory.diversify import diversify_hits, drop_near_duplicates, similarity_matrix
+from BASE.memory.query_cache import QueryEmbeddingCache
+
+
+def _tokens(text: str) -> set:
+    """Lowercased word set for lexical matching"""
+    return set(tokenize(text))
+
+
+# Line labels used by personality example files, old and new formats
+_SITUATION_LABELS = ('SITUATION:', 'CONTEXT:')
+_REPLY_LABELS = ('INTERNAL COGNITION:', 'THOUGHT:', 'RESPONSE:', 'OUTPUT:')
+
+
+def parse_example_fields(chunk: Dict) -> Tuple[str, str]:
+    """
+    (situation, reply) of a personality example chunk
+    
+    Prefers the fields embed_personality.py stores alongside the text,
+    then its metadata, then the labelled lines of the text itself.
+    """
+    metadata = chunk.get('metadata', {})
+    situation = chunk.get('situation') or metadata.get('context', '')
+    reply = chunk.get('reply') or metadata.get('response', '')
+    if situation and reply:
+        return situation.strip(), reply.strip()
+    
+    for line in chunk.get('text', '').split('\n'):
+        if not situation:
+            for label in _SITUATION_LABELS:
+                if label in line:
+                    situation = line.split(label, 1)[1]
+                    break
+        if not reply:
+            for label in _REPLY_LABELS:
+                if label in line:
+                    reply = line.split(label, 1)[1]
+                    break
+    
+    return situation.strip(), reply.strip()
+
+
+# ============================================================================
+# SINGLE-PASS RETRIEVAL TYPES
+# ============================================================================
+
+RETRIEVAL_TIERS = ("medium", "long", "base")
+DEFAULT_K_PER_TIER = {'medium': 3, 'long': 2, 'base': 3}
+DEFAULT_MIN_SIMILARITY = {'base': 0.4}
+
+
+@dataclass
+class QuerySpec:
+    """What one turn is searching for"""
+    user_input: str = ""
+    recent_thoughts: List[str] = field(default_factory=list)
+    use_embedding_combination: bool = True
+    mode: Optional[str] = None  # "vector" / "hybrid" (default: memory.search_mode)
+    
+    def key(self) -> Tuple:
+        return (
+            self.user_input, tuple(self.recent_thoughts or ()),
+            self.use_embedding_combination, self.mode
+        )
+
+
+@dataclass
+class RetrievalResult:
+    """Per-tier results of one MemorySearch.retrieve() pass"""
+    spec: QuerySpec
+    query_embedding: Optional[np.ndarray] = None
+    embedded: bool = False  # False if every tier was answered lexically
+    medium: List[Dict] = field(default_factory=list)
+    long: List[Dict] = field(default_factory=list)
+    base: List[Dict] = field(default_factory=list)
+    k_per_tier: Dict[str, int] = field(default_factory=dict)
+    min_similarity: Dict[str, float] = field(default_factory=dict)
+    memory_version: Tuple = ()
+    
+    def tier(self, name: str) -> List[Dict]:
+        return getattr(self, name)
+    
+    def covers(self, tiers, k_per_tier: Dict[str, int], min_similarity: Dict[str, float]) -> bool:
+        """True if this result already answers the request"""
+        return all(
+            name in self.k_per_tier
+            and k_per_tier[name] <= self.k_per_tier[name]
+            and min_similarity.get(name, 0.0) == self.min_similarity.get(name, 0.0)
+            for name in tiers
+        )
 
 
 class MemorySearch:
@@ -17,14 +110,36 @@ class MemorySearch:
     def __init__(self, memory_manager):
         self.memory_manager = memory_manager
         
-        # Embedding caches
-        self._embedding_norms_cache = {}
-        self._embeddings_cache = {}
-        
         # Two-stage personality storage
         self._thought_examples = []
         self._response_examples = []
         
+        config = memory_manager.config
+        
+        # Query embedding LRU (batch-aware, so misses can be fetched together)
+        self._query_cache = QueryEmbeddingCache(
+            max_entries=config.query_cache_max_entries,
+            max_bytes=int(config.query_cache_max_mb * 1024 * 1024),
+            failure_ttl=config.query_cache_failure_ttl
+        )
+        
+        # Hybrid (BM25 + vector) retrieval settings
+        self.search_mode = config.memory_search_mode
+        self.rrf_k = config.hybrid_rrf_k
+        self.lexical_skip_score = config.hybrid_lexical_skip_score
+        self.search_stats = {'hybrid_queries': 0, 'embedding_skipped': 0}
+        
+        # Near-duplicate suppression / MMR over over-fetched candidates
+        self.dedup_threshold = config.memory_dedup_threshold
+        self.mmr_lambda = config.memory_mmr_lambda if config.memory_mmr_enabled else None
+        
+        # Result of the current turn's retrieve() pass, reused by constructors
+        self._turn_retrieval: Optional[RetrievalResult] = None
+        
+        # Normalized example matrices (tier indexes live on memory_manager)
+        self._thought_index = VectorIndex("thought_examples")
+        self._response_index = VectorIndex("response_examples")
+        
         # Load personality examples on initialization
         self._load_personality_examples()
     
@@ -105,22 +220,26 @@ class MemorySearch:
         embeddings_to_combine = []
         weights = []
         
+        has_user_input = bool(user_input and user_input.strip())
+        thoughts = [
+            t for t in (recent_thoughts or [])[-5:]  # Last 5 thoughts
+            if t and len(t.strip()) > 10
+        ]
+        
+        # One batched request covers user input and all uncached thoughts
+        texts = ([user_input] if has_user_input else []) + thoughts
+        embedded = self._get_query_embeddings(texts)
+        
         # Get user input embedding
-        if user_input and user_input.strip():
-            user_embedding = self._get_query_embedding(user_input)
+        if has_user_input:
+            user_embedding = embedded.pop(0)
             if user_embedding is not None:
                 embeddings_to_combine.append(user_embedding)
                 weights.append(weight_user)
         
         # Get thought embeddings (average recent thoughts)
-        if recent_thoughts:
-            thought_embeddings = []
-            
-            for thought in recent_thoughts[-5:]:  # Last 5 thoughts
-                if thought and len(thought.strip()) > 10:
-                    thought_emb = self._get_query_embedding(thought)
-                    if thought_emb is not None:
-                        thought_embeddings.append(thought_emb)
+        if thoughts:
+            thought_embeddings = [e for e in embedded if e is not None]
             
             if thought_embeddings:
                 # Average all thought embeddings into one
@@ -147,6 +266,142 @@ class MemorySearch:
         
         return combined_embedding
     
+    # ========================================================================
+    # SINGLE-PASS MULTI-TIER RETRIEVAL
+    # ========================================================================
+    
+    def retrieve(
+        self,
+        query_spec: Union[QuerySpec, str],
+        tiers: Tuple[str, ...] = RETRIEVAL_TIERS,
+        k_per_tier: Optional[Dict[str, int]] = None,
+        min_similarity: Optional[Dict[str, float]] = None
+    ) -> RetrievalResult:
+        """
+        Search several tiers with one query embedding
+        
+        The embedding is computed at most once (and only if some tier
+        needs it; hybrid lookups answered by BM25 skip it). The result is
+        kept as the current turn's retrieval: asking again with the same
+        spec while memory is unchanged returns it without searching.
+        
+        Args:
+            query_spec: QuerySpec, or a plain query string (embedded as-is)
+            tiers: Any of "medium", "long", "base"
+            k_per_tier: Results per tier (default: DEFAULT_K_PER_TIER)
+            min_similarity: Per-tier similarity floor (default: base 0.4)
+        
+        Returns:
+            RetrievalResult with one result list per requested tier
+        """
+        if isinstance(query_spec, str):
+            query_spec = QuerySpec(user_input=query_spec, use_embedding_combination=False)
+        
+        unknown = [t for t in tiers if t not in RETRIEVAL_TIERS]
+        if unknown:
+            raise ValueError(f"Unknown memory tiers: {unknown}")
+        
+        k_per_tier = {t: (k_per_tier or {}).get(t, DEFAULT_K_PER_TIER[t]) for t in tiers}
+        floors = dict(DEFAULT_MIN_SIMILARITY if min_similarity is None else min_similarity)
+        version = self._memory_version()
+        
+        cached = self._turn_retrieval
+        if (cached is not None and cached.spec.key() == query_spec.key()
+                and cached.memory_version == version
+                and cached.covers(tiers, k_per_tier, floors)):
+            return self._slice_retrieval(cached, tiers, k_per_tier)
+        
+        result = RetrievalResult(
+            spec=query_spec,
+            k_per_tier=k_per_tier,
+            min_similarity={t: floors.get(t, 0.0) for t in tiers},
+            memory_version=version
+        )
+        
+        def embed():
+            if not result.embedded:
+                result.query_embedding = self._resolve_query_embedding(
+                    query_spec.user_input,
+                    query_spec.recent_thoughts,
+                    query_spec.use_embedding_combination
+                )
+                result.embedded = True
+            return result.query_embedding
+        
+        if "medium" in tiers:
+            result.medium = self.search_medium_memory_combined(
+                user_input=query_spec.user_input,
+                recent_thoughts=query_spec.recent_thoughts,
+                k=k_per_tier["medium"],
+                use_embedding_combination=query_spec.use_embedding_combination,
+                mode=query_spec.mode,
+                embed=embed
+            )
+        
+        if "long" in tiers:
+            result.long = self.search_long_memory_combined(
+                user_input=query_spec.user_input,
+                recent_thoughts=query_spec.recent_thoughts,
+                k=k_per_tier["long"],
+                use_embedding_combination=query_spec.use_embedding_combination,
+                mode=query_spec.mode,
+                embed=embed
+            )
+        
+        if "base" in tiers:
+            result.base = self.search_base_knowledge_combined(
+                user_input=query_spec.user_input,
+                recent_thoughts=query_spec.recent_thoughts,
+                k=k_per_tier["base"],
+                min_similarity=result.min_similarity["base"],
+                use_embedding_combination=query_spec.use_embedding_combination,
+                mode=query_spec.mode,
+                embed=embed
+            )
+        
+        self._turn_retrieval = result
+        return result
+    
+    def get_turn_retrieval(self, user_input: Optional[str] = None) -> Optional[RetrievalResult]:
+        """
+        The current turn's retrieval, if any (and, when user_input is
+        given, only if it was made for that input)
+        """
+        result = self._turn_retrieval
+        if result is None or result.memory_version != self._memory_version():
+            return None
+        if user_input is not None and result.spec.user_input != user_input:
+            return None
+        return result
+    
+    def begin_turn(self):
+        """Forget the previous turn's retrieval"""
+        self._turn_retrieval = None
+    
+    def _memory_version(self) -> Tuple:
+        """Cheap fingerprint of the searchable tiers; changes when they do"""
+        mm = self.memory_manager
+        return (
+            id(mm.medium_memory), len(mm.medium_memory), len(mm.medium_index),
+            id(mm.long_memory), len(mm.long_memory), len(mm.long_index),
+            len(mm.base_index)
+        )
+    
+    @staticmethod
+    def _slice_retrieval(result: RetrievalResult, tiers, k_per_tier: Dict[str, int]) -> RetrievalResult:
+        """View of a cached result trimmed to the requested tiers and k"""
+        sliced = RetrievalResult(
+            spec=result.spec,
+            query_embedding=result.query_embedding,
+            embedded=result.embedded,
+            k_per_tier=k_per_tier,
+            min_similarity={t: result.min_similarity.get(t, 0.0) for t in tiers},
+            memory_version=result.memory_version
+        )
+        for name in tiers:
+            setattr(sliced, name, result.tier(name)[:k_per_tier[name]])
+        return sliced
+    
     # ========================================================================
     # ENHANCED: MEMORY SEARCH WITH COMBINED CONTEXT
     # ========================================================================
@@ -157,7 +412,9 @@ class MemorySearch:
         recent_thoughts: List[str] = None,
         k: int = 5,
         min_similarity: float = 0.3,
-        use_embedding_combination: bool = True
+        use_embedding_combination: bool = True,
+        mode: Optional[str] = None,
+        embed=None
     ) -> List[Dict]:
         """Search base knowledge using combined user input + thought context"""
         
@@ -169,67 +426,33 @@ class MemorySearch:
                 f"thoughts={len(recent_thoughts)} items, "
                 f"method={'embedding' if use_embedding_combination else 'text'}"
             )
-        # Build query embedding based on method
-        if use_embedding_combination:
-            query_embedding = self.build_combined_embedding(
-                user_input=user_input,
-                recent_thoughts=recent_thoughts,
-                weight_user=0.6,
-                weight_thoughts=0.4
+        # Build query embedding based on method (retrieve() passes a shared one)
+        embed = embed or (lambda: self._resolve_query_embedding(
+            user_input, recent_thoughts, use_embedding_combination
+        ))
+        
+        # Exact scan unless a large file has an offline-built IVF index
+        vector_search = lambda q, n: self.memory_manager.base_ann.search(q, n, min_similarity)
+        
+        depth = self._candidate_k(k)
+        if self._use_hybrid(mode):
+            hits = self._hybrid_search(
+                self.memory_manager.base_lexical, vector_search, embed,
+                self._lexical_query(user_input, recent_thoughts), depth
             )
         else:
-            combined_query = self.build_combined_query(
-                user_input=user_input,
-                recent_thoughts=recent_thoughts,
-                weight_user=0.6,
-                weight_thoughts=0.4
-            )
-            query_embedding = self._get_query_embedding(combined_query)
-        
-        if query_embedding is None:
-            return []
-        
-        chunks = self.memory_manager.base_knowledge
-        
-        if not chunks:
-            return []
-        
-        embeddings = []
-        valid_chunks = []
-        
-        for chunk in chunks:
-            if 'embedding' in chunk and chunk['embedding']:
-                embeddings.append(np.array(chunk['embedding'], dtype=np.float32))
-                valid_chunks.append(chunk)
-        
-        if not embeddings:
-            return []
-        
-        embeddings_matrix = np.vstack(embeddings)
-        document_norms = self._precompute_norms(embeddings)
-        similarities = self._vectorized_cosine_similarity(
-            query_embedding,
-            embeddings_matrix,
-            document_norms
-        )
-        
-        # Filter by minimum similarity
-        valid_indices = np.where(similarities >= min_similarity)[0]
-        
-        if len(valid_indices) == 0:
-            return []
-        
-        valid_similarities = similarities[valid_indices]
-        top_k_local = self._top_k_argpartition(valid_similarities, min(k, len(valid_similarities)))
-        top_k_indices = valid_indices[top_k_local]
+            query_embedding = embed()
+            if query_embedding is None:
+                return []
+            hits = vector_search(query_embedding, depth)
+        hits = self._diversify(hits, k, lambda chunk: chunk.get('text', ''))
         
         results = []
-        for idx in top_k_indices:
-            chunk = valid_chunks[idx]
+        for chunk, similarity in hits:
             results.append({
                 'text': chunk.get('text', ''),
                 'metadata': chunk.get('metadata', {}),
-                'similarity': float(similarities[idx]),
+                'similarity': similarity,
                 'content_types': chunk.get('metadata', {}).get('content_types', [])
             })
         
@@ -240,7 +463,9 @@ class MemorySearch:
         user_input: str = "",
         recent_thoughts: List[str] = None,
         k: int = 5,
-        use_embedding_combination: bool = True
+        use_embedding_combination: bool = True,
+        mode: Optional[str] = None,
+        embed=None
     ) -> List[Dict]:
         """
         Search long-term memory using combined context
@@ -250,62 +475,38 @@ class MemorySearch:
             recent_thoughts: List of recent thought strings
             k: Number of results to return
             use_embedding_combination: Use weighted embedding vs text concatenation
+            mode: "vector" or "hybrid" (default: memory.search_mode)
+            embed: Shared query embedding callable (see retrieve())
         
         Returns:
             List of relevant summaries with similarity scores
         """
-        if use_embedding_combination:
-            query_embedding = self.build_combined_embedding(
-                user_input=user_input,
-                recent_thoughts=recent_thoughts,
-                weight_user=0.6,
-                weight_thoughts=0.4
+        embed = embed or (lambda: self._resolve_query_embedding(
+            user_input, recent_thoughts, use_embedding_combination
+        ))
+        
+        # Coarse-to-fine: best months/weeks first, then only their days
+        vector_search = self.memory_manager.long_rollups.search
+        
+        depth = self._candidate_k(k)
+        if self._use_hybrid(mode):
+            hits = self._hybrid_search(
+                self.memory_manager.long_lexical, vector_search, embed,
+                self._lexical_query(user_input, recent_thoughts), depth
             )
         else:
-            combined_query = self.build_combined_query(
-                user_input=user_input,
-                recent_thoughts=recent_thoughts,
-                weight_user=0.6,
-                weight_thoughts=0.4
-            )
-            query_embedding = self._get_query_embedding(combined_query)
-        
-        if query_embedding is None:
-            return []
-        
-        summaries = self.memory_manager.long_memory
-        
-        if not summaries:
-            return []
-        
-        embeddings = []
-        valid_summaries = []
-        
-        for summary in summaries:
-            if 'embedding' in summary and summary['embedding']:
-                embeddings.append(np.array(summary['embedding'], dtype=np.float32))
-                valid_summaries.append(summary)
-        
-        if not embeddings:
-            return []
-        
-        embeddings_matrix = np.vstack(embeddings)
-        document_norms = self._precompute_norms(embeddings)
-        similarities = self._vectorized_cosine_similarity(
-            query_embedding,
-            embeddings_matrix,
-            document_norms
-        )
-        
-        top_k_indices = self._top_k_argpartition(similarities, k)
+            query_embedding = embed()
+            if query_embedding is None:
+                return []
+            hits = vector_search(query_embedding, depth)
+        hits = self._diversify(hits, k, lambda summary: summary.get('summary', ''))
         
         results = []
-        for idx in top_k_indices:
-            summary = valid_summaries[idx]
+        for summary, similarity in hits:
             results.append({
                 'date': summary.get('date', ''),
                 'summary': summary.get('summary', ''),
-                'similarity': float(similarities[idx])
+                'similarity': similarity
             })
         
         return results
@@ -315,7 +516,9 @@ class MemorySearch:
         user_input: str = "",
         recent_thoughts: List[str] = None,
         k: int = 3,
-        use_embedding_combination: bool = True
+        use_embedding_combination: bool = True,
+        mode: Optional[str] = None,
+        embed=None
     ) -> List[Dict]:
         """
         Search medium-term memory using combined context
@@ -325,66 +528,232 @@ class MemorySearch:
             recent_thoughts: List of recent thought strings
             k: Number of results to return
             use_embedding_combination: Use weighted embedding vs text concatenation
+            mode: "vector" or "hybrid" (default: memory.search_mode)
+            embed: Shared query embedding callable (see retrieve())
         
         Returns:
             List of relevant messages with similarity scores
         """
-        if use_embedding_combination:
-            query_embedding = self.build_combined_embedding(
-                user_input=user_input,
-                recent_thoughts=recent_thoughts,
-                weight_user=0.6,
-                weight_thoughts=0.4
+        embed = embed or (lambda: self._resolve_query_embedding(
+            user_input, recent_thoughts, use_embedding_combination
+        ))
+        
+        depth = self._candidate_k(k)
+        if self._use_hybrid(mode):
+            # BM25 already covers entries still waiting for an embedding
+            hits = self._hybrid_search(
+                self.memory_manager.medium_lexical, self.memory_manager.medium_index.search, embed,
+                self._lexical_query(user_input, recent_thoughts), depth
             )
+            pending = []
         else:
-            combined_query = self.build_combined_query(
+            query_embedding = embed()
+            hits = []
+            if query_embedding is not None:
+                hits = self.memory_manager.medium_index.search(query_embedding, depth)
+            pending = self.memory_manager.get_pending_medium_entries()
+        
+        # Entries still queued for embedding are matched lexically
+        if pending:
+            query_text = " ".join([user_input or ""] + (recent_thoughts or [])[-5:])
+            if self.memory_manager.store is not None:
+                lexical = self._fts_search(query_text, pending, depth)
+            else:
+                lexical = self._lexical_search(query_text, pending, depth)
+            hits = sorted(
+                hits + lexical,
+                key=lambda hit: hit[1],
+                reverse=True
+            )[:depth]
+        hits = self._diversify(hits, k, lambda msg: msg.get('content', ''))
+        
+        results = []
+        for msg, similarity in hits:
+            results.append({
+                'role': msg.get('role', ''),
+                'content': msg.get('content', ''),
+                'timestamp': msg.get('timestamp', ''),
+                'similarity': similarity
+            })
+        
+        return results
+    
+    def _fts_search(self, query: str, entries: List[Dict], k: int) -> List:
+        """SQLite FTS5 version of _lexical_search (bm25 squashed into 0-1)"""
+        by_rowid = {e.get('_rowid'): e for e in entries}
+        matches = self.memory_manager.store.search_text(
+            query, tiers=("medium",), k=k, unembedded_only=True
+        )
+        return [
+            (by_rowid[rowid], score / (score + 1.0))
+            for rowid, score in matches if rowid in by_rowid
+        ]
+    
+    def _lexical_search(self, query: str, entries: List[Dict], k: int, min_score: float = 0.2) -> List:
+        """
+        Word-overlap fallback for un-embedded entries
+        
+        Scores are set cosine (|q & d| / sqrt(|q| * |d|)), which lands in
+        roughly the same range as embedding similarity.
+        """
+        query_tokens = _tokens(query)
+        if not query_tokens:
+            return []
+        
+        scored = []
+        for entry in entries:
+            entry_tokens = _tokens(entry.get('content', ''))
+            if not entry_tokens:
+                continue
+            score = len(query_tokens & entry_tokens) / np.sqrt(len(query_tokens) * len(entry_tokens))
+            if score >= min_score:
+                scored.append((entry, float(score)))
+        
+        scored.sort(key=lambda hit: hit[1], reverse=True)
+        return scored[:k]
+    
+    # ========================================================================
+    # HYBRID RETRIEVAL (BM25 + VECTOR, RECIPROCAL RANK FUSION)
+    # ========================================================================
+    
+    def _resolve_query_embedding(
+        self,
+        user_input: str,
+        recent_thoughts: Optional[List[str]],
+        use_embedding_combination: bool
+    ) -> Optional[np.ndarray]:
+        """Query embedding for the combined user input + thought context"""
+        if use_embedding_combination:
+            return self.build_combined_embedding(
                 user_input=user_input,
                 recent_thoughts=recent_thoughts,
                 weight_user=0.6,
                 weight_thoughts=0.4
             )
-            query_embedding = self._get_query_embedding(combined_query)
         
-        if query_embedding is None:
-            return []
+        combined_query = self.build_combined_query(
+            user_input=user_input,
+            recent_thoughts=recent_thoughts,
+            weight_user=0.6,
+            weight_thoughts=0.4
+        )
+        return self._get_query_embedding(combined_query)
+    
+    def _use_hybrid(self, mode: Optional[str]) -> bool:
+        return (mode or self.search_mode) == "hybrid" and self.memory_manager.lexical_enabled
+    
+    def _lexical_query(self, user_input: str, recent_thoughts: Optional[List[str]]) -> str:
+        """Exact terms come from what the user typed; thoughts only as a fallback"""
+        if user_input and user_input.strip():
+            return user_input
+        return self.build_combined_query(user_input="", recent_thoughts=recent_thoughts)
+    
+    def _hybrid_search(
+        self,
+        lexical_index,
+        vector_search,
+        embed,
+        query_text: str,
+        k: int,
+        min_strength: float = 0.1
+    ) -> List:
+        """
+        Fuse BM25 and vector rankings with reciprocal rank fusion
         
-        messages = self.memory_manager.medium_memory
+        If the best BM25 hit covers at least `lexical_skip_score` of the
+        query's information (see BM25Index.search), the embedding call is
+        skipped and lexical hits are returned directly.
         
-        if not messages:
-            return []
+        Args:
+            lexical_index: Tier BM25Index
+            vector_search: (query_embedding, n) -> [(item, similarity)]
+            embed: Zero-argument callable producing the query embedding
+            query_text: Text for the lexical leg
+            k: Number of results
+            min_strength: Lexical hits weaker than this are ignored
         
-        embeddings = []
-        valid_messages = []
+        Returns:
+            List of (item, similarity); similarity is the cosine when the
+            query was embedded, otherwise the lexical strength
+        """
+        self.search_stats['hybrid_queries'] += 1
+        depth = max(k * 4, 20)
         
-        for msg in messages:
-            if 'embedding' in msg and msg['embedding']:
-                embeddings.append(np.array(msg['embedding'], dtype=np.float32))
-                valid_messages.append(msg)
+        lexical = [
+            hit for hit in lexical_index.search(query_text, depth)
+            if hit[2] >= min_strength
+        ]
         
-        if not embeddings:
-            return []
+        if lexical and lexical[0][2] >= self.lexical_skip_score:
+            self.search_stats['embedding_skipped'] += 1
+            return [(item, strength) for item, _, strength in lexical[:k]]
         
-        embeddings_matrix = np.vstack(embeddings)
-        document_norms = self._precompute_norms(embeddings)
-        similarities = self._vectorized_cosine_similarity(
-            query_embedding,
-            embeddings_matrix,
-            document_norms
-        )
+        query_embedding = embed()
+        vector = vector_search(query_embedding, depth) if query_embedding is not None else []
         
-        top_k_indices = self._top_k_argpartition(similarities, k)
+        fused: Dict[int, list] = {}
+        for rank, (item, similarity) in enumerate(vector):
+            fused[id(item)] = [item, 1.0 / (self.rrf_k + rank + 1), similarity]
         
-        results = []
-        for idx in top_k_indices:
-            msg = valid_messages[idx]
-            results.append({
-                'role': msg.get('role', ''),
-                'content': msg.get('content', ''),
-                'timestamp': msg.get('timestamp', ''),
-                'similarity': float(similarities[idx])
-            })
+        for rank, (item, _, strength) in enumerate(lexical):
+            contribution = 1.0 / (self.rrf_k + rank + 1)
+            if id(item) in fused:
+                fused[id(item)][1] += contribution
+            else:
+                fused[id(item)] = [item, contribution, self._similarity(item, query_embedding, strength)]
         
-        return results
+        ranked = sorted(fused.values(), key=lambda f: f[1], reverse=True)[:k]
+        return [(item, similarity) for item, _, similarity in ranked]
+    
+    @staticmethod
+    def _similarity(item: Dict, query_embedding: Optional[np.ndarray], fallback: float) -> float:
+        """Cosine of a lexical-only hit, so callers see one similarity scale"""
+        if query_embedding is None or not has_embedding(item):
+            return fallback
+        vector = np.asarray(item['embedding'], dtype=np.float32)
+        query = np.asarray(query_embedding, dtype=np.float32)
+        if vector.shape != query.shape:
+            return fallback
+        denom = max(float(np.linalg.norm(vector) * np.linalg.norm(query)), 1e-8)
+        return float(vector @ query) / denom
+    
+    # ========================================================================
+    # DIVERSIFICATION (NEAR-DUPLICATES, MMR)
+    # ========================================================================
+    
+    def _candidate_k(self, k: int) -> int:
+        """Over-fetch so there is something left after duplicates are dropped"""
+        if self.dedup_threshold is None and self.mmr_lambda is None:
+            return k
+        return max(k * 3, 10)
+    
+    def _diversify(self, hits: List, k: int, text_fn) -> List:
+        """Drop near-duplicate hits and optionally MMR re-rank, keeping k"""
+        return diversify_hits(
+            hits, k, text_fn,
+            dedup_threshold=self.dedup_threshold,
+            mmr_lambda=self.mmr_lambda
+        )
+    
+    def filter_near_duplicates(
+        self,
+        texts: List[str],
+        seen: Optional[List[str]] = None,
+        threshold: Optional[float] = None
+    ) -> List[int]:
+        """
+        Indices of texts that are not near-duplicates of each other or of
+        `seen` (text already in the prompt), compared with hashed term
+        vectors so no embedding is requested
+        """
+        threshold = self.dedup_threshold if threshold is None else threshold
+        if threshold is None or not texts:
+            return list(range(len(texts)))
+        
+        seen = seen or []
+        items = [{'text': t} for t in seen + texts]
+        similarities = similarity_matrix(items, lambda item: item['text'])
+        return [i - len(seen) for i in drop_near_duplicates(similarities, threshold, seeds=len(seen))]
     
     # ========================================================================
     # BACKWARD COMPATIBILITY: Original methods preserved
@@ -430,6 +799,7 @@ class MemorySearch:
             thought_dir = project_root / "personality" / "base_memory" / "base_memories" / "thought_examples"
             if thought_dir.exists():
                 self._thought_examples = self._load_examples_from_directory(thought_dir)
+                self._thought_index.rebuild(self._thought_examples)
                 if self._thought_examples:
                     self.memory_manager.logger.memory(
                         f"[Personality] Loaded {len(self._thought_examples)} thought examples"
@@ -438,6 +808,7 @@ class MemorySearch:
             response_dir = project_root / "personality" / "base_memory" / "base_memories" / "response_examples"
             if response_dir.exists():
                 self._response_examples = self._load_examples_from_directory(response_dir)
+                self._response_index.rebuild(self._response_examples)
                 if self._response_examples:
                     self.memory_manager.logger.memory(
                         f"[Personality] Loaded {len(self._response_examples)} response examples"
@@ -452,7 +823,13 @@ class MemorySearch:
             self.memory_manager.logger.error(f"[Personality] Failed to load examples: {e}")
     
     def _load_examples_from_directory(self, directory: Path) -> List[Dict]:
-        """Load all personality example files from a directory"""
+        """
+        Load all personality example files from a directory
+        
+        Only chunks with both a situation and a reply are kept (stage
+        summaries are not examples); each gets pre-parsed 'situation' and
+        'reply' fields.
+        """
         examples = []
         
         try:
@@ -460,14 +837,17 @@ class MemorySearch:
             
             for json_file in json_files:
                 try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        file_data = json.load(f)
+                    file_data = load_vector_json(json_file)
                     
                     chunks = file_data.get('chunks', [])
                     
                     for chunk in chunks:
-                        if 'embedding' in chunk and isinstance(chunk['embedding'], list):
-                            examples.append(chunk)
+                        if not has_embedding(chunk):
+                            continue
+                        # Parse once here so retrieval is a matmul + lookup
+                        situation, reply = parse_example_fields(chunk)
+                        if situation and reply:
+                            examples.append(dict(chunk, situation=situation, reply=reply))
                 
                 except Exception as e:
                     self.memory_manager.logger.error(
@@ -484,133 +864,92 @@ class MemorySearch:
         query: str,
         stage: str,
         k: int = 2,
-        min_similarity: float = 0.35
+        min_similarity: float = 0.35,
+        query_embedding: Optional[np.ndarray] = None
     ) -> List[Dict]:
-        """Search personality examples for a specific stage"""
+        """
+        Search personality examples for a specific stage
+        
+        query_embedding, if given (e.g. from the turn's RetrievalResult),
+        is used instead of embedding query.
+        """
         if stage == 'thought':
-            examples = self._thought_examples
+            index = self._thought_index
         elif stage == 'response':
-            examples = self._response_examples
+            index = self._response_index
         else:
             self.memory_manager.logger.error(f"[Personality] Invalid stage: {stage}")
             return []
         
-        if not examples:
+        if not len(index):
             return []
         
-        query_embedding = self._get_query_embedding(query)
+        if query_embedding is None:
+            query_embedding = self._get_query_embedding(query)
         if query_embedding is None:
             return []
         
-        embeddings = []
-        valid_examples = []
-        
-        for ex in examples:
-            if 'embedding' in ex and ex['embedding']:
-                embeddings.append(np.array(ex['embedding'], dtype=np.float32))
-                valid_examples.append(ex)
-        
-        if not embeddings:
-            return []
-        
-        embeddings_matrix = np.vstack(embeddings)
-        document_norms = self._precompute_norms(embeddings)
-        similarities = self._vectorized_cosine_similarity(
-            query_embedding,
-            embeddings_matrix,
-            document_norms
-        )
-        
-        valid_indices = np.where(similarities >= min_similarity)[0]
-        
-        if len(valid_indices) == 0:
-            return []
-        
-        valid_similarities = similarities[valid_indices]
-        top_k_local = self._top_k_argpartition(valid_similarities, min(k, len(valid_similarities)))
-        top_k_indices = valid_indices[top_k_local]
+        hits = index.search(query_embedding, k, min_similarity)
         
         results = []
-        for idx in top_k_indices:
-            ex = valid_examples[idx]
+        for ex, similarity in hits:
             results.append({
                 'text': ex.get('text', ''),
                 'searchable_text': ex.get('searchable_text', ''),
                 'metadata': ex.get('metadata', {}),
-                'similarity': float(similarities[idx]),
-                'category': ex.get('metadata', {}).get('category', 'unknown')
+                'similarity': similarity,
+                'category': ex.get('metadata', {}).get('category', 'unknown'),
+                'situation': ex['situation'],
+                'reply': ex['reply']
             })
         
         return results
     
-    def get_thought_processing_examples(self, situation: str, k: int = 2) -> str:
+    def get_thought_processing_examples(
+        self,
+        situation: str,
+        k: int = 2,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> str:
         """Get formatted thought processing examples"""
         examples = self.search_personality_examples(
             query=situation,
             stage='thought',
-            k=k
+            k=k,
+            query_embedding=query_embedding
         )
         
         if not examples:
             return ""
         
         formatted = []
-        
         for ex in examples:
-            text = ex['text']
-            lines = text.split('\n')
-            
-            situation_text = ""
-            cognition_text = ""
-            
-            for line in lines:
-                if 'SITUATION:' in line:
-                    situation_text = line.split('SITUATION:', 1)[1].strip()
-                elif 'INTERNAL COGNITION:' in line:
-                    cognition_text = line.split('INTERNAL COGNITION:', 1)[1].strip()
-            
-            if situation_text and cognition_text:
-                formatted.append(f"SITUATION: {situation_text}")
-                formatted.append(f"THOUGHT: {cognition_text}\n")
-        
-        if not formatted:
-            return ""
+            formatted.append(f"SITUATION: {ex['situation']}")
+            formatted.append(f"THOUGHT: {ex['reply']}\n")
         
         return "\n".join(formatted)
     
-    def get_response_generation_examples(self, context: str, k: int = 2) -> str:
+    def get_response_generation_examples(
+        self,
+        context: str,
+        k: int = 2,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> str:
         """Get formatted response generation examples"""
         examples = self.search_personality_examples(
             query=context,
             stage='response',
-            k=k
+            k=k,
+            query_embedding=query_embedding
         )
         
         if not examples:
             return ""
         
         formatted = []
-        
         for ex in examples:
-            text = ex['text']
-            lines = text.split('\n')
-            
-            situation_text = ""
-            response_text = ""
-            
-            for line in lines:
-                if 'SITUATION:' in line:
-                    situation_text = line.split('SITUATION:', 1)[1].strip()
-                elif 'RESPONSE:' in line or 'OUTPUT:' in line:
-                    delimiter = 'RESPONSE:' if 'RESPONSE:' in line else 'OUTPUT:'
-                    response_text = line.split(delimiter, 1)[1].strip()
-            
-            if situation_text and response_text:
-                formatted.append(f"SITUATION: {situation_text}")
-                formatted.append(f"RESPONSE: {response_text}\n")
-        
-        if not formatted:
-            return ""
+            formatted.append(f"SITUATION: {ex['situation']}")
+            formatted.append(f"RESPONSE: {ex['reply']}\n")
         
         return "\n".join(formatted)
     
@@ -618,48 +957,23 @@ class MemorySearch:
     # UTILITY METHODS (Preserved)
     # ========================================================================
     
-    @lru_cache(maxsize=1000)
     def _get_query_embedding(self, query: str) -> Optional[np.ndarray]:
         """Cache query embeddings for repeated searches"""
-        embedding = self.memory_manager._get_ollama_embedding(query)
-        if embedding is None:
-            return None
-        return np.array(embedding, dtype=np.float32)
-    
-    def _precompute_norms(self, embeddings: List[np.ndarray]) -> np.ndarray:
-        """Pre-compute norms for faster similarity calculation"""
-        embeddings_matrix = np.vstack(embeddings).astype(np.float32)
-        norms = np.linalg.norm(embeddings_matrix, axis=1, keepdims=True)
-        norms = np.maximum(norms, 1e-8)
-        return norms
+        return self._get_query_embeddings([query])[0]
     
-    def _vectorized_cosine_similarity(
-        self, 
-        query_embedding: np.ndarray,
-        document_embeddings: np.ndarray,
-        document_norms: np.ndarray
-    ) -> np.ndarray:
-        """Vectorized cosine similarity calculation"""
-        if query_embedding.ndim == 1:
-            query_embedding = query_embedding.reshape(1, -1)
-        
-        query_norm = np.linalg.norm(query_embedding)
-        query_norm = max(query_norm, 1e-8)
-        
-        dot_products = document_embeddings @ query_embedding.T
-        similarities = dot_products / (document_norms * query_norm)
-        
-        return similarities.flatten()
+    def _get_query_embeddings(self, queries: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Cached embeddings for several queries; all misses are fetched in
+        a single batched request
+        """
+        return self._query_cache.get_many(queries, self.memory_manager._get_ollama_embeddings)
     
-    def _top_k_argpartition(self, similarities: np.ndarray, k: int) -> np.ndarray:
-        """Fast top-k selection using argpartition"""
-        if len(similarities) <= k:
-            return np.argsort(-similarities)
-        
-        top_k_indices = np.argpartition(-similarities, k)[:k]
-        top_k_indices = top_k_indices[np.argsort(-similarities[top_k_indices])]
-        
-        return top_k_indices
+    def get_cache_stats(self) -> Dict:
+        """Query embedding cache and hybrid search counters"""
+        return {
+            'query_embedding_cache': self._query_cache.get_stats(),
+            'search': dict(self.search_stats)
+        }
     
     def get_short_memory(self) -> str:
         """Get formatted short memory"""
@@ -681,10 +995,7 @@ class MemorySearch:
         
         yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
         
-        yesterday_entries = [
-            e for e in self.memory_manager.medium_memory 
-            if e.get('date') == yesterday
-        ]
+        yesterday_entries = self.memory_manager.get_entries_for_date(yesterday, tiers=("medium",))
         
         if not yesterday_entries:
             return ""
@@ -703,11 +1014,12 @@ class MemorySearch:
         """Reload personality examples"""
         self._thought_examples = []
         self._response_examples = []
+        self._thought_index.clear()
+        self._response_index.clear()
         self._load_personality_examples()
         self.memory_manager.logger.system("[Personality] Examples reloaded")
     
     def clear_caches(self):
         """Clear all caches to free memory"""
-        self._get_query_embedding.cache_clear()
-        self._embedding_norms_cache.clear()
-        self._embeddings_cache.clear()
\ No newline at end of file
+        self._query_cache.clear()
+        self._turn_retrieval = None
\ No newline at end of file
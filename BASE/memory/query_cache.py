@@ -0,0 +1,175 @@
+# Filename: BASE/memory/query_cache.py
+"""
+Query Embedding Cache
+In-process LRU for query embeddings (the persistent EmbeddingCache covers
+stored text). Keys are normalized so "What's up?" and "what's  up?" share
+an entry; size is capped by entry count and by vector bytes.
+
+Failed lookups are remembered only briefly: a transient Ollama error
+short-circuits repeats of that query for `failure_ttl` seconds instead of
+disabling it for the rest of the session.
+"""
+
+import re
+import time
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import List, Dict, Optional, Callable, Iterable
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_query(text: str) -> str:
+    """Cache key: trimmed, whitespace-collapsed, lowercased"""
+    return _WHITESPACE.sub(' ', text or '').strip().lower()
+
+
+class QueryEmbeddingCache:
+    """Bounded LRU of query -> float32 embedding with negative caching"""
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 16 * 1024 * 1024,
+        failure_ttl: float = 10.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            max_entries: Entry cap
+            max_bytes: Cap on the summed size of cached vectors
+            failure_ttl: Seconds a failed query is answered with None
+            clock: Time source (monotonic)
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.failure_ttl = failure_ttl
+        self._clock = clock
+
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._failures: Dict[str, float] = {}  # key -> retry-after time
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.failure_hits = 0
+        self.failures = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ========================================================================
+    # LOOKUP
+    # ========================================================================
+
+    def get_many(
+        self,
+        queries: List[str],
+        fetch: Callable[[List[str]], List[Optional[Iterable[float]]]]
+    ) -> List[Optional[np.ndarray]]:
+        """
+        Embeddings for queries; misses are fetched together in one call
+
+        Args:
+            queries: Raw query strings
+            fetch: Batched embedder, called with the first raw spelling of
+                each missing normalized key
+
+        Returns:
+            One embedding (or None) per query
+        """
+        keys = [normalize_query(q) for q in queries]
+        now = self._clock()
+
+        to_fetch: Dict[str, str] = {}
+        with self._lock:
+            for key, query in zip(keys, queries):
+                if key in self._entries or key in to_fetch:
+                    continue
+                retry_after = self._failures.get(key)
+                if retry_after is not None and retry_after > now:
+                    continue
+                to_fetch[key] = query
+
+        # Kept locally too, in case a tiny cap evicts them within this batch
+        fresh: Dict[str, np.ndarray] = {}
+        if to_fetch:
+            fetched = fetch(list(to_fetch.values()))
+            with self._lock:
+                for key, embedding in zip(to_fetch, fetched):
+                    if embedding is None or len(embedding) == 0:
+                        self._failures[key] = self._clock() + self.failure_ttl
+                        self.failures += 1
+                    else:
+                        self._failures.pop(key, None)
+                        fresh[key] = np.asarray(embedding, dtype=np.float32)
+                        self._put(key, fresh[key])
+
+        results: List[Optional[np.ndarray]] = []
+        with self._lock:
+            for key in keys:
+                embedding = self._entries.get(key)
+                if embedding is None:
+                    embedding = fresh.get(key)
+                if key in to_fetch:
+                    # First occurrence paid for the fetch; repeats are hits
+                    self.misses += 1
+                    to_fetch.pop(key)
+                elif embedding is not None:
+                    self.hits += 1
+                else:
+                    self.failure_hits += 1
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                results.append(embedding)
+
+            self._expire_failures(now)
+
+        return results
+
+    def _put(self, key: str, embedding: np.ndarray):
+        """Insert and evict down to both caps (caller holds the lock)"""
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._entries[key] = embedding
+        self._bytes += embedding.nbytes
+
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def _expire_failures(self, now: float):
+        """Drop stale negative entries (caller holds the lock)"""
+        if len(self._failures) > self.max_entries:
+            self._failures = {k: t for k, t in self._failures.items() if t > now}
+
+    # ========================================================================
+    # MAINTENANCE / STATS
+    # ========================================================================
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._failures.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.failure_hits
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'failure_hits': self.failure_hits,
+                'failures': self.failures,
+                'evictions': self.evictions,
+                'hit_rate': (self.hits / lookups) if lookups else 0.0,
+            }
@@ -0,0 +1,173 @@
+# Filename: BASE/memory/rollups.py
+"""
+Weekly / Monthly Rollups for Long Memory (Tier 3)
+Tier 3 gains one embedded summary per day, forever. Rollups add two coarser
+levels on top: one summary per ISO week and one per calendar month, built
+from that period's daily summaries once the period is over. They live in
+long_memory next to the dailies (so they persist the same way) and are
+told apart by metadata.entry_type.
+
+RollupSearch keeps the rollups in their own vector indexes and searches
+coarse-to-fine: the best months and weeks are picked first, then only
+their daily rows in the long index are scored, plus the recent dailies no
+rollup covers yet. Below `min_days` daily summaries the daily index is
+simply scanned in full.
+"""
+
+import numpy as np
+from datetime import date as Date, timedelta
+from typing import List, Dict, Any, Optional, Tuple
+
+from BASE.memory.vector_index import VectorIndex
+
+WEEKLY = "weekly_summary"
+MONTHLY = "monthly_summary"
+ROLLUP_TYPES = (WEEKLY, MONTHLY)
+
+
+def is_rollup(entry: Dict[str, Any]) -> bool:
+    """True for weekly/monthly rollup entries, False for daily summaries"""
+    return entry.get('metadata', {}).get('entry_type') in ROLLUP_TYPES
+
+
+def week_key(day: str) -> str:
+    """ISO week of a YYYY-MM-DD date, e.g. '2026-W41'"""
+    year, week, _ = Date.fromisoformat(day).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def month_key(day: str) -> str:
+    """Calendar month of a YYYY-MM-DD date, e.g. '2026-10'"""
+    return day[:7]
+
+
+def period_key(level: str, day: str) -> str:
+    return week_key(day) if level == WEEKLY else month_key(day)
+
+
+def period_bounds(level: str, key: str) -> Tuple[str, str]:
+    """First and last YYYY-MM-DD of a week or month key"""
+    if level == WEEKLY:
+        year, week = key.split("-W")
+        start = Date.fromisocalendar(int(year), int(week), 1)
+        end = start + timedelta(days=6)
+    else:
+        year, month = (int(p) for p in key.split("-"))
+        start = Date(year, month, 1)
+        next_month = Date(year + month // 12, month % 12 + 1, 1)
+        end = next_month - timedelta(days=1)
+    return start.isoformat(), end.isoformat()
+
+
+def due_rollups(
+    long_memory: List[Dict[str, Any]],
+    settled_before: str,
+    pending_dates: List[str]
+) -> List[Tuple[str, str, List[Dict[str, Any]]]]:
+    """
+    Periods whose rollup is missing or stale
+
+    A period is due once it ended before `settled_before` and none of its
+    days is still waiting to be summarized; a rollup is stale when the set
+    of daily summaries it was built from has changed.
+
+    Returns:
+        (level, period key, daily entries in date order) per due period
+    """
+    dailies: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    built: Dict[Tuple[str, str], List[str]] = {}
+    for entry in long_memory:
+        metadata = entry.get('metadata', {})
+        if is_rollup(entry):
+            built[(metadata['entry_type'], entry.get('period', ''))] = metadata.get('source_dates', [])
+            continue
+        day = entry.get('date', '')
+        if not day:
+            continue
+        for level in ROLLUP_TYPES:
+            dailies.setdefault((level, period_key(level, day)), []).append(entry)
+
+    blocked = {(level, period_key(level, d)) for d in pending_dates for level in ROLLUP_TYPES}
+
+    due = []
+    for (level, key), entries in sorted(dailies.items(), key=lambda kv: kv[0][1]):
+        if (level, key) in blocked or period_bounds(level, key)[1] >= settled_before:
+            continue
+        entries = sorted(entries, key=lambda e: e.get('date', ''))
+        if built.get((level, key)) != [e.get('date', '') for e in entries]:
+            due.append((level, key, entries))
+    return due
+
+
+class RollupSearch:
+    """Coarse-to-fine vector search over the daily summaries of Tier 3"""
+
+    def __init__(
+        self,
+        daily_index: VectorIndex,
+        min_days: int = 120,
+        top_months: int = 2,
+        top_weeks: int = 4
+    ):
+        """
+        Args:
+            daily_index: Tier 3 index holding only daily summaries
+            min_days: Daily summaries needed before narrowing kicks in
+            top_months: Months picked per query
+            top_weeks: Weeks picked per query
+        """
+        self.daily_index = daily_index
+        self.min_days = min_days
+        self.top_months = top_months
+        self.top_weeks = top_weeks
+
+        self.week_index = VectorIndex("long_weekly")
+        self.month_index = VectorIndex("long_monthly")
+        self._rows_by_period: Dict[str, np.ndarray] = {}
+        self._uncovered_rows = np.zeros(0, dtype=np.int64)
+
+    def rebuild(self, long_memory: List[Dict[str, Any]]):
+        """Re-index rollups and map periods to daily rows (after any Tier 3 change)"""
+        rollups = [e for e in long_memory if is_rollup(e)]
+        self.week_index.rebuild(r for r in rollups if r['metadata']['entry_type'] == WEEKLY)
+        self.month_index.rebuild(r for r in rollups if r['metadata']['entry_type'] == MONTHLY)
+
+        covered = {(r['metadata']['entry_type'], r.get('period', '')) for r in rollups}
+        rows: Dict[str, List[int]] = {}
+        uncovered = []
+        for row, entry in enumerate(self.daily_index.items):
+            day = entry.get('date', '')
+            keys = [(level, period_key(level, day)) for level in ROLLUP_TYPES] if day else []
+            if not any(k in covered for k in keys):
+                uncovered.append(row)
+            for level, key in keys:
+                rows.setdefault(key, []).append(row)
+
+        self._rows_by_period = {k: np.asarray(v, dtype=np.int64) for k, v in rows.items()}
+        self._uncovered_rows = np.asarray(uncovered, dtype=np.int64)
+
+    def candidate_rows(self, query_embedding) -> Optional[np.ndarray]:
+        """Daily rows worth scoring for a query (None = scan everything)"""
+        if len(self.daily_index) < self.min_days or not (len(self.week_index) or len(self.month_index)):
+            return None
+
+        parts = [self._uncovered_rows]
+        for index, top in ((self.month_index, self.top_months), (self.week_index, self.top_weeks)):
+            for rollup, _ in index.search(query_embedding, top):
+                parts.append(self._rows_by_period.get(rollup.get('period', ''), parts[0][:0]))
+        return np.unique(np.concatenate(parts))
+
+    def search(self, query_embedding, k: int) -> List[Tuple[Dict[str, Any], float]]:
+        """Top-k daily summaries, narrowed through the rollups when worthwhile"""
+        rows = self.candidate_rows(query_embedding)
+        if rows is None:
+            return self.daily_index.search(query_embedding, k)
+        return self.daily_index.search_rows(query_embedding, rows, k)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            'daily': len(self.daily_index),
+            'weekly': len(self.week_index),
+            'monthly': len(self.month_index),
+            'uncovered_daily': int(self._uncovered_rows.size)
+        }
@@ -0,0 +1,309 @@
+# Filename: BASE/memory/sqlite_store.py
+"""
+SQLite Memory Backend (optional)
+Alternative persistence for MemoryManager, enabled with
+memory.backend = "sqlite" in config.json. Replaces the per-tier JSON
+snapshots and journals with one database:
+
+    personality/memory/memory.sqlite3
+
+- entries        Tiers 1-3 (tier, seq order, role, date, timestamp, text,
+                 extra fields as JSON, embedding as a BLOB); indexed on
+                 (tier, seq), (tier, date) and (tier, role)
+- entries_fts    FTS5 full-text index over entry text (when available)
+
+Tier 4 is not stored here: base chunks stay in their JSON files with
+memory-mapped vector sidecars, and are searched through the in-memory
+indexes (vector, and BM25 for hybrid search).
+
+MemoryManager keeps its public lists (short_memory, medium_memory, ...)
+as working sets; every mutation is mirrored here in a single transaction,
+and date lookups, per-date counts and lexical search run as indexed
+queries instead of list scans.
+"""
+
+import json
+import sqlite3
+import threading
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+
+from BASE.core.logger import Logger
+
+ROWID_FIELD = "_rowid"
+TIERS = ("short", "medium", "long")
+
+# Fields stored in their own columns; everything else goes into `data`
+# (the `text` column is a copy of content/summary for full-text search)
+_NATIVE_FIELDS = ("role", "date", "timestamp", "embedding", ROWID_FIELD)
+
+_INSERT = (
+    "INSERT INTO entries (tier, seq, role, date, timestamp, text, data, vector, dim) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def default_db_path(project_root: Path) -> Path:
+    return project_root / "personality" / "memory" / "memory.sqlite3"
+
+
+class SQLiteMemoryStore:
+    """Transactional store for memory tiers with indexed and FTS queries"""
+
+    def __init__(self, db_path: Path, logger: Logger, vector_dtype: str = "float32"):
+        """
+        Args:
+            db_path: SQLite database file
+            logger: Logger instance for all output
+            vector_dtype: Storage dtype for embedding BLOBs
+        """
+        self.db_path = db_path
+        self.logger = logger
+        self.vector_dtype = np.dtype(vector_dtype)
+        self._lock = threading.RLock()
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    # ========================================================================
+    # SCHEMA
+    # ========================================================================
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY,
+                    tier TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    role TEXT,
+                    date TEXT,
+                    timestamp TEXT,
+                    text TEXT NOT NULL DEFAULT '',
+                    data TEXT,
+                    vector BLOB,
+                    dim INTEGER
+                );
+                CREATE INDEX IF NOT EXISTS idx_entries_tier_seq ON entries(tier, seq);
+                CREATE INDEX IF NOT EXISTS idx_entries_tier_date ON entries(tier, date);
+                CREATE INDEX IF NOT EXISTS idx_entries_tier_role ON entries(tier, role);
+                """
+            )
+
+        self.fts_enabled = True
+        try:
+            with self._lock, self._conn:
+                self._conn.executescript(
+                    """
+                    CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts
+                        USING fts5(text, content='entries', content_rowid='id');
+                    CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+                        INSERT INTO entries_fts(rowid, text) VALUES (new.id, new.text);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+                        INSERT INTO entries_fts(entries_fts, rowid, text) VALUES ('delete', old.id, old.text);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE OF text ON entries BEGIN
+                        INSERT INTO entries_fts(entries_fts, rowid, text) VALUES ('delete', old.id, old.text);
+                        INSERT INTO entries_fts(rowid, text) VALUES (new.id, new.text);
+                    END;
+                    """
+                )
+        except sqlite3.OperationalError as e:
+            # SQLite builds without FTS5 still get indexed storage
+            self.fts_enabled = False
+            self.logger.warning(f"[SQLite] FTS5 unavailable, lexical search uses LIKE: {e}")
+
+    # ========================================================================
+    # ROW CONVERSION
+    # ========================================================================
+
+    def _to_row(self, tier: str, seq: int, entry: Dict[str, Any]) -> Tuple:
+        text = entry.get('content') or entry.get('summary') or ''
+        extra = {k: v for k, v in entry.items() if k not in _NATIVE_FIELDS}
+
+        vector, dim = self._pack_vector(entry.get('embedding'))
+        return (
+            tier, seq, entry.get('role'), entry.get('date'), entry.get('timestamp'),
+            text, json.dumps(extra, ensure_ascii=False), vector, dim
+        )
+
+    def _pack_vector(self, embedding) -> Tuple[Optional[bytes], Optional[int]]:
+        if embedding is None or len(embedding) == 0:
+            return None, None
+        array = np.asarray(embedding, dtype=self.vector_dtype)
+        return array.tobytes(), int(array.shape[0])
+
+    @staticmethod
+    def _unpack_vector(blob: Optional[bytes], dim: Optional[int]):
+        if blob is None or not dim:
+            return None
+        dtype = np.float16 if len(blob) == dim * 2 else np.float32
+        return np.frombuffer(blob, dtype=dtype)
+
+    def _from_row(self, row: Tuple) -> Dict[str, Any]:
+        rowid, role, date, timestamp, data, blob, dim = row
+        entry = json.loads(data) if data else {}
+        if role is not None:
+            entry['role'] = role
+        if date is not None:
+            entry['date'] = date
+        if timestamp is not None:
+            entry['timestamp'] = timestamp
+
+        vector = self._unpack_vector(blob, dim)
+        if vector is not None:
+            entry['embedding'] = vector
+        entry[ROWID_FIELD] = rowid
+        return entry
+
+    # ========================================================================
+    # TIER OPERATIONS
+    # ========================================================================
+
+    def tier_count(self, tier: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE tier = ?", (tier,)
+            ).fetchone()[0]
+
+    def load_tier(self, tier: str) -> List[Dict[str, Any]]:
+        """All entries of a tier in order"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, role, date, timestamp, data, vector, dim FROM entries "
+                "WHERE tier = ? ORDER BY seq", (tier,)
+            ).fetchall()
+        return [self._from_row(r) for r in rows]
+
+    def _next_seq(self, tier: str) -> int:
+        row = self._conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM entries WHERE tier = ?", (tier,)
+        ).fetchone()
+        return int(row[0]) + 1
+
+    def _insert(self, tier: str, seq: int, entry: Dict[str, Any]):
+        """Insert one entry and remember its row id on the dict"""
+        cursor = self._conn.execute(_INSERT, self._to_row(tier, seq, entry))
+        entry[ROWID_FIELD] = cursor.lastrowid
+
+    def append(self, tier: str, entries: Iterable[Dict[str, Any]]):
+        """Insert entries at the end of a tier (assigns their row ids)"""
+        with self._lock, self._conn:
+            seq = self._next_seq(tier)
+            for entry in entries:
+                self._insert(tier, seq, entry)
+                seq += 1
+
+    def move(self, entries: List[Dict[str, Any]], tier: str):
+        """Move entries (already stored) to the end of another tier"""
+        with self._lock, self._conn:
+            seq = self._next_seq(tier)
+            for entry in entries:
+                moved = entry.get(ROWID_FIELD) is not None and self._conn.execute(
+                    "UPDATE entries SET tier = ?, seq = ?, date = ? WHERE id = ?",
+                    (tier, seq, entry.get('date'), entry[ROWID_FIELD])
+                ).rowcount > 0
+                if not moved:
+                    self._insert(tier, seq, entry)
+                seq += 1
+
+    def set_vector(self, entry: Dict[str, Any], embedding) -> bool:
+        """Store a late embedding for an entry (False if it no longer exists)"""
+        rowid = entry.get(ROWID_FIELD)
+        if rowid is None:
+            return False
+        vector, dim = self._pack_vector(embedding)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE entries SET vector = ?, dim = ? WHERE id = ?", (vector, dim, rowid)
+            )
+            return cursor.rowcount > 0
+
+    def replace_tier(self, tier: str, entries: List[Dict[str, Any]]):
+        """Atomically replace a whole tier (bulk edits: clears, rollover)"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE tier = ?", (tier,))
+            for seq, entry in enumerate(entries, 1):
+                self._insert(tier, seq, entry)
+
+    # ========================================================================
+    # INDEXED QUERIES
+    # ========================================================================
+
+    def entries_for_date(self, date: str, tiers: Tuple[str, ...] = ("medium", "short")) -> List[Dict[str, Any]]:
+        """Entries of a given date across tiers, in conversation order"""
+        order = " ".join(f"WHEN '{t}' THEN {i}" for i, t in enumerate(tiers))
+        placeholders = ",".join("?" * len(tiers))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, role, date, timestamp, data, vector, dim FROM entries "
+                f"WHERE date = ? AND tier IN ({placeholders}) "
+                f"ORDER BY CASE tier {order} END, seq",
+                (date, *tiers)
+            ).fetchall()
+        return [self._from_row(r) for r in rows]
+
+    def count_by_date(self, tiers: Tuple[str, ...] = ("medium", "short")) -> Dict[str, int]:
+        """Entry count per date across tiers"""
+        placeholders = ",".join("?" * len(tiers))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT date, COUNT(*) FROM entries WHERE tier IN ({placeholders}) "
+                f"GROUP BY date", tiers
+            ).fetchall()
+        return {date: count for date, count in rows if date}
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Quote each term so user text is never parsed as FTS syntax"""
+        terms = [t.replace('"', '') for t in query.split()]
+        return " OR ".join(f'"{t}"' for t in terms if t)
+
+    def search_text(
+        self,
+        query: str,
+        tiers: Tuple[str, ...] = ("medium",),
+        k: int = 5,
+        unembedded_only: bool = False
+    ) -> List[Tuple[int, float]]:
+        """
+        Lexical search over Tier 1-3 text
+
+        Returns:
+            (row id, score) pairs, best first; FTS5 scores are negated bm25
+        """
+        match = self._fts_query(query)
+        if not match:
+            return []
+
+        placeholders = ",".join("?" * len(tiers))
+        vector_filter = " AND e.vector IS NULL" if unembedded_only else ""
+
+        with self._lock:
+            if self.fts_enabled:
+                rows = self._conn.execute(
+                    f"SELECT e.id, -bm25(entries_fts) AS score FROM entries_fts "
+                    f"JOIN entries e ON e.id = entries_fts.rowid "
+                    f"WHERE entries_fts MATCH ? AND e.tier IN ({placeholders}){vector_filter} "
+                    f"ORDER BY bm25(entries_fts) LIMIT ?",
+                    (match, *tiers, k)
+                ).fetchall()
+            else:
+                terms = query.split()[:8]
+                like = " OR ".join("e.text LIKE ?" for _ in terms)
+                rows = self._conn.execute(
+                    f"SELECT e.id, 1.0 FROM entries e WHERE ({like}) "
+                    f"AND e.tier IN ({placeholders}){vector_filter} ORDER BY e.seq DESC LIMIT ?",
+                    (*[f"%{t}%" for t in terms], *tiers, k)
+                ).fetchall()
+        return [(rowid, float(score)) for rowid, score in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
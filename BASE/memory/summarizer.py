@@ -6,11 +6,25 @@ Current day entries persist until the entire day has passed.
 
 IMPORTANT: This is only called on GUI startup to check for date rollovers,
 NOT on every interaction save.
+
+Long days are summarized map-reduce style: the conversation is split into
+token-bounded windows, each window is condensed into notes (in parallel),
+and the notes are reduced into the diary entry. Finished window notes are
+checkpointed per day, so a crash or failed call only redoes what is missing.
 """
 
-import requests
-from typing import Optional
+import os
+import json
+import hashlib
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Callable
 
+from BASE.core.context_packer import estimate_tokens, truncate_to_tokens
+from BASE.core.llm_client import get_ollama_client
+from BASE.core.llm_scheduler import LLMPriority
+from BASE.memory.date_index import iso_timestamp_of
 from personality.bot_info import agentname, username
 
 def summarize_previous_day(memory_manager, previous_date: str) -> bool:
@@ -26,18 +40,9 @@ def summarize_previous_day(memory_manager, previous_date: str) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    # Get entries from the specified previous date
-    entries_from_date = []
-    
-    # Collect from medium memory
-    for entry in memory_manager.medium_memory:
-        if entry.get('date') == previous_date:
-            entries_from_date.append(entry)
-    
-    # Collect from short memory (in case date just rolled over)
-    for entry in memory_manager.short_memory:
-        if entry.get('date') == previous_date:
-            entries_from_date.append(entry)
+    # Get entries from the specified previous date (medium, then short in
+    # case the date just rolled over) via the per-date index
+    entries_from_date = memory_manager.get_entries_for_date(previous_date)
     
     if not entries_from_date:
         print(f"[Summarizer] No entries found for previous day: {previous_date}")
@@ -57,8 +62,8 @@ def summarize_previous_day(memory_manager, previous_date: str) -> bool:
             memory_manager.archive_previous_day(summary, previous_date)
             return True
     
-    # Sort by timestamp to ensure chronological order
-    entries_from_date.sort(key=lambda x: x.get('timestamp', ''))
+    # Sort by ISO timestamp to ensure chronological order
+    entries_from_date.sort(key=iso_timestamp_of)
     
     # Format conversation
     lines = []
@@ -66,23 +71,31 @@ def summarize_previous_day(memory_manager, previous_date: str) -> bool:
         role = memory_manager.username if entry['role'] == 'user' else memory_manager.agentname
         lines.append(f"{role}: {entry['content']}")
     
-    conversation = "\n".join(lines)
+    config = memory_manager.config
+    model = config.summary_model or config.text_model
+    window_tokens = config.summary_window_tokens
+    windows = split_into_windows(lines, window_tokens)
     
-    # Generate summary with explicit date context
-    # The prompt emphasizes the conversation date to ensure the LLM understands
-    # this is a retrospective summary of a past conversation
-    prompt = f"""Create a concise summary of this full day's conversation between {username}, other humans and AI agents, and {agentname} that took place on {previous_date}. 
-Summarize in the first person from the perspective of {agentname}, the AI assistant, creating a short diary entry from {agentname} reflecting on that day. 
-Focus on key topics, important information, decisions made, emotional context, personal preferences, ongoing plans, and anything else the assistant, {agentname}, should later recall about that day's interactions. 
-Do not include formatting such as headers, subsections, bullet points, line breaks, or other extraneous details. Write this diary entry in complete sentences and a reflective tone.
-
-Conversation from {previous_date} ({len(entries_from_date)} messages):
-{conversation}
-
-Summary of {previous_date}:"""
-
-    
-    summary = _call_llm(memory_manager.ollama_endpoint, prompt)
+    if len(windows) == 1:
+        # Fits one prompt: summarize directly, as always
+        summary = _call_llm(
+            memory_manager.ollama_endpoint, model,
+            _diary_prompt(previous_date, f"Conversation from {previous_date} ({len(lines)} messages)", windows[0])
+        )
+    else:
+        checkpoint = SummaryCheckpoint(memory_manager.memory_dir / "summary_checkpoints", previous_date)
+        notes = _map_windows(
+            memory_manager.ollama_endpoint, model, previous_date, windows,
+            checkpoint, config.summary_map_concurrency
+        )
+        summary = None
+        if notes is not None:
+            summary = _reduce_notes(
+                memory_manager.ollama_endpoint, model, previous_date, notes, window_tokens,
+                lambda body: _diary_prompt(previous_date, f"Notes on the conversation from {previous_date}, in order", body)
+            )
+        if summary:
+            checkpoint.discard()
     
     if summary:
         # CRITICAL: Store the summary with the conversation date (previous_date)
@@ -94,29 +107,211 @@ Summary of {previous_date}:"""
     print(f"[Summarizer] Failed to generate summary for {previous_date}")
     return False
 
-def _call_llm(endpoint: str, prompt: str) -> Optional[str]:
+def summarize_period(memory_manager, span: str, daily_entries: List[Dict]) -> Optional[str]:
+    """
+    Roll a week's or month's daily summaries up into one entry
+    
+    Args:
+        memory_manager: The memory manager instance
+        span: Human-readable period, e.g. "the week of 2026-10-05 to 2026-10-11"
+        daily_entries: That period's daily summaries in date order
+    
+    Returns:
+        Rollup text, or None if generation failed
+    """
+    notes = [f"[{e.get('date', '')}] {e.get('summary', '')}" for e in daily_entries]
+    config = memory_manager.config
+    
+    def period_prompt(body: str) -> str:
+        return f"""Below are {agentname}'s diary entries for each day of {span}.
+Write one diary entry in the first person from the perspective of {agentname}, the AI assistant, looking back on that period as a whole.
+Focus on recurring topics, the people involved, important information, decisions made, how things developed over the period, and ongoing plans {agentname} should later recall.
+Do not include formatting such as headers, subsections, bullet points, line breaks, or other extraneous details. Write in complete sentences and a reflective tone.
+
+Daily entries, in order:
+{body}
+
+Summary of {span}:"""
+    
+    return _reduce_notes(
+        memory_manager.ollama_endpoint, config.summary_model or config.text_model,
+        span, notes, config.summary_window_tokens, period_prompt
+    )
+
+# ============================================================================
+# WINDOWING
+# ============================================================================
+
+def split_into_windows(lines: List[str], max_tokens: int) -> List[str]:
+    """
+    Group conversation lines into consecutive windows of at most max_tokens
+    (a single oversize line is truncated to fit a window of its own)
+    """
+    windows: List[str] = []
+    current: List[str] = []
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if cost > max_tokens:
+            line = truncate_to_tokens(line, max_tokens - 1)
+            cost = estimate_tokens(line) + 1
+        if current and used + cost > max_tokens:
+            windows.append("\n".join(current))
+            current, used = [], 0
+        current.append(line)
+        used += cost
+    if current:
+        windows.append("\n".join(current))
+    return windows or [""]
+
+
+class SummaryCheckpoint:
+    """Per-day JSON file of finished window notes, keyed by window hash"""
+    
+    def __init__(self, directory: Path, date: str):
+        self.path = directory / f"{date}.json"
+        self._lock = threading.Lock()
+        self.notes: Dict[str, str] = {}
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.notes = json.load(f).get('windows', {})
+        except Exception as e:
+            print(f"[Summarizer] Ignoring unreadable checkpoint {self.path.name}: {e}")
+    
+    @staticmethod
+    def key(window: str) -> str:
+        return hashlib.sha1(window.encode('utf-8')).hexdigest()
+    
+    def get(self, window: str) -> Optional[str]:
+        return self.notes.get(self.key(window))
+    
+    def put(self, window: str, note: str):
+        """Record one window's notes (written atomically)"""
+        with self._lock:
+            self.notes[self.key(window)] = note
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.path.with_suffix('.json.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'windows': self.notes}, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"[Summarizer] Checkpoint write failed: {e}")
+    
+    def discard(self):
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+# ============================================================================
+# MAP / REDUCE
+# ============================================================================
+
+def _map_windows(
+    endpoint: str,
+    model: str,
+    date: str,
+    windows: List[str],
+    checkpoint: SummaryCheckpoint,
+    max_workers: int
+) -> Optional[List[str]]:
+    """Notes for every window in order (checkpointed), or None if any failed"""
+    notes: List[Optional[str]] = [checkpoint.get(w) for w in windows]
+    todo = [i for i, note in enumerate(notes) if note is None]
+    if len(todo) < len(windows):
+        print(f"[Summarizer] {date}: resuming, {len(windows) - len(todo)}/{len(windows)} windows checkpointed")
+    
+    def summarize_window(i: int):
+        prompt = f"""This is part {i + 1} of {len(windows)} of a conversation between {username}, other humans and AI agents, and {agentname} on {date}.
+Write condensed notes from the perspective of {agentname}: key topics, important information, decisions made, emotional context, personal preferences, ongoing plans, and names of who said what. Plain sentences, no headers or bullet points.
+
+Conversation part {i + 1}:
+{windows[i]}
+
+Notes for part {i + 1}:"""
+        note = _call_llm(endpoint, model, prompt)
+        if note:
+            checkpoint.put(windows[i], note)
+        return i, note
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="SummaryMap") as pool:
+        for i, note in pool.map(summarize_window, todo):
+            notes[i] = note
+    
+    if any(note is None for note in notes):
+        print(f"[Summarizer] {date}: {sum(n is None for n in notes)} window(s) failed, progress checkpointed")
+        return None
+    return notes
+
+
+def _reduce_notes(
+    endpoint: str,
+    model: str,
+    label: str,
+    notes: List[str],
+    max_tokens: int,
+    final_prompt: Callable[[str], str]
+) -> Optional[str]:
+    """
+    Fold ordered notes into one summary, merging in rounds while they
+    overflow a window; final_prompt(body) builds the last prompt
+    """
+    while True:
+        groups = split_into_windows(notes, max_tokens)
+        if len(groups) == 1:
+            return _call_llm(endpoint, model, final_prompt(groups[0]))
+        if len(groups) >= len(notes):
+            # Each note fills a window on its own; merging cannot shrink them
+            return _call_llm(
+                endpoint, model, final_prompt(truncate_to_tokens("\n".join(notes), max_tokens))
+            )
+        
+        merged = []
+        for group in groups:
+            prompt = f"""Merge these consecutive notes about {agentname}'s conversations from {label} into one shorter set of notes. Keep names, facts, decisions and plans; drop repetition. Plain sentences, no headers or bullet points.
+
+{group}
+
+Merged notes:"""
+            note = _call_llm(endpoint, model, prompt)
+            if not note:
+                return None
+            merged.append(note)
+        notes = merged
+
+
+def _diary_prompt(date: str, heading: str, body: str) -> str:
+    # The prompt emphasizes the conversation date to ensure the LLM understands
+    # this is a retrospective summary of a past conversation
+    return f"""Create a concise summary of this full day's conversation between {username}, other humans and AI agents, and {agentname} that took place on {date}.
+Summarize in the first person from the perspective of {agentname}, the AI assistant, creating a short diary entry from {agentname} reflecting on that day.
+Focus on key topics, important information, decisions made, emotional context, personal preferences, ongoing plans, and anything else the assistant, {agentname}, should later recall about that day's interactions.
+Do not include formatting such as headers, subsections, bullet points, line breaks, or other extraneous details. Write this diary entry in complete sentences and a reflective tone.
+
+{heading}:
+{body}
+
+Summary of {date}:"""
+
+def _call_llm(endpoint: str, model: str, prompt: str) -> Optional[str]:
     """Call Ollama to generate summary"""
     try:
-        r = requests.post(f"{endpoint}/api/generate",
-                         json={
-                             "model": "llama3.2:latest",
-                             "prompt": prompt,
-                             "stream": False,
-                             "temperature": 0.3,
-                             "max_tokens": 500
-                         },
-                         timeout=120)
-        r.raise_for_status()
-        
-        summary = r.json().get("response", "").strip()
+        summary = get_ollama_client(endpoint).sync.generate(
+            model, prompt,
+            options={"temperature": 0.3, "num_predict": 500},
+            timeout=120,
+            priority=LLMPriority.MAINTENANCE
+        ).strip()
         
         # Clean up common prefixes
-        for prefix in ["summary:", "daily summary:"]:
+        for prefix in ["summary:", "daily summary:", "notes:", "merged notes:"]:
             if summary.lower().startswith(prefix):
                 summary = summary[len(prefix):].strip()
         
         return summary if summary else None
-        
+    
     except Exception as e:
         print(f"[Summarizer] LLM call failed: {e}")
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,162 @@
+# Filename: BASE/memory/summary_jobs.py
+"""
+Background Day Summarization
+Past days used to be summarized one after another on the GUI startup path,
+each a blocking LLM call, so a week offline meant minutes of frozen UI.
+SummaryJobQueue takes those days off the startup path: dates are queued
+and summarized by a small pool of daemon threads, at most `max_workers`
+at once, each archived as soon as its own summary is done.
+
+Jobs are keyed by string: a date for a day summary, or "<level>:<period>"
+for a weekly/monthly rollup (see rollups.py). `on_drained` runs whenever
+the queue empties, which is where rollups of newly archived days are
+queued.
+
+A failed day is not retried in this session; its entries stay in Tier 1/2
+and it is queued again on the next startup.
+"""
+
+import threading
+from collections import deque
+from typing import List, Dict, Callable, Optional
+
+from BASE.core.logger import Logger
+
+
+class SummaryJobQueue:
+    """FIFO of job keys drained by up to max_workers daemon threads"""
+
+    def __init__(
+        self,
+        summarize_fn: Callable[[str], bool],
+        logger: Logger,
+        max_workers: int = 2,
+        on_drained: Optional[Callable[[], None]] = None
+    ):
+        """
+        Args:
+            summarize_fn: Runs one job (a YYYY-MM-DD date or a rollup key),
+                returning True on success
+            logger: Logger instance for all output
+            max_workers: Jobs run concurrently
+            on_drained: Called (on a worker thread) each time the queue empties
+        """
+        self.summarize_fn = summarize_fn
+        self.logger = logger
+        self.max_workers = max(1, max_workers)
+        self.on_drained = on_drained
+
+        self._queue: deque = deque()
+        self._running: set = set()
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopped = False
+
+        # Counters for stats
+        self.completed = 0
+        self.failures = 0
+
+    # ========================================================================
+    # PUBLIC API
+    # ========================================================================
+
+    def submit(self, keys: List[str]) -> List[str]:
+        """
+        Queue jobs, skipping ones already queued or running (nothing is
+        queued once stop() was called)
+
+        Returns:
+            The keys actually queued
+        """
+        with self._cond:
+            if self._stopped:
+                return []
+            queued = [k for k in keys if k not in self._queue and k not in self._running]
+            if not queued:
+                return []
+            self._queue.extend(queued)
+            self._ensure_threads()
+            self._cond.notify_all()
+        return queued
+
+    def pending(self) -> List[str]:
+        """Job keys queued or running"""
+        with self._cond:
+            return sorted(self._running) + list(self._queue)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued job is done
+
+        Returns:
+            True if the queue drained before the timeout
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._queue and not self._running, timeout=timeout
+            )
+
+    def stop(self):
+        """Stop taking new jobs for good (running ones finish in the background)"""
+        with self._cond:
+            self._stopped = True
+            self._queue.clear()
+            self._cond.notify_all()
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                'queued': len(self._queue),
+                'running': len(self._running),
+                'completed': self.completed,
+                'failures': self.failures
+            }
+
+    # ========================================================================
+    # WORKER LOOP
+    # ========================================================================
+
+    def _ensure_threads(self):
+        """Start workers up to the limit (caller holds the lock)"""
+        wanted = min(self.max_workers, len(self._queue) + len(self._running))
+        while len(self._threads) < wanted:
+            thread = threading.Thread(
+                target=self._run, daemon=True,
+                name=f"DaySummarizer-{len(self._threads) + 1}"
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped or not self._queue:
+                    # Deregister under the lock so submit() starts a fresh worker
+                    self._threads.remove(threading.current_thread())
+                    return
+                key = self._queue.popleft()
+                self._running.add(key)
+
+            try:
+                success = self.summarize_fn(key)
+            except Exception as e:
+                self.logger.error(f"[Summary] {key} failed: {e}")
+                success = False
+
+            with self._cond:
+                self._running.discard(key)
+                if success:
+                    self.completed += 1
+                else:
+                    self.failures += 1
+                drained = not self._queue and not self._running and not self._stopped
+                self._cond.notify_all()
+
+            if not success:
+                self.logger.warning(f"[Summary] {key} not archived; retried on next startup")
+
+            if drained and self.on_drained:
+                try:
+                    self.on_drained()
+                except Exception as e:
+                    self.logger.error(f"[Summary] Follow-up scheduling failed: {e}")
@@ -0,0 +1,211 @@
+# Filename: BASE/memory/vector_index.py
+"""
+Per-Tier Vector Index
+Owns a pre-normalized float32 embedding matrix plus a parallel item array,
+so a similarity search is a single matrix-vector product.
+
+The matrix grows with amortized doubling, making appends O(dim) instead of
+re-stacking the whole tier. Memory tiers append as entries arrive and only
+rebuild after bulk edits (clears, rollover).
+"""
+
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+
+from BASE.memory.vector_store import has_embedding
+
+
+class VectorIndex:
+    """Normalized embedding matrix with parallel metadata for one tier"""
+
+    _INITIAL_CAPACITY = 64
+
+    def __init__(self, name: str = "index"):
+        """
+        Create an empty index
+
+        Args:
+            name: Tier name, used in log lines by owners
+        """
+        self.name = name
+        self.dim: Optional[int] = None
+        self.items: List[Dict[str, Any]] = []
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._count = 0
+        self.skipped = 0  # Entries rejected for dimension mismatch
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Live view of the normalized rows (count x dim)"""
+        return self._matrix[:self._count]
+
+    # ========================================================================
+    # BUILDING
+    # ========================================================================
+
+    def clear(self):
+        """Drop all rows and items"""
+        self.dim = None
+        self.items = []
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._count = 0
+        self.skipped = 0
+
+    def rebuild(self, entries: Iterable[Dict[str, Any]], field: str = 'embedding'):
+        """
+        Rebuild from a list of entry dicts carrying embeddings
+
+        Args:
+            entries: Tier entries; those without a usable embedding are ignored
+            field: Key holding the embedding in each entry
+        """
+        self.clear()
+
+        valid = [e for e in entries if has_embedding(e)]
+        if not valid:
+            return
+
+        self.dim = len(valid[0][field])
+        rows = []
+        for entry in valid:
+            if len(entry[field]) != self.dim:
+                self.skipped += 1
+                continue
+            rows.append(entry[field])
+            self.items.append(entry)
+
+        matrix = np.asarray(rows, dtype=np.float32)
+        self._matrix = self._normalize_rows(matrix)
+        self._count = len(self.items)
+
+    def add(self, entry: Dict[str, Any], field: str = 'embedding') -> bool:
+        """
+        Append one entry
+
+        Returns:
+            True if the entry was indexed
+        """
+        if not has_embedding(entry):
+            return False
+
+        vector = np.asarray(entry[field], dtype=np.float32)
+
+        if self.dim is None:
+            self.dim = len(vector)
+            self._matrix = np.zeros((self._INITIAL_CAPACITY, self.dim), dtype=np.float32)
+        elif len(vector) != self.dim:
+            self.skipped += 1
+            return False
+
+        if self._count >= self._matrix.shape[0]:
+            grown = np.zeros((max(self._INITIAL_CAPACITY, self._matrix.shape[0] * 2), self.dim),
+                             dtype=np.float32)
+            grown[:self._count] = self._matrix[:self._count]
+            self._matrix = grown
+
+        norm = max(float(np.linalg.norm(vector)), 1e-8)
+        self._matrix[self._count] = vector / norm
+        self.items.append(entry)
+        self._count += 1
+        return True
+
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """L2-normalize each row in place"""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.maximum(norms, 1e-8)
+        return matrix
+
+    # ========================================================================
+    # SEARCH
+    # ========================================================================
+
+    def similarities(self, query_embedding: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the query against every row"""
+        if not self._count:
+            return np.zeros(0, dtype=np.float32)
+
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        if self.dim is not None and query.shape[0] != self.dim:
+            return np.zeros(0, dtype=np.float32)
+
+        query = query / max(float(np.linalg.norm(query)), 1e-8)
+        return self.matrix @ query
+
+    def search(
+        self,
+        query_embedding: np.ndarray,
+        k: int,
+        min_similarity: Optional[float] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Top-k search
+
+        Args:
+            query_embedding: Query vector (any norm)
+            k: Number of results
+            min_similarity: Optional similarity floor
+
+        Returns:
+            List of (item, similarity) sorted by descending similarity
+        """
+        similarities = self.similarities(query_embedding)
+        return self._select(np.arange(similarities.size), similarities, k, min_similarity)
+
+    def search_rows(
+        self,
+        query_embedding: np.ndarray,
+        rows: np.ndarray,
+        k: int,
+        min_similarity: Optional[float] = None
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Top-k search restricted to a subset of rows (used by ANN probing)
+
+        Args:
+            query_embedding: Query vector (any norm)
+            rows: Candidate row indices
+            k: Number of results
+            min_similarity: Optional similarity floor
+        """
+        if not self._count or len(rows) == 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        if self.dim is not None and query.shape[0] != self.dim:
+            return []
+
+        query = query / max(float(np.linalg.norm(query)), 1e-8)
+        return self._select(rows, self.matrix[rows] @ query, k, min_similarity)
+
+    def _select(
+        self,
+        rows: np.ndarray,
+        similarities: np.ndarray,
+        k: int,
+        min_similarity: Optional[float]
+    ) -> List[Tuple[Dict[str, Any], float]]:
+        """Apply similarity floor and top-k to scored rows"""
+        if similarities.size == 0 or k <= 0:
+            return []
+
+        if min_similarity is not None:
+            keep = similarities >= min_similarity
+            rows, similarities = rows[keep], similarities[keep]
+            if similarities.size == 0:
+                return []
+
+        top = top_k_indices(similarities, k)
+        return [(self.items[rows[i]], float(similarities[i])) for i in top]
+
+
+def top_k_indices(similarities: np.ndarray, k: int) -> np.ndarray:
+    """Fast top-k selection using argpartition, sorted descending"""
+    if len(similarities) <= k:
+        return np.argsort(-similarities)
+
+    top = np.argpartition(-similarities, k)[:k]
+    return top[np.argsort(-similarities[top])]
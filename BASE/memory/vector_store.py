@@ -0,0 +1,436 @@
+# Filename: BASE/memory/vector_store.py
+"""
+Binary Sidecar Embedding Store
+
+Keeps text and metadata in a small JSON index and moves embedding vectors
+into a contiguous float32 (or float16) .npy sidecar that is memory-mapped
+on load. Startup cost and resident memory then scale with metadata size,
+not with the number of 768-float vectors.
+
+Index layout (the original top-level structure is preserved):
+    {
+      "vector_store": {"file": "<name>.<token>.npy", "dtype": "float32",
+                       "dim": 768, "count": N},
+      "chunks": [{"text": ..., "vector_row": 0, ...}, ...]
+    }
+Legacy bare-list files are stored under an "entries" key.
+VectorStreamWriter produces the same layout without holding the document
+in memory (used for large document ingestion).
+
+Entries without a usable vector keep their inline "embedding" value, so
+partially embedded files round-trip unchanged.
+
+Usage (migrate existing JSON files in place):
+    python -m BASE.memory.vector_store migrate [paths...] [--float16]
+"""
+
+import json
+import os
+import re
+import sys
+import uuid
+import shutil
+import argparse
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Union
+
+VECTOR_FIELD = "embedding"
+ROW_FIELD = "vector_row"
+HEADER_KEY = "vector_store"
+SUPPORTED_DTYPES = ("float32", "float16")
+
+
+def has_embedding(entry: Dict[str, Any]) -> bool:
+    """True if entry carries a non-empty embedding (list or array row)"""
+    embedding = entry.get(VECTOR_FIELD)
+    return embedding is not None and len(embedding) > 0
+
+
+def _entry_list(data: Union[Dict[str, Any], List]) -> Optional[List[Dict[str, Any]]]:
+    """Locate the entry list inside a loaded document"""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in ("chunks", "entries"):
+            if isinstance(data.get(key), list):
+                return data[key]
+    return None
+
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def load_vector_json(path: Path) -> Union[Dict[str, Any], List]:
+    """
+    Load a JSON memory file, attaching memory-mapped vector rows if the
+    file has a sidecar. Plain JSON files are returned unchanged.
+
+    Args:
+        path: Path to the JSON (index) file
+
+    Returns:
+        Parsed document; entries with a sidecar row get "embedding" set to
+        a read-only np.memmap row view
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    header = data.get(HEADER_KEY) if isinstance(data, dict) else None
+    if not header:
+        return data
+
+    entries = _entry_list(data) or []
+    vectors_path = path.parent / header["file"]
+
+    if header.get("count", 0) == 0 or not vectors_path.exists():
+        for entry in entries:
+            entry.pop(ROW_FIELD, None)
+        return data
+
+    vectors = np.load(vectors_path, mmap_mode='r')
+
+    for entry in entries:
+        row = entry.pop(ROW_FIELD, None)
+        if row is not None:
+            entry[VECTOR_FIELD] = vectors[row]
+
+    return data
+
+
+def sidecar_file(path: Path) -> Optional[Path]:
+    """Return the vectors file referenced by an index, if any"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    header = data.get(HEADER_KEY) if isinstance(data, dict) else None
+    return path.parent / header["file"] if header else None
+
+
+def remove_stale_sidecars(path: Path) -> int:
+    """
+    Delete sidecars of an index other than the one it references
+
+    A replaced sidecar that was still memory-mapped (Windows refuses to
+    delete those) is left behind by save; call this once the old
+    mapping has been released.
+
+    Returns:
+        Number of files removed
+    """
+    current = sidecar_file(path) if path.exists() else None
+    pattern = re.compile(rf"{re.escape(path.stem)}\.[0-9a-f]{{8}}\.npy")
+
+    removed = 0
+    for candidate in path.parent.glob(f"{path.stem}.*.npy"):
+        if candidate == current or not pattern.fullmatch(candidate.name):
+            continue
+        try:
+            candidate.unlink()
+            removed += 1
+        except OSError:
+            pass  # Still mapped; the next sweep gets it
+    return removed
+
+
+# ============================================================================
+# SAVING
+# ============================================================================
+
+def save_vector_json(
+    path: Path,
+    data: Union[Dict[str, Any], List],
+    dtype: str = "float32",
+    indent: Optional[int] = 2
+) -> Path:
+    """
+    Write a JSON index plus .npy sidecar for a memory document
+
+    The sidecar gets a fresh name on every save so a file that is still
+    memory-mapped (Windows cannot replace those) is never overwritten.
+    The previous sidecar is removed on a best-effort basis.
+
+    Args:
+        path: Destination JSON (index) path
+        data: Document dict (with "chunks"/"entries") or bare entry list
+        dtype: "float32" or "float16"
+        indent: JSON indent for the index file
+
+    Returns:
+        Path of the written vectors file
+    """
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported vector dtype: {dtype}")
+
+    if isinstance(data, list):
+        document = {"entries": data}
+    else:
+        document = {k: v for k, v in data.items() if k != HEADER_KEY}
+
+    entries = _entry_list(document) or []
+
+    # First valid vector fixes the dimension; mismatches stay inline
+    dim = 0
+    for entry in entries:
+        if has_embedding(entry):
+            dim = len(entry[VECTOR_FIELD])
+            break
+
+    rows = []
+    index_entries = []
+    for entry in entries:
+        stored = {k: v for k, v in entry.items() if k not in (VECTOR_FIELD, ROW_FIELD)}
+        embedding = entry.get(VECTOR_FIELD)
+
+        if dim and embedding is not None and len(embedding) == dim:
+            stored[ROW_FIELD] = len(rows)
+            rows.append(embedding)
+        elif VECTOR_FIELD in entry:
+            stored[VECTOR_FIELD] = _to_list(embedding)
+
+        index_entries.append(stored)
+
+    list_key = "chunks" if "chunks" in document else "entries"
+    document[list_key] = index_entries
+
+    previous_sidecar = sidecar_file(path) if path.exists() else None
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    vectors_path = path.parent / f"{path.stem}.{uuid.uuid4().hex[:8]}.npy"
+
+    matrix = (
+        np.asarray(rows, dtype=dtype) if rows
+        else np.zeros((0, dim), dtype=dtype)
+    )
+    np.save(vectors_path, matrix)
+
+    document[HEADER_KEY] = {
+        "file": vectors_path.name,
+        "dtype": dtype,
+        "dim": dim,
+        "count": len(rows)
+    }
+
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False, indent=indent)
+    os.replace(tmp_path, path)
+
+    if previous_sidecar and previous_sidecar != vectors_path:
+        try:
+            previous_sidecar.unlink()
+        except OSError:
+            pass  # Still mapped; removed later by remove_stale_sidecars
+
+    return vectors_path
+
+
+class VectorStreamWriter:
+    """
+    Incremental writer for the index + sidecar format
+
+    Entries are written to the JSON index one line at a time and vectors
+    are appended to a raw scratch file, so memory use does not grow with
+    the document. close() wraps the raw vectors in a .npy header and swaps
+    both files into place, exactly like save_vector_json.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        fields: Optional[Dict[str, Any]] = None,
+        list_key: str = "chunks",
+        dtype: str = "float32"
+    ):
+        """
+        Args:
+            path: Destination JSON (index) path
+            fields: Top-level document fields written before the entries
+            list_key: Key of the entry list ("chunks" or "entries")
+            dtype: "float32" or "float16"
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype}")
+
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.dim = 0
+        self.count = 0
+        self.entries = 0
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._index_tmp = path.with_suffix(path.suffix + '.tmp')
+        self._raw_tmp = path.with_suffix('.vectors.tmp')
+        self._index = open(self._index_tmp, 'w', encoding='utf-8')
+        self._raw = open(self._raw_tmp, 'wb')
+
+        self._index.write('{\n')
+        for key, value in (fields or {}).items():
+            self._index.write(f'  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)},\n')
+        self._index.write(f'  {json.dumps(list_key)}: [')
+
+    def add(self, entry: Dict[str, Any]):
+        """Append one entry (its embedding, if any, goes to the sidecar)"""
+        stored = {k: v for k, v in entry.items() if k not in (VECTOR_FIELD, ROW_FIELD)}
+        embedding = entry.get(VECTOR_FIELD)
+
+        if embedding is not None and len(embedding) > 0:
+            if not self.dim:
+                self.dim = len(embedding)
+            if len(embedding) == self.dim:
+                stored[ROW_FIELD] = self.count
+                self._raw.write(np.asarray(embedding, dtype=self.dtype).tobytes())
+                self.count += 1
+            else:
+                stored[VECTOR_FIELD] = _to_list(embedding)
+
+        separator = ',\n    ' if self.entries else '\n    '
+        self._index.write(separator + json.dumps(stored, ensure_ascii=False))
+        self.entries += 1
+
+    def close(self, fields: Optional[Dict[str, Any]] = None) -> Path:
+        """
+        Finish both files and move them into place
+
+        Args:
+            fields: Top-level fields only known at the end (e.g. totals)
+
+        Returns:
+            Path of the written vectors file
+        """
+        self._raw.close()
+
+        previous_sidecar = sidecar_file(self.path) if self.path.exists() else None
+        vectors_path = self.path.parent / f"{self.path.stem}.{uuid.uuid4().hex[:8]}.npy"
+
+        with open(vectors_path, 'wb') as out:
+            header = {
+                'descr': np.lib.format.dtype_to_descr(self.dtype),
+                'fortran_order': False,
+                'shape': (self.count, self.dim)
+            }
+            np.lib.format.write_array_header_1_0(out, header)
+            with open(self._raw_tmp, 'rb') as raw:
+                shutil.copyfileobj(raw, out, 1 << 20)
+        self._raw_tmp.unlink()
+
+        self._index.write('\n  ]')
+        for key, value in (fields or {}).items():
+            self._index.write(f',\n  {json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}')
+        header = {"file": vectors_path.name, "dtype": self.dtype.name, "dim": self.dim, "count": self.count}
+        self._index.write(f',\n  {json.dumps(HEADER_KEY)}: {json.dumps(header)}\n}}\n')
+        self._index.close()
+        os.replace(self._index_tmp, self.path)
+
+        if previous_sidecar and previous_sidecar != vectors_path:
+            try:
+                previous_sidecar.unlink()
+            except OSError:
+                pass  # Still mapped; removed later by remove_stale_sidecars
+
+        return vectors_path
+
+    def abort(self):
+        """Discard partial output, leaving any existing file untouched"""
+        for handle in (self._index, self._raw):
+            handle.close()
+        for tmp in (self._index_tmp, self._raw_tmp):
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+
+def _to_list(embedding) -> Any:
+    """Convert array rows back to plain lists for inline JSON storage"""
+    if isinstance(embedding, np.ndarray):
+        return embedding.astype(np.float32).tolist()
+    return embedding
+
+
+# ============================================================================
+# MIGRATION COMMAND
+# ============================================================================
+
+def migrate_file(path: Path, dtype: str = "float32", backup: bool = True) -> bool:
+    """
+    Convert one inline-embedding JSON file to index + sidecar in place
+
+    Returns:
+        True if the file was converted, False if skipped
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if isinstance(data, dict) and HEADER_KEY in data:
+        print(f"  Already migrated: {path.name}")
+        return False
+
+    entries = _entry_list(data)
+    if not entries or not any(isinstance(e, dict) and has_embedding(e) for e in entries):
+        print(f"  No embeddings, skipping: {path.name}")
+        return False
+
+    if backup:
+        backup_path = path.with_suffix(path.suffix + '.bak')
+        if not backup_path.exists():
+            path.replace(backup_path)
+
+    vectors_path = save_vector_json(path, data, dtype=dtype)
+    print(f"  Migrated {path.name} -> {vectors_path.name} ({len(entries)} entries, {dtype})")
+    return True
+
+
+def _default_targets() -> List[Path]:
+    """Medium/long memory plus every base memory JSON file"""
+    project_root = Path(__file__).resolve().parents[2]
+    memory_dir = project_root / "personality" / "memory"
+    base_dir = project_root / "personality" / "base_memory" / "base_memories"
+
+    targets = [memory_dir / "medium_memory.json", memory_dir / "long_memory.json"]
+    if base_dir.exists():
+        targets.extend(sorted(base_dir.rglob("*.json")))
+
+    return [t for t in targets if t.exists()]
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Convert inline JSON embeddings to memory-mapped .npy sidecars"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    migrate = sub.add_parser("migrate", help="Migrate JSON files in place")
+    migrate.add_argument("paths", nargs="*", type=Path,
+                         help="Files to migrate (default: medium, long and base memories)")
+    migrate.add_argument("--float16", action="store_true",
+                         help="Store vectors as float16 (half the disk and RAM)")
+    migrate.add_argument("--no-backup", action="store_true",
+                         help="Do not keep a .json.bak copy of each original")
+
+    args = parser.parse_args(argv)
+
+    targets = args.paths or _default_targets()
+    dtype = "float16" if args.float16 else "float32"
+
+    if not targets:
+        print("No memory files found to migrate")
+        return
+
+    converted = 0
+    for path in targets:
+        try:
+            if migrate_file(path, dtype=dtype, backup=not args.no_backup):
+                converted += 1
+        except Exception as e:
+            print(f"  [FAILED] {path}: {e}")
+
+    print(f"Migration complete: {converted}/{len(targets)} file(s) converted")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
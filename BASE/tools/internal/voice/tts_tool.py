@@ -9,7 +9,12 @@ It handles threading, interruption, and provides a consistent interface
 to the rest of the system.
 
 The backend (XTTS, pyttsx3, etc.) is injected during initialization.
+
+SpeechStream feeds a TTSTool sentence by sentence while the reply is still
+being generated, and records time-to-first-audio.
 """
+import time
+import queue
 import threading
 from typing import Optional, Dict
 from BASE.handlers.tts_interface import TTSInterface
@@ -169,4 +174,105 @@ class TTSTool:
             'available': self.is_available(),
             'speaking': self._is_speaking,
             'backend': self.backend.get_voice_info().get('type', 'Unknown')
-        }
\ No newline at end of file
+        }
+
+
+class SpeechStream:
+    """
+    Sentence queue spoken in order by one TTSTool, filled while the LLM is
+    still generating
+
+    feed() is called from the generating side (never blocks); run() is the
+    consumer and belongs on a speech thread. Each sentence is one
+    TTSTool.speak call, so the backend starts on sentence one while the
+    rest of the reply is still being written.
+
+    Time-to-first-audio is measured from `started_at` (when the request
+    began) to the moment the first sentence is handed to the backend.
+    """
+
+    _END = object()
+
+    def __init__(
+        self,
+        tts_tool: TTSTool,
+        stop_event: threading.Event,
+        started_at: Optional[float] = None
+    ):
+        """
+        Args:
+            tts_tool: Tool the sentences are spoken through
+            stop_event: Set to abandon the remaining sentences
+            started_at: time.perf_counter() when the request began
+        """
+        self.tts_tool = tts_tool
+        self.stop_event = stop_event
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+
+        self._sentences: queue.Queue = queue.Queue()
+        self.sentences_fed = 0
+        self.sentences_spoken = 0
+        self.first_sentence_at: Optional[float] = None
+        self.first_audio_at: Optional[float] = None
+
+    def feed(self, sentence: str):
+        """Queue one finished sentence"""
+        if not sentence or not sentence.strip():
+            return
+        if self.first_sentence_at is None:
+            self.first_sentence_at = time.perf_counter()
+        self.sentences_fed += 1
+        self._sentences.put(sentence)
+
+    def close(self):
+        """No more sentences; run() returns once the queue is spoken"""
+        self._sentences.put(self._END)
+
+    def run(self) -> str:
+        """
+        Speak queued sentences until close() or the stop event
+
+        Returns:
+            str: "Speech completed", "Interrupted", or the first error
+        """
+        while True:
+            try:
+                sentence = self._sentences.get(timeout=0.1)
+            except queue.Empty:
+                if self.stop_event.is_set():
+                    return "Interrupted"
+                continue
+            if sentence is self._END:
+                return "Speech completed"
+            if self.stop_event.is_set():
+                return "Interrupted"
+
+            if self.first_audio_at is None:
+                self.first_audio_at = time.perf_counter()
+                self.tts_tool.logger.speech(
+                    f"[Latency] First audio after {self.time_to_first_audio:.2f}s (streamed)"
+                )
+
+            result = self.tts_tool.speak(sentence, stream=True)
+            self.sentences_spoken += 1
+            if result == "Interrupted" or self.stop_event.is_set():
+                return "Interrupted"
+            if "error" in result.lower():
+                return result
+
+    @property
+    def time_to_first_audio(self) -> Optional[float]:
+        """Seconds from request start to the first sentence reaching TTS"""
+        if self.first_audio_at is None:
+            return None
+        return self.first_audio_at - self.started_at
+
+    def get_stats(self) -> Dict:
+        return {
+            'time_to_first_sentence': (
+                self.first_sentence_at - self.started_at if self.first_sentence_at is not None else None
+            ),
+            'time_to_first_audio': self.time_to_first_audio,
+            'sentences_fed': self.sentences_fed,
+            'sentences_spoken': self.sentences_spoken
+        }
@@ -199,6 +199,53 @@ def split_into_sentences(text: str) -> List[str]:
     return sentences
 
 
+class SentenceSegmenter:
+    """
+    Incremental split_into_sentences for streamed text
+
+    Text arrives in arbitrary chunks; a sentence is released once the
+    whitespace after its closing .!? has arrived, so the "3." of a
+    half-streamed "3.5" never reaches TTS early. Boundaries are those of
+    split_into_sentences, so abbreviations still split ("Hi Mr." /
+    "Smith"). The unfinished tail is released by flush() when the stream
+    ends.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> List[str]:
+        """
+        Add streamed text
+
+        Args:
+            chunk: Next piece of text
+
+        Returns:
+            Sentences completed by this chunk (possibly none)
+        """
+        self._buffer += chunk
+        if re.search(r'[.!?]\s+$', self._buffer):
+            # Ends on a boundary: nothing is still growing
+            text, self._buffer = self._buffer, ""
+            return [s for s in split_into_sentences(text) if s.strip()]
+
+        sentences = split_into_sentences(self._buffer)
+        if len(sentences) < 2:
+            return []
+
+        # Everything but the last piece is followed by a boundary; the last
+        # one may still be growing
+        tail = sentences[-1]
+        self._buffer = self._buffer[self._buffer.rfind(tail):]
+        return sentences[:-1]
+
+    def flush(self) -> List[str]:
+        """Release whatever is left at the end of the stream"""
+        text, self._buffer = self._buffer, ""
+        return [s for s in split_into_sentences(text) if s.strip()]
+
+
 def validate_audio_file(file_path: str) -> Tuple[bool, str]:
     """
     Validate that an audio file exists and is readable
@@ -14,6 +14,7 @@ REFACTORED: Simplified continuous thinking configuration
 
 LIMIT_PROCESSING = False # Enable for slower agent processing and responses
 DELAY_TIMER = 10  # Timeout for prompt processing (seconds)
+THOUGHT_PIPELINE = "gated"  # Thinking before a reply: "sequential" (always 2 thought passes), "gated" (2nd pass only when tools ran), "combined" (1 call for thoughts + reply when no tools are requested)
 
 # === EMERGENCY STOP ===
 # Global kill switch to immediately halt all agent operations
@@ -61,6 +62,7 @@ MAX_BASE_MEMORIES = 1
 # === AVATAR ABILITIES ===
 AVATAR_SPEECH = False           # Enable text-to-speech output
 USE_CUSTOM_VOICE = False       # Use custom voice model instead of standard system TTS (requires AVATAR_SPEECH enabled)
+STREAM_SPEECH = True           # Speak replies sentence by sentence while they are still being generated (requires AVATAR_SPEECH enabled)
 
 # === GROUP CHAT CONTEXT ===
 IN_DISCORD_CHAT = False        # Enable Discord chat integration